@@ -12,7 +12,7 @@ sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from app.core.config import settings
 from app.db.base import Base
-from app.db.models import Customer, PredictionRecord, Campaign, User
+from app.db.models import Customer, PredictionRecord, CustomerLatestPrediction, RiskRollup, RiskHistogramBin, DirtyCustomer, ScoringRun, BackgroundJob, Campaign, User
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
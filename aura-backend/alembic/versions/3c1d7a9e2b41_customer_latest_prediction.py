@@ -0,0 +1,57 @@
+"""customer_latest_prediction
+
+Revision ID: 3c1d7a9e2b41
+Revises: f9f4ddbf5c7f
+Create Date: 2026-10-18 10:12:40.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1d7a9e2b41'
+down_revision: Union[str, None] = 'f9f4ddbf5c7f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('customer_latest_prediction',
+    sa.Column('customer_id', sa.String(length=50), nullable=False),
+    sa.Column('prediction_id', sa.Integer(), nullable=True),
+    sa.Column('churn_probability', sa.Float(), nullable=False),
+    sa.Column('risk_score', sa.Float(), nullable=False),
+    sa.Column('risk_level', sa.String(length=20), nullable=False),
+    sa.Column('predicted_churn', sa.String(length=10), nullable=False),
+    sa.Column('model_name', sa.String(length=100), nullable=True),
+    sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.customer_id'], ),
+    sa.ForeignKeyConstraint(['prediction_id'], ['predictions.id'], ),
+    sa.PrimaryKeyConstraint('customer_id')
+    )
+    op.create_index(op.f('ix_customer_latest_prediction_risk_level'), 'customer_latest_prediction', ['risk_level'], unique=False)
+
+    # Backfill from the audit trail: newest prediction per customer
+    op.execute("""
+        INSERT INTO customer_latest_prediction (
+            customer_id, prediction_id, churn_probability, risk_score,
+            risk_level, predicted_churn, model_name, timestamp
+        )
+        SELECT customer_id, id, churn_probability, risk_score,
+               risk_level, predicted_churn, model_name, timestamp
+        FROM (
+            SELECT p.*, ROW_NUMBER() OVER (
+                PARTITION BY customer_id ORDER BY timestamp DESC, id DESC
+            ) AS position
+            FROM predictions p
+        ) ranked
+        WHERE position = 1
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_customer_latest_prediction_risk_level'), table_name='customer_latest_prediction')
+    op.drop_table('customer_latest_prediction')
@@ -0,0 +1,34 @@
+"""incremental_scoring
+
+Revision ID: 4b8e2d6a9c73
+Revises: e1a7c3f95b26
+Create Date: 2026-10-18 18:24:13.905127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8e2d6a9c73'
+down_revision: Union[str, None] = 'e1a7c3f95b26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('dirty_customers',
+    sa.Column('customer_id', sa.String(length=50), nullable=False),
+    sa.Column('marked_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.customer_id'], ),
+    sa.PrimaryKeyConstraint('customer_id')
+    )
+    op.add_column('scoring_runs', sa.Column('incremental', sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('scoring_runs') as batch_op:
+        batch_op.drop_column('incremental')
+    op.drop_table('dirty_customers')
@@ -0,0 +1,43 @@
+"""risk_rollup
+
+Revision ID: 5c2a8e7f1d36
+Revises: 9d3f6b1e4a58
+Create Date: 2026-10-18 22:41:07.318552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2a8e7f1d36'
+down_revision: Union[str, None] = '9d3f6b1e4a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('risk_rollup',
+    sa.Column('risk_level', sa.String(length=20), nullable=False),
+    sa.Column('contract', sa.String(length=50), nullable=False),
+    sa.Column('internet_service', sa.String(length=50), nullable=False),
+    sa.Column('customer_count', sa.Integer(), nullable=False),
+    sa.Column('risk_score_sum', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('risk_level', 'contract', 'internet_service')
+    )
+
+    # Backfill: customers and latest risk score sum per segment
+    op.execute("""
+        INSERT INTO risk_rollup (risk_level, contract, internet_service, customer_count, risk_score_sum)
+        SELECT COALESCE(l.risk_level, 'Unknown'), COALESCE(c.contract, ''), COALESCE(c.internet_service, ''),
+               COUNT(*), COALESCE(SUM(l.risk_score), 0.0)
+        FROM customers c
+        LEFT OUTER JOIN customer_latest_prediction l ON l.customer_id = c.customer_id
+        GROUP BY COALESCE(l.risk_level, 'Unknown'), COALESCE(c.contract, ''), COALESCE(c.internet_service, '')
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('risk_rollup')
@@ -0,0 +1,31 @@
+"""latest_prediction_risk_indexes
+
+Revision ID: 8a4f2c6d1e93
+Revises: 3c1d7a9e2b41
+Create Date: 2026-10-18 13:05:21.774190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4f2c6d1e93'
+down_revision: Union[str, None] = '3c1d7a9e2b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (risk_level, risk_score) also serves risk_level-only lookups
+    op.drop_index(op.f('ix_customer_latest_prediction_risk_level'), table_name='customer_latest_prediction')
+    op.create_index('ix_customer_latest_prediction_risk_score', 'customer_latest_prediction', ['risk_score', 'customer_id'], unique=False)
+    op.create_index('ix_customer_latest_prediction_level_score', 'customer_latest_prediction', ['risk_level', 'risk_score'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_customer_latest_prediction_level_score', table_name='customer_latest_prediction')
+    op.drop_index('ix_customer_latest_prediction_risk_score', table_name='customer_latest_prediction')
+    op.create_index(op.f('ix_customer_latest_prediction_risk_level'), 'customer_latest_prediction', ['risk_level'], unique=False)
@@ -0,0 +1,49 @@
+"""risk_histogram
+
+Revision ID: b71e4d92c0a5
+Revises: 5c2a8e7f1d36
+Create Date: 2026-10-18 23:27:44.506213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71e4d92c0a5'
+down_revision: Union[str, None] = '5c2a8e7f1d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('risk_histogram',
+    sa.Column('bin', sa.Integer(), nullable=False),
+    sa.Column('customer_count', sa.Integer(), nullable=False),
+    sa.Column('ltv_sum', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('bin')
+    )
+
+    # Backfill: scored customers and LTV sum per 0.001 risk score bin
+    # (SQLite truncates REAL -> INTEGER casts, PostgreSQL rounds them)
+    scaled = "l.risk_score * 1000"
+    if op.get_bind().dialect.name != "sqlite":
+        scaled = f"FLOOR({scaled})"
+    risk_bin = f"CASE WHEN l.risk_score >= 1.0 THEN 999 ELSE CAST({scaled} AS INTEGER) END"
+    op.execute(f"""
+        INSERT INTO risk_histogram (bin, customer_count, ltv_sum)
+        SELECT {risk_bin}, COUNT(*),
+               SUM(COALESCE(c.monthly_charges, 0.0) * CASE
+                   WHEN COALESCE(c.tenure, 0) < 12 THEN 12
+                   WHEN COALESCE(c.tenure, 0) > 72 THEN 72
+                   ELSE COALESCE(c.tenure, 0) END)
+        FROM customers c
+        JOIN customer_latest_prediction l ON l.customer_id = c.customer_id
+        GROUP BY {risk_bin}
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('risk_histogram')
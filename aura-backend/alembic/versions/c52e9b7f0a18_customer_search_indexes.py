@@ -0,0 +1,32 @@
+"""customer_search_indexes
+
+Revision ID: c52e9b7f0a18
+Revises: 8a4f2c6d1e93
+Create Date: 2026-10-18 15:41:09.302615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52e9b7f0a18'
+down_revision: Union[str, None] = '8a4f2c6d1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_customers_contract_customer_id', 'customers', ['contract', 'customer_id'], unique=False)
+    op.create_index('ix_customers_internet_service_customer_id', 'customers', ['internet_service', 'customer_id'], unique=False)
+    op.create_index('ix_customers_tenure_customer_id', 'customers', ['tenure', 'customer_id'], unique=False)
+    op.create_index('ix_customers_monthly_charges_customer_id', 'customers', ['monthly_charges', 'customer_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_customers_monthly_charges_customer_id', table_name='customers')
+    op.drop_index('ix_customers_tenure_customer_id', table_name='customers')
+    op.drop_index('ix_customers_internet_service_customer_id', table_name='customers')
+    op.drop_index('ix_customers_contract_customer_id', table_name='customers')
@@ -0,0 +1,32 @@
+"""drop risk_rollup_version
+
+Revision ID: d08f30d4bfb3
+Revises: e4f08a6c3b19
+Create Date: 2026-10-19 09:42:51.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd08f30d4bfb3'
+down_revision: Union[str, None] = 'e4f08a6c3b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The targeting snapshot is refreshed on a timer instead of following a write counter
+    op.drop_table('risk_rollup_version')
+
+
+def downgrade() -> None:
+    op.create_table('risk_rollup_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO risk_rollup_version (id, version) VALUES (1, 1)")
@@ -0,0 +1,42 @@
+"""scoring_runs
+
+Revision ID: e1a7c3f95b26
+Revises: c52e9b7f0a18
+Create Date: 2026-10-18 17:02:51.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a7c3f95b26'
+down_revision: Union[str, None] = 'c52e9b7f0a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('scoring_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('model_version', sa.String(length=100), nullable=True),
+    sa.Column('only_unscored', sa.Boolean(), nullable=True),
+    sa.Column('total_customers', sa.Integer(), nullable=True),
+    sa.Column('scored_count', sa.Integer(), nullable=True),
+    sa.Column('error_count', sa.Integer(), nullable=True),
+    sa.Column('last_customer_id', sa.String(length=50), nullable=True),
+    sa.Column('error', sa.String(length=500), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_scoring_runs_id'), 'scoring_runs', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_scoring_runs_id'), table_name='scoring_runs')
+    op.drop_table('scoring_runs')
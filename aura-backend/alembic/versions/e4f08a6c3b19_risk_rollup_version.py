@@ -0,0 +1,31 @@
+"""risk_rollup_version
+
+Revision ID: e4f08a6c3b19
+Revises: b71e4d92c0a5
+Create Date: 2026-10-19 01:06:18.927450
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4f08a6c3b19'
+down_revision: Union[str, None] = 'b71e4d92c0a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('risk_rollup_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO risk_rollup_version (id, version) VALUES (1, 1)")
+
+
+def downgrade() -> None:
+    op.drop_table('risk_rollup_version')
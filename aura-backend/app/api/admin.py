@@ -0,0 +1,130 @@
+"""Admin API endpoints"""
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from typing import Optional
+import secrets
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.jobs import job_runner
+from app.core.model_registry import model_registry
+from app.core.prediction_cache import prediction_cache
+from app.services.churn_predictor import CHURN_MODEL, DEFAULT_MODEL_DIR
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+def require_admin_key(x_admin_key: Optional[str] = Header(None)):
+    """
+    Allow the request only with the configured admin key
+    
+    Raises:
+        HTTPException: 403 if no admin key is configured, 401 if the
+                       X-Admin-Key header is missing or wrong
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=403,
+            detail="Yönetici işlemleri devre dışı: ADMIN_API_KEY yapılandırılmamış"
+        )
+    if x_admin_key is None or not secrets.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=401, detail="Geçersiz yönetici anahtarı")
+
+
+@router.get("/models")
+async def get_model_stats():
+    """
+    Get load statistics for the shared ML models
+    
+    Returns:
+        Per-model load state, version, load time, RSS growth during load
+        and the state of the last reload
+    """
+    return {"models": model_registry.stats()}
+
+
+@router.post("/models/reload", status_code=202, dependencies=[Depends(require_admin_key)])
+async def reload_model():
+    """
+    Reload the configured model directory in the background and swap it in atomically
+    
+    Only the configured directory (MODEL_DIR) is ever loaded: model
+    artifacts are pickles, so loading a caller-chosen path would run
+    caller-chosen code. Requires the X-Admin-Key header.
+    
+    The current model keeps serving until the new one has loaded and
+    passed a smoke prediction. Poll GET /api/admin/models for the result.
+    """
+    model_dir = settings.MODEL_DIR or DEFAULT_MODEL_DIR
+    if not model_registry.reload_in_background(CHURN_MODEL, model_dir):
+        raise HTTPException(
+            status_code=409,
+            detail="Model yeniden yükleme zaten devam ediyor"
+        )
+    
+    return {"message": "Model reload started", "model": CHURN_MODEL, "path": model_dir}
+
+
+@router.get("/prediction-cache")
+async def get_prediction_cache_stats():
+    """
+    Get prediction cache counters
+    
+    Returns:
+        Cache size and capacity, hit/miss/eviction/invalidation counts
+        and the hit rate since startup
+    """
+    return prediction_cache.stats()
+
+
+@router.get("/cache")
+async def get_cache_stats():
+    """
+    Get data cache counters
+    
+    Returns:
+        Entry count, approximate bytes, bounds and hit/miss/eviction/
+        expiration counts
+    """
+    return cache.stats()
+
+
+@router.get("/jobs")
+def list_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    kind: Optional[str] = Query(None, description="load_csv, score_customers or seed_database")
+):
+    """
+    List background jobs, most recent first
+    
+    Returns:
+        Jobs with status, progress, result and timestamps
+    """
+    return {"jobs": job_runner.list_jobs(limit=limit, kind=kind)}
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: int):
+    """
+    Get the status, progress and result of a background job
+    
+    Status is one of queued, running, completed, failed or cancelled.
+    """
+    job = job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"İş bulunamadı: {job_id}")
+    return job
+
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: int):
+    """
+    Cancel a background job
+    
+    Queued jobs are cancelled immediately; running jobs stop after their
+    current chunk. Cancelled scoring runs resume from their checkpoint
+    when scoring is started again.
+    """
+    job = job_runner.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"İş bulunamadı: {job_id}")
+    return job
@@ -4,15 +4,13 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 
+from app.core.threadpool import blocking_handler
 from app.db.base import get_db
-from app.repositories.customer_repository import CustomerRepository
-from app.services.churn_predictor import ChurnPredictor
+from app.repositories.customer_repository import CustomerFilters, CustomerRepository
+from app.services.churn_predictor import ChurnPredictor, get_predictor
 
 router = APIRouter(prefix="/api/customers", tags=["customers"])
 
-# Initialize services
-predictor = ChurnPredictor()
-
 
 def _generate_shap_values(customer, prediction: dict) -> list:
     """
@@ -424,14 +422,40 @@ class AllCustomersResponse(BaseModel):
     """All customers list response"""
     customers: List[dict]
     total: int
+    total_exact: bool = True  # False: cached estimate
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class CustomerSearchResponse(BaseModel):
+    """Customer search response"""
+    customers: List[dict]
+    page_size: int
+    next_cursor: Optional[str] = None  # None on the last page
+    total: Optional[int] = None  # Only when include_total=true
+
+
+def _customer_list_item(row) -> dict:
+    """List entry for a CUSTOMER_LIST_COLUMNS row"""
+    return {
+        "customer_id": row.customer_id,
+        "name": row.customer_id,  # Using customer_id as name
+        "email": None,  # Not in TrustedModel
+        "plan_type": row.internet_service,
+        "monthly_charge": float(row.monthly_charges),
+        "tenure": row.tenure,
+        "risk_score": float(row.risk_score) if row.risk_score is not None else 0.0,
+        "risk_level": row.risk_level or "Unknown"
+    }
 
 
 @router.get("/{customer_id}", response_model=CustomerDetailResponse)
-async def get_customer_detail(
+@blocking_handler
+def get_customer_detail(
     customer_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    predictor: ChurnPredictor = Depends(get_predictor)
 ):
     """
     Get detailed customer information with risk analysis
@@ -507,7 +531,8 @@ async def get_customer_detail(
             customer_id=customer.customer_id,
             risk_score=prediction["churn_probability"],
             risk_level=prediction["risk_level"],
-            shap_values={}  # TODO: Add SHAP values when implemented
+            shap_values={},  # TODO: Add SHAP values when implemented
+            model_name=prediction["model_version"]
         )
         
         return CustomerDetailResponse(
@@ -541,7 +566,8 @@ async def get_customer_detail(
 
 
 @router.get("/high-risk/list", response_model=HighRiskCustomersResponse)
-async def get_high_risk_customers(
+@blocking_handler
+def get_high_risk_customers(
     limit: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
@@ -557,22 +583,21 @@ async def get_high_risk_customers(
     try:
         repo = CustomerRepository(db)
         
-        # Get high-risk customers
-        customers = repo.get_high_risk_customers(limit=limit)
+        # Get high-risk customers with their latest prediction (one query)
+        rows = repo.get_high_risk_with_predictions(limit=limit)
         
         # Build response
-        customer_list = []
-        for customer in customers:
-            prediction = repo.get_latest_prediction(customer.customer_id)
-            if prediction:
-                customer_list.append({
-                    "customer_id": customer.customer_id,
-                    "name": customer.customer_id,  # Using customer_id as name
-                    "risk_score": float(prediction.risk_score),
-                    "risk_level": prediction.risk_level,
-                    "plan_type": customer.internet_service,
-                    "monthly_charge": float(customer.monthly_charges)
-                })
+        customer_list = [
+            {
+                "customer_id": row.customer_id,
+                "name": row.customer_id,  # Using customer_id as name
+                "risk_score": float(row.risk_score),
+                "risk_level": row.risk_level,
+                "plan_type": row.internet_service,
+                "monthly_charge": float(row.monthly_charges)
+            }
+            for row in rows
+        ]
         
         return HighRiskCustomersResponse(
             customers=customer_list,
@@ -587,7 +612,11 @@ async def get_high_risk_customers(
 
 
 @router.get("/random/get")
-async def get_random_customer(db: Session = Depends(get_db)):
+@blocking_handler
+def get_random_customer(
+    db: Session = Depends(get_db),
+    predictor: ChurnPredictor = Depends(get_predictor)
+):
     """
     Get a random customer for demo purposes
     
@@ -606,7 +635,7 @@ async def get_random_customer(db: Session = Depends(get_db)):
             )
         
         # Return customer detail
-        return await get_customer_detail(customer.customer_id, db)
+        return get_customer_detail.__wrapped__(customer.customer_id, db, predictor)
         
     except HTTPException:
         raise
@@ -618,59 +647,154 @@ async def get_random_customer(db: Session = Depends(get_db)):
 
 
 @router.get("/all/list", response_model=AllCustomersResponse)
-async def get_all_customers(
+@blocking_handler
+def get_all_customers(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    sort: str = Query("customer_id", pattern="^(customer_id|risk)$"),
+    exact_total: bool = False,
     db: Session = Depends(get_db)
 ):
     """
     Get all customers with pagination
     
+    Pages are fetched by cursor: pass the previous response's next_cursor
+    to get the next page at the same cost as the first one. page > 1
+    without a cursor still works for sort=customer_id (OFFSET, slower on
+    deep pages).
+    
     Args:
         page: Page number (starts from 1)
         page_size: Number of customers per page (1-100)
+        cursor: Continuation token from the previous page
+        sort: customer_id (ascending) or risk (highest risk first, scored customers only)
+        exact_total: Count customers exactly instead of a cached estimate
         
     Returns:
         Paginated list of all customers
     """
     try:
-        from app.db.models import Customer, PredictionRecord
-        offset = (page - 1) * page_size
+        repo = CustomerRepository(db)
         
-        customers_query = db.query(Customer).offset(offset).limit(page_size).all()
-        total_count = db.query(Customer).count()
+        # Customers with their latest prediction (one query)
+        next_cursor = None
+        if cursor is not None or page == 1:
+            try:
+                rows, next_cursor = repo.get_customers_page(cursor=cursor, limit=page_size, sort=sort)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Geçersiz sayfalama parametresi: {str(e)}"
+                )
+        elif sort == "customer_id":
+            rows = repo.get_customers_with_predictions(skip=(page - 1) * page_size, limit=page_size)
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Risk sıralamasında sonraki sayfalar için cursor kullanılmalıdır"
+            )
+        total_count = repo.count_customers(exact=exact_total)
         
         # Build response
-        customer_list = []
-        for customer in customers_query:
-            # Get latest prediction
-            prediction = db.query(PredictionRecord).filter(
-                PredictionRecord.customer_id == customer.customer_id
-            ).order_by(PredictionRecord.timestamp.desc()).first()
-            
-            risk_score = float(prediction.risk_score) if prediction else 0.0
-            risk_level = prediction.risk_level if prediction else "Unknown"
-            
-            customer_list.append({
-                "customer_id": customer.customer_id,
-                "name": customer.customer_id,  # Using customer_id as name
-                "email": None,  # Not in TrustedModel
-                "plan_type": customer.internet_service,
-                "monthly_charge": float(customer.monthly_charges),
-                "tenure": customer.tenure,
-                "risk_score": risk_score,
-                "risk_level": risk_level
-            })
+        customer_list = [_customer_list_item(row) for row in rows]
         
         return AllCustomersResponse(
             customers=customer_list,
             total=total_count,
+            total_exact=exact_total,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            next_cursor=next_cursor
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Müşteriler alınırken hata oluştu: {str(e)}"
         )
+
+
+@router.get("/search/list", response_model=CustomerSearchResponse)
+@blocking_handler
+def search_customers(
+    q: Optional[str] = Query(None, min_length=1, max_length=50, description="customer_id prefix"),
+    contract: Optional[List[str]] = Query(None),
+    internet_service: Optional[List[str]] = Query(None),
+    tenure_min: Optional[int] = Query(None, ge=0),
+    tenure_max: Optional[int] = Query(None, ge=0),
+    risk_level: Optional[List[str]] = Query(None, description="Low, Medium, High"),
+    risk_min: Optional[float] = Query(None, ge=0, le=1),
+    risk_max: Optional[float] = Query(None, ge=0, le=1),
+    sort: str = Query("customer_id", pattern="^(customer_id|risk|tenure|monthly_charges)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    page_size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Search customers with filters, sorting and cursor pagination
+    
+    All filters are optional and combined with AND; list parameters
+    (contract, internet_service, risk_level) can be repeated to match any
+    of several values. Filtering and sorting run in the database, and
+    next pages are fetched with the previous response's next_cursor.
+    
+    Args:
+        q: customer_id prefix
+        contract: Contract types (Month-to-month, One year, Two year)
+        internet_service: Internet services (DSL, Fiber optic, No)
+        tenure_min: Minimum tenure in months
+        tenure_max: Maximum tenure in months
+        risk_level: Risk bands of the latest prediction
+        risk_min: Minimum latest risk score
+        risk_max: Maximum latest risk score
+        sort: customer_id, risk, tenure or monthly_charges
+        order: asc or desc
+        page_size: Number of customers per page (1-100)
+        cursor: Continuation token from the previous page
+        include_total: Also count all matches (extra query, grows with the result size)
+        
+    Returns:
+        Page of matching customers
+    """
+    try:
+        repo = CustomerRepository(db)
+        filters = CustomerFilters(
+            contracts=contract,
+            internet_services=internet_service,
+            tenure_min=tenure_min,
+            tenure_max=tenure_max,
+            risk_levels=risk_level,
+            risk_min=risk_min,
+            risk_max=risk_max,
+            customer_id_prefix=q
+        )
+        
+        try:
+            rows, next_cursor = repo.search_customers(
+                filters, sort=sort, descending=order == "desc", cursor=cursor, limit=page_size
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Geçersiz sayfalama parametresi: {str(e)}"
+            )
+        
+        return CustomerSearchResponse(
+            customers=[_customer_list_item(row) for row in rows],
+            page_size=page_size,
+            next_cursor=next_cursor,
+            total=repo.count_search_results(filters) if include_total else None
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Müşteri araması sırasında hata oluştu: {str(e)}"
+        )
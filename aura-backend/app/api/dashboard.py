@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from typing import List, Dict
 from pydantic import BaseModel
 
+from app.core.threadpool import blocking_handler
 from app.db.base import get_db
 from app.repositories.customer_repository import CustomerRepository
 
@@ -29,7 +30,8 @@ class DashboardSummaryResponse(BaseModel):
 
 
 @router.get("/summary", response_model=DashboardSummaryResponse)
-async def get_dashboard_summary(
+@blocking_handler
+def get_dashboard_summary(
     limit: int = 10,
     db: Session = Depends(get_db)
 ):
@@ -50,21 +52,16 @@ async def get_dashboard_summary(
         # Get summary statistics
         stats = repo.get_summary_stats()
         
-        # Get top risky customers
-        high_risk_customers = repo.get_high_risk_customers(limit=limit)
-        
-        # Build top risky customers list
-        top_risky = []
-        for customer in high_risk_customers:
-            # Get latest prediction
-            prediction = repo.get_latest_prediction(customer.customer_id)
-            if prediction:
-                top_risky.append(CustomerRiskData(
-                    customer_id=customer.customer_id,
-                    name=customer.customer_id,  # Using customer_id as name
-                    risk_score=float(prediction.risk_score),
-                    risk_level=prediction.risk_level
-                ))
+        # Get top risky customers with their latest prediction (one query)
+        top_risky = [
+            CustomerRiskData(
+                customer_id=row.customer_id,
+                name=row.customer_id,  # Using customer_id as name
+                risk_score=float(row.risk_score),
+                risk_level=row.risk_level
+            )
+            for row in repo.get_high_risk_with_predictions(limit=limit)
+        ]
         
         return DashboardSummaryResponse(
             total_customers=stats.total_customers,
@@ -4,14 +4,12 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
+from app.core.threadpool import blocking_handler
 from app.db.base import get_db
-from app.services.churn_predictor import ChurnPredictor
+from app.services.churn_predictor import ChurnPredictor, get_predictor
 
 router = APIRouter(prefix="/api/predict", tags=["prediction"])
 
-# Initialize services
-predictor = ChurnPredictor()
-
 
 class ShapFeature(BaseModel):
     """SHAP feature importance"""
@@ -70,9 +68,11 @@ class PredictionResponse(BaseModel):
 
 
 @router.post("/calculate", response_model=PredictionResponse)
-async def calculate_risk(
+@blocking_handler
+def calculate_risk(
     request: PredictionRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    predictor: ChurnPredictor = Depends(get_predictor)
 ):
     """
     Calculate churn risk for hypothetical customer profile
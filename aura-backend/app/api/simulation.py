@@ -1,14 +1,23 @@
 """ROI Simulation API endpoints"""
+from typing import Iterator, List, Optional
+import json
+
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
+from app.core.threadpool import blocking_handler
 from app.db.base import get_db
 from app.repositories.customer_repository import CustomerRepository
-from app.services.roi_simulator import ROISimulator
+from app.services.roi_simulator import ROISimulator, TargetList
 
 router = APIRouter(prefix="/api/simulation", tags=["simulation"])
 
+# Ranked targets per chunk of the NDJSON stream
+TARGET_STREAM_CHUNK = 10000
+
 # Initialize simulator
 simulator = ROISimulator()
 
@@ -31,8 +40,44 @@ class SimulationResponse(BaseModel):
     coverage_percentage: float
 
 
+class SimulationSweepRequest(BaseModel):
+    """ROI sweep request: evenly spaced risk thresholds x campaign budgets"""
+    threshold_min: float = Field(0.0, ge=0.0, le=1.0, description="Lowest risk threshold (0-1)")
+    threshold_max: float = Field(1.0, ge=0.0, le=1.0, description="Highest risk threshold (0-1)")
+    threshold_steps: int = Field(21, ge=1, le=1001, description="Number of thresholds")
+    budget_min: float = Field(..., gt=0, description="Lowest campaign budget in TL")
+    budget_max: float = Field(..., gt=0, description="Highest campaign budget in TL")
+    budget_steps: int = Field(10, ge=1, le=100, description="Number of budgets")
+
+
+class SimulationSweepResponse(BaseModel):
+    """
+    ROI surface: per-threshold values are lists over thresholds,
+    per-point values are [threshold][budget] matrices
+    """
+    thresholds: List[float]
+    budgets: List[float]
+    total_customers: int
+    expected_retention_rate: float
+    targeted_customers: List[int]
+    projected_revenue: List[float]
+    coverage_percentage: List[float]
+    cost_per_customer: List[List[float]]
+    total_cost: List[List[float]]
+    roi: List[List[float]]
+    net_gain: List[List[float]]
+
+
+class TargetingRequest(BaseModel):
+    """Expected-value targeting request"""
+    campaign_budget: float = Field(..., gt=0, description="Campaign budget in TL")
+    cost_per_customer: float = Field(..., gt=0, description="Cost of contacting one customer in TL")
+    uplift: Optional[float] = Field(None, gt=0.0, le=1.0, description="Retention probability of a contacted churner (default: campaign effectiveness)")
+
+
 @router.post("/roi", response_model=SimulationResponse)
-async def simulate_roi(
+@blocking_handler
+def simulate_roi(
     request: SimulationRequest,
     db: Session = Depends(get_db)
 ):
@@ -51,12 +96,17 @@ async def simulate_roi(
         # Get current statistics
         stats = repo.get_summary_stats()
         
+        # Exact customers above the threshold and their LTV (risk histogram)
+        targeted_customers, targeted_ltv = repo.get_targeting_totals(request.risk_threshold)
+        
         # Run simulation
         result = simulator.simulate(
             risk_threshold=request.risk_threshold,
             campaign_budget=request.campaign_budget,
             total_customers=stats.total_customers,
-            risk_distribution=stats.risk_distribution
+            risk_distribution=stats.risk_distribution,
+            targeted_customers=targeted_customers,
+            targeted_ltv=targeted_ltv
         )
         
         return SimulationResponse(
@@ -75,3 +125,120 @@ async def simulate_roi(
             status_code=500,
             detail=f"ROI simülasyonu çalıştırılırken hata oluştu: {str(e)}"
         )
+
+
+@router.post("/roi/sweep", response_model=SimulationSweepResponse)
+@blocking_handler
+def sweep_roi(
+    request: SimulationSweepRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Simulate campaign ROI over a grid of risk thresholds and budgets
+    
+    One histogram read and one vectorized simulation for the whole grid,
+    so the simulation page can render and interpolate the ROI surface
+    without a request per combination. Thresholds are rounded to the
+    histogram's 0.001 bin edges.
+    
+    Args:
+        request: Threshold and budget ranges
+        
+    Returns:
+        Targeted customers, cost, projected revenue, ROI and net gain per grid point
+    """
+    if request.threshold_min > request.threshold_max or request.budget_min > request.budget_max:
+        raise HTTPException(
+            status_code=400,
+            detail="Geçersiz aralık: en küçük değer en büyük değerden büyük olamaz"
+        )
+    
+    try:
+        repo = CustomerRepository(db)
+        stats = repo.get_summary_stats()
+        histogram = repo.get_risk_histogram()
+        
+        bins = histogram.edge_bins(
+            np.linspace(request.threshold_min, request.threshold_max, request.threshold_steps)
+        )
+        thresholds = bins / histogram.bins
+        budgets = np.linspace(request.budget_min, request.budget_max, request.budget_steps)
+        grid = simulator.simulate_grid(bins, budgets, stats.total_customers, histogram)
+        
+        return SimulationSweepResponse(
+            thresholds=thresholds.tolist(),
+            budgets=budgets.tolist(),
+            total_customers=stats.total_customers,
+            expected_retention_rate=simulator.campaign_effectiveness,
+            **{metric: values.tolist() for metric, values in grid.items()}
+        )
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"ROI taraması çalıştırılırken hata oluştu: {str(e)}"
+        )
+
+
+def _target_lines(targets: TargetList) -> Iterator[str]:
+    """NDJSON lines of the ranked targets, TARGET_STREAM_CHUNK per chunk"""
+    for start in range(0, len(targets.customer_ids), TARGET_STREAM_CHUNK):
+        stop = start + TARGET_STREAM_CHUNK
+        yield "".join(
+            f'{{"rank": {rank}, "customer_id": {json.dumps(customer_id)}, "risk_score": {risk_score:.4f}, '
+            f'"ltv": {ltv:.2f}, "expected_value": {expected_value:.2f}}}\n'
+            for rank, customer_id, risk_score, ltv, expected_value in zip(
+                range(start + 1, stop + 1),
+                targets.customer_ids[start:stop].tolist(),
+                targets.risk_scores[start:stop].tolist(),
+                targets.ltv[start:stop].tolist(),
+                targets.expected_values[start:stop].tolist()
+            )
+        )
+
+
+@router.post("/targeting")
+@blocking_handler
+def target_customers(
+    request: TargetingRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Rank customers by expected saved revenue and pick the campaign targets
+    
+    Each scored customer's expected value is risk score * LTV * uplift; the
+    budget buys the top customers whose expected value covers the contact
+    cost. The ranked list is streamed as NDJSON (one target per line), the
+    totals are in the X-Targeted-Customers, X-Total-Cost,
+    X-Expected-Revenue and X-Net-Gain headers.
+    
+    Args:
+        request: Budget, contact cost and optional uplift
+        
+    Returns:
+        NDJSON stream of {rank, customer_id, risk_score, ltv, expected_value}
+    """
+    try:
+        customers = CustomerRepository(db).get_scored_customers()
+        targets = simulator.select_targets(
+            customers,
+            campaign_budget=request.campaign_budget,
+            cost_per_customer=request.cost_per_customer,
+            uplift=request.uplift
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Hedef müşteri listesi oluşturulurken hata oluştu: {str(e)}"
+        )
+    
+    return StreamingResponse(
+        _target_lines(targets),
+        media_type="application/x-ndjson",
+        headers={
+            "X-Targeted-Customers": str(len(targets.customer_ids)),
+            "X-Total-Cost": f"{targets.total_cost:.2f}",
+            "X-Expected-Revenue": f"{targets.expected_revenue:.2f}",
+            "X-Net-Gain": f"{targets.expected_revenue - targets.total_cost:.2f}"
+        }
+    )
@@ -1,113 +1,315 @@
-"""Simple in-memory caching layer with TTL support"""
-from typing import Any, Optional
-from datetime import datetime, timedelta
+"""In-memory caching layer with TTL support, LRU eviction and sharded locks"""
+from typing import Any, Callable, Dict, List, Optional, Set
+from collections import OrderedDict
+import heapq
+import itertools
+import sys
 import threading
+import time
 
+from app.core.config import settings
 
-class CacheEntry:
-    """Cache entry with value and expiration time"""
-    def __init__(self, value: Any, ttl_seconds: int):
-        self.value = value
-        self.expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
-    
-    def is_expired(self) -> bool:
-        """Check if cache entry has expired"""
-        return datetime.utcnow() > self.expires_at
+# Separator that structures cache keys into namespaces ("customer:123")
+KEY_SEPARATOR = ":"
+
+
+# Cache entries are plain (value, deadline, size) tuples: one small
+# allocation per set, and no datetime arithmetic on the lookup path.
+# deadline is a time.monotonic() timestamp, so wall-clock changes do not
+# expire or revive entries.
+VALUE, DEADLINE, SIZE = 0, 1, 2
+
+
+def _key_prefixes(key: str) -> List[str]:
+    """Namespace prefixes of a key: "a:b:c" -> ["a:", "a:b:"]"""
+    prefixes = []
+    end = key.find(KEY_SEPARATOR)
+    while end != -1:
+        prefixes.append(key[:end + 1])
+        end = key.find(KEY_SEPARATOR, end + 1)
+    return prefixes
+
+
+class _CacheShard:
+    """
+    One independently locked part of the cache
+
+    Entries are kept in LRU order. A min-heap of (deadline, key) drives
+    TTL expiry, so removing expired entries only touches expired entries.
+    Keys are also indexed under each of their namespace prefixes for
+    prefix invalidation.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.expiry_heap: List[tuple] = []
+        self.prefix_index: Dict[str, Set[str]] = {}
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._sequence = itertools.count()  # Heap tie-breaker
+
+    def set(self, key: str, value: Any, ttl_seconds: float, size: int):
+        now = time.monotonic()
+        deadline = now + ttl_seconds
+        with self.lock:
+            previous = self.entries.get(key)
+            if previous is None:
+                for prefix in _key_prefixes(key):
+                    self.prefix_index.setdefault(prefix, set()).add(key)
+            else:
+                self.bytes -= previous[SIZE]
+                self.entries.move_to_end(key)
+
+            self.entries[key] = (value, deadline, size)
+            self.bytes += size
+            heapq.heappush(self.expiry_heap, (deadline, next(self._sequence), key))
+
+            self._expire(now)
+            while self.entries and (
+                len(self.entries) > self.max_entries
+                or (self.max_bytes and self.bytes > self.max_bytes)
+            ):
+                oldest = next(iter(self.entries))
+                self.remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self.lock:
+            if key in self.entries:
+                self.remove(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.expiry_heap.clear()
+            self.prefix_index.clear()
+            self.bytes = 0
+
+    def invalidate_prefix(self, prefix: str):
+        with self.lock:
+            # Candidates come from the longest namespace prefix of the pattern
+            namespace_end = prefix.rfind(KEY_SEPARATOR)
+            if namespace_end == -1:
+                candidates = list(self.entries)
+            else:
+                candidates = list(self.prefix_index.get(prefix[:namespace_end + 1], ()))
+
+            for key in candidates:
+                if key.startswith(prefix):
+                    self.remove(key)
+
+    def cleanup_expired(self):
+        with self.lock:
+            self._expire(time.monotonic())
+
+    def _expire(self, now: float):
+        """Pop expired entries off the expiry heap (lock held)"""
+        heap = self.expiry_heap
+        while heap and heap[0][0] < now:
+            deadline, _, key = heapq.heappop(heap)
+            entry = self.entries.get(key)
+            # Skip heap items left behind by deleted or overwritten entries
+            if entry is not None and entry[DEADLINE] == deadline:
+                self.remove(key)
+                self.expirations += 1
+
+        # Stale heap items are otherwise only dropped when they reach the top
+        if len(heap) > 2 * len(self.entries) + 64:
+            self.expiry_heap = [item for item in heap if self._is_live(item)]
+            heapq.heapify(self.expiry_heap)
+
+    def _is_live(self, heap_item: tuple) -> bool:
+        entry = self.entries.get(heap_item[2])
+        return entry is not None and entry[DEADLINE] == heap_item[0]
+
+    def remove(self, key: str):
+        """Remove an entry and its index references (lock held)"""
+        entry = self.entries.pop(key)
+        self.bytes -= entry[SIZE]
+        for prefix in _key_prefixes(key):
+            keys = self.prefix_index.get(prefix)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.prefix_index[prefix]
 
 
 class InMemoryCache:
     """
-    Simple in-memory cache with TTL support
-    
-    This is a basic implementation for development. In production,
-    use Redis or Memcached for distributed caching.
+    Bounded in-memory cache with TTL support
+
+    Keys are spread over independently locked shards, so concurrent
+    requests only contend when they hit the same shard. Each shard holds
+    at most its share of max_entries / max_bytes and evicts its least
+    recently used entries beyond that. Expired entries are removed through
+    a per-shard expiry heap on every write and by cleanup_expired(), which
+    start_cleanup() can run periodically.
+
+    This is a process-local cache. For a cache shared between workers or
+    servers, use Redis or Memcached.
     """
-    
-    def __init__(self):
-        self._cache = {}
-        self._lock = threading.Lock()
-    
+
+    def __init__(
+        self,
+        num_shards: int = 16,
+        max_entries: int = 10000,
+        max_bytes: int = 0,
+        size_of: Callable[[Any], int] = sys.getsizeof
+    ):
+        """
+        Args:
+            num_shards: Number of independently locked shards
+            max_entries: Maximum number of entries over all shards
+            max_bytes: Approximate memory bound over all shards (0 = no byte limit)
+            size_of: Size estimate of a cached value in bytes (default:
+                     shallow sys.getsizeof)
+        """
+        self.num_shards = max(1, num_shards)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._size_of = size_of
+        shard_entries = max(1, -(-max_entries // self.num_shards))
+        shard_bytes = -(-max_bytes // self.num_shards) if max_bytes else 0
+        self._shards = [_CacheShard(shard_entries, shard_bytes) for _ in range(self.num_shards)]
+        self._cleanup_stop = threading.Event()
+        self._cleanup_thread: Optional[threading.Thread] = None
+
+    def _shard(self, key: str) -> _CacheShard:
+        return self._shards[hash(key) % self.num_shards]
+
     def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache
-        
+
         Args:
             key: Cache key
-            
+
         Returns:
             Cached value if exists and not expired, None otherwise
         """
-        with self._lock:
-            entry = self._cache.get(key)
-            
+        shard = self._shards[hash(key) % self.num_shards]
+        with shard.lock:
+            entry = shard.entries.get(key)
             if entry is None:
+                shard.misses += 1
                 return None
-            
-            if entry.is_expired():
+
+            if time.monotonic() > entry[DEADLINE]:
                 # Remove expired entry
-                del self._cache[key]
+                shard.remove(key)
+                shard.expirations += 1
+                shard.misses += 1
                 return None
-            
-            return entry.value
-    
-    def set(self, key: str, value: Any, ttl_seconds: int = 300):
+
+            shard.entries.move_to_end(key)
+            shard.hits += 1
+            return entry[VALUE]
+
+    def set(self, key: str, value: Any, ttl_seconds: float = 300):
         """
         Set value in cache with TTL
-        
+
         Args:
             key: Cache key
             value: Value to cache
             ttl_seconds: Time to live in seconds (default: 300 = 5 minutes)
         """
-        with self._lock:
-            self._cache[key] = CacheEntry(value, ttl_seconds)
-    
+        size = self._size_of(value) if self.max_bytes else 0
+        self._shard(key).set(key, value, ttl_seconds, size)
+
     def delete(self, key: str):
         """
         Delete value from cache
-        
+
         Args:
             key: Cache key to delete
         """
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-    
+        self._shard(key).delete(key)
+
     def clear(self):
         """Clear all cache entries"""
-        with self._lock:
-            self._cache.clear()
-    
+        for shard in self._shards:
+            shard.clear()
+
     def invalidate_pattern(self, pattern: str):
         """
         Invalidate all keys matching pattern
-        
+
+        Patterns are key prefixes. The part up to the last ':' is looked up
+        in each shard's prefix index, so invalidating "customer:" does not
+        scan unrelated keys.
+
         Args:
             pattern: Pattern to match (simple prefix matching)
         """
-        with self._lock:
-            keys_to_delete = [
-                key for key in self._cache.keys()
-                if key.startswith(pattern)
-            ]
-            for key in keys_to_delete:
-                del self._cache[key]
-    
+        for shard in self._shards:
+            shard.invalidate_prefix(pattern)
+
     def cleanup_expired(self):
         """Remove all expired entries"""
-        with self._lock:
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if entry.is_expired()
-            ]
-            for key in expired_keys:
-                del self._cache[key]
-    
+        for shard in self._shards:
+            shard.cleanup_expired()
+
+    def start_cleanup(self, interval_seconds: float = 60.0):
+        """
+        Run cleanup_expired() periodically on a daemon thread
+
+        Args:
+            interval_seconds: Time between cleanups
+        """
+        if self._cleanup_thread is not None and self._cleanup_thread.is_alive():
+            return
+        self._cleanup_stop.clear()
+
+        def run():
+            while not self._cleanup_stop.wait(interval_seconds):
+                self.cleanup_expired()
+
+        self._cleanup_thread = threading.Thread(target=run, name="cache-cleanup", daemon=True)
+        self._cleanup_thread.start()
+
+    def stop_cleanup(self):
+        """Stop the periodic cleanup thread"""
+        self._cleanup_stop.set()
+
     def size(self) -> int:
         """Get number of entries in cache"""
-        with self._lock:
-            return len(self._cache)
+        return sum(len(shard.entries) for shard in self._shards)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Entry count, approximate bytes, bounds and hit/miss/eviction/
+            expiration counts summed over all shards
+        """
+        totals = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        for shard in self._shards:
+            with shard.lock:
+                for name in totals:
+                    totals[name] += getattr(shard, name)
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "size": self.size(),
+            "bytes": sum(shard.bytes for shard in self._shards),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "shards": self.num_shards,
+            **totals,
+            "hit_rate": round(totals["hits"] / lookups, 4) if lookups else 0.0
+        }
 
 
 # Global cache instance
-cache = InMemoryCache()
+cache = InMemoryCache(
+    num_shards=settings.CACHE_SHARDS,
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES
+)
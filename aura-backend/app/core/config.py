@@ -10,10 +10,28 @@ class Settings(BaseSettings):
         else "sqlite:///./aura_dev.db"
     )
     
+    # Connection pool of file SQLite and PostgreSQL engines (app.db.base)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # PostgreSQL only: test connections on checkout, replace them after this age
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # SQLite connection PRAGMAs: WAL journal, fsync only at WAL checkpoints,
+    # wait for locks instead of failing, page cache (KiB) and mmap (bytes)
+    SQLITE_WAL: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KIB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+    
     # JWT
     SECRET_KEY: str = "default-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Key required in the X-Admin-Key header of model admin actions
+    # (empty = those actions are disabled)
+    ADMIN_API_KEY: str = ""
     
     # CORS - Support both local and production
     FRONTEND_URL: str = "http://localhost:3000"
@@ -21,6 +39,44 @@ class Settings(BaseSettings):
     # ML Models - Use relative paths that work in both local and production
     MODEL_PATH: str = "./models/best_model.pkl"
     PREPROCESSOR_PATH: str = "./models/preprocessor.pkl"
+    # Load models in the startup hook instead of on the first request
+    MODEL_WARMUP: bool = True
+    # Churn model directory (empty = aura-backend/models)
+    MODEL_DIR: str = ""
+    # Reload the churn model automatically when files in MODEL_DIR change
+    MODEL_WATCH: bool = False
+    MODEL_WATCH_INTERVAL_SECONDS: float = 5.0
+    # Use the NumPy tree evaluator: the memory-mapped export in <model dir>/compiled
+    # when present, otherwise a copy compiled from best_model.pkl at load time
+    MODEL_USE_COMPILED: bool = True
+    # Single-customer predictions kept in the LRU prediction cache (0 = disabled)
+    PREDICTION_CACHE_SIZE: int = 10000
+    # Processes scoring chunks in full-base scoring jobs (1 = score in-process)
+    SCORING_WORKERS: int = 1
+    
+    # Background jobs (app.core.jobs): concurrent jobs run by this process
+    # (0 = only submit; another API process runs them)
+    JOB_WORKERS: int = 1
+    # How often the job dispatcher looks for jobs submitted by other processes
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    
+    # Threads running the blocking route handlers (DB sessions, model
+    # predictions) off the event loop (app.core.threadpool)
+    API_THREADPOOL_SIZE: int = 40
+    
+    # Response/data cache (app.core.cache)
+    CACHE_SHARDS: int = 16
+    CACHE_MAX_ENTRIES: int = 10000
+    # Approximate memory bound in bytes (0 = entry count bound only)
+    CACHE_MAX_BYTES: int = 0
+    # Interval of the background sweep for expired entries (0 = disabled)
+    CACHE_CLEANUP_INTERVAL_SECONDS: float = 60.0
+    
+    # Scored customers kept in memory for /api/simulation/targeting
+    # (app.core.targeting_snapshot): background reload interval (0 = disabled)
+    # and the age at which a request reloads it itself
+    TARGETING_SNAPSHOT_REFRESH_SECONDS: float = 300.0
+    TARGETING_SNAPSHOT_MAX_AGE_SECONDS: float = 900.0
     
     class Config:
         env_file = ".env"
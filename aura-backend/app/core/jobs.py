@@ -0,0 +1,284 @@
+"""
+Background jobs for long-running admin tasks
+
+Submitting a job only stores it in the background_jobs table and returns
+its ID. A dispatcher thread claims queued jobs and runs them on a small
+thread pool, off the request path. Status, progress and cancellation go
+through the table, so any API process can report on or cancel a job, and
+jobs that were queued or running when the server stopped run again after
+the next start. Job handlers must therefore be safe to re-run (idempotent
+or resumable), like the built-in ones in app.services.admin_jobs.
+
+Jobs whose status is "running" are assumed to have been interrupted when
+a runner starts: with several API processes, set JOB_WORKERS=0 on all but
+one of them.
+"""
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import threading
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.db.models import BackgroundJob
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested"""
+
+
+class JobContext:
+    """Handle passed to a running job for progress reports and cancellation"""
+
+    def __init__(self, job_id: int, session_factory: Callable[[], Session]):
+        self.job_id = job_id
+        self.session_factory = session_factory
+
+    def report(self, **progress: Any):
+        """
+        Store the job's progress
+
+        Also the job's cancellation point: long jobs should report after
+        every unit of work.
+
+        Raises:
+            JobCancelled: If cancellation was requested
+        """
+        with self.session_factory() as db:
+            job = db.get(BackgroundJob, self.job_id)
+            job.progress = progress
+            cancel_requested = job.cancel_requested
+            db.commit()
+        if cancel_requested:
+            raise JobCancelled("Job cancelled")
+
+
+class JobRunner:
+    """Persistent job queue with an in-process thread pool"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        workers: int = 1,
+        poll_interval_seconds: float = 2.0
+    ):
+        """
+        Args:
+            session_factory: Creates database sessions
+            workers: Jobs run concurrently by this process
+            poll_interval_seconds: How often to look for jobs submitted
+                                   by other processes
+        """
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_interval_seconds = poll_interval_seconds
+        self._handlers: Dict[str, Callable[..., Optional[Dict]]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def register(self, kind: str, handler: Callable[..., Optional[Dict]]):
+        """
+        Register a job handler
+
+        Args:
+            kind: Job kind used by submit()
+            handler: Called as handler(context, **params); returns the
+                     job result (a JSON-serializable dict) or None
+        """
+        self._handlers[kind] = handler
+
+    def submit(self, kind: str, **params: Any) -> Dict[str, Any]:
+        """
+        Queue a job
+
+        Args:
+            kind: Registered job kind
+            **params: JSON-serializable handler arguments
+
+        Returns:
+            The queued job (see get())
+
+        Raises:
+            ValueError: If no handler is registered for kind
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        with self.session_factory() as db:
+            job = BackgroundJob(kind=kind, status="queued", params=params, cancel_requested=False)
+            db.add(job)
+            db.flush()
+            # Read before committing: afterwards a dispatcher may claim the job at once
+            result = self._job_dict(job)
+            db.commit()
+        self._wake.set()
+        return result
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's state
+
+        Returns:
+            Dictionary with id, kind, status, params, progress, result,
+            error, cancel_requested and timestamps, or None if not found
+        """
+        with self.session_factory() as db:
+            job = db.get(BackgroundJob, job_id)
+            return self._job_dict(job) if job is not None else None
+
+    def list_jobs(self, limit: int = 20, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Most recent jobs first"""
+        with self.session_factory() as db:
+            query = db.query(BackgroundJob)
+            if kind is not None:
+                query = query.filter(BackgroundJob.kind == kind)
+            return [self._job_dict(job) for job in query.order_by(BackgroundJob.id.desc()).limit(limit)]
+
+    def cancel(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a job
+
+        Queued jobs are cancelled right away; running jobs stop at their
+        next progress report.
+
+        Returns:
+            The job after the request (see get()), or None if not found
+        """
+        with self.session_factory() as db:
+            job = db.get(BackgroundJob, job_id)
+            if job is None:
+                return None
+            if job.status not in FINISHED_STATUSES:
+                job.cancel_requested = True
+                if job.status == "queued":
+                    job.status = "cancelled"
+                    job.finished_at = datetime.utcnow()
+                db.commit()
+            return self._job_dict(job)
+
+    def start(self):
+        """Requeue interrupted jobs and start dispatching on a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self.session_factory() as db:
+            requeued = db.execute(
+                update(BackgroundJob).where(BackgroundJob.status == "running").values(status="queued")
+            ).rowcount
+            db.commit()
+        if requeued:
+            print(f"🔄 Requeued {requeued} interrupted background job(s)")
+
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        self._thread = threading.Thread(target=self._dispatch, name="job-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = False):
+        """
+        Stop dispatching new jobs
+
+        Args:
+            wait: Wait for running jobs to finish (otherwise they are
+                  requeued by the next start)
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _dispatch(self):
+        while not self._stop.is_set():
+            # Cleared before claiming, so a submit during the claim wakes the next wait
+            self._wake.clear()
+            try:
+                while self._active < self.workers and not self._stop.is_set():
+                    job_id = self._claim()
+                    if job_id is None:
+                        break
+                    with self._lock:
+                        self._active += 1
+                    self._executor.submit(self._run, job_id)
+            except Exception as e:
+                print(f"❌ Job dispatcher error: {e}")
+            self._wake.wait(self.poll_interval_seconds)
+
+    def _claim(self) -> Optional[int]:
+        """Mark the oldest queued job as running (atomically) and return its ID"""
+        with self.session_factory() as db:
+            while True:
+                job_id = db.query(BackgroundJob.id).filter(
+                    BackgroundJob.status == "queued",
+                    BackgroundJob.kind.in_(list(self._handlers))
+                ).order_by(BackgroundJob.id).limit(1).scalar()
+                if job_id is None:
+                    return None
+                claimed = db.execute(
+                    update(BackgroundJob)
+                    .where(BackgroundJob.id == job_id, BackgroundJob.status == "queued")
+                    .values(status="running", started_at=datetime.utcnow(), error=None)
+                ).rowcount
+                db.commit()
+                if claimed:
+                    return job_id
+
+    def _run(self, job_id: int):
+        try:
+            with self.session_factory() as db:
+                job = db.get(BackgroundJob, job_id)
+                kind, params = job.kind, job.params or {}
+            print(f"🔄 Job {job_id} ({kind}) started")
+
+            try:
+                result = self._handlers[kind](JobContext(job_id, self.session_factory), **params)
+                status, error = "completed", None
+            except JobCancelled:
+                result, status, error = None, "cancelled", None
+            except Exception as e:
+                result, status, error = None, "failed", str(e)[:500]
+
+            with self.session_factory() as db:
+                job = db.get(BackgroundJob, job_id)
+                job.status = status
+                job.result = result
+                job.error = error
+                job.finished_at = datetime.utcnow()
+                db.commit()
+            icon = "✅" if status == "completed" else "⚠️" if status == "cancelled" else "❌"
+            print(f"{icon} Job {job_id} ({kind}) {status}" + (f": {error}" if error else ""))
+        except Exception as e:
+            print(f"❌ Job {job_id} could not be run: {e}")
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._wake.set()
+
+    @staticmethod
+    def _job_dict(job: BackgroundJob) -> Dict[str, Any]:
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "params": job.params,
+            "progress": job.progress,
+            "result": job.result,
+            "error": job.error,
+            "cancel_requested": job.cancel_requested,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at
+        }
+
+
+# Global job runner instance
+job_runner = JobRunner(
+    workers=max(settings.JOB_WORKERS, 1), poll_interval_seconds=settings.JOB_POLL_INTERVAL_SECONDS
+)
@@ -0,0 +1,335 @@
+"""Process-wide registry for ML model artifacts"""
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from datetime import datetime
+import gc
+import os
+import threading
+import time
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process in bytes (0 if unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class ModelRegistry:
+    """
+    Loads each registered model once per process and shares it
+
+    Models are loaded lazily on first use or eagerly through warm_up().
+    Load time and the process RSS growth during the load are recorded
+    per model so the footprint of each artifact can be monitored.
+
+    reload() swaps in a new version atomically: the replacement is loaded
+    and validated while the current model keeps serving, then a single
+    reference assignment publishes it. Requests that already hold the old
+    model finish on it; the old model is freed once they drop it.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[..., Any]] = {}
+        self._validators: Dict[str, Optional[Callable[[Any], None]]] = {}
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._reload_state: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._reload_locks: Dict[str, threading.Lock] = {}
+        self._swap_listeners: Dict[str, List[Callable[[Any], None]]] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[..., Any],
+        validator: Optional[Callable[[Any], None]] = None
+    ):
+        """
+        Register a model loader
+
+        Args:
+            name: Model name used to look the model up
+            loader: Callable returning the loaded model. Called with no
+                    arguments for the default artifact, or with a source
+                    (e.g. a model directory) on reload
+            validator: Optional callable that raises if a freshly loaded
+                       model is unusable (e.g. a smoke prediction)
+        """
+        with self._lock:
+            self._loaders[name] = loader
+            self._validators[name] = validator
+            self._locks.setdefault(name, threading.Lock())
+            self._reload_locks.setdefault(name, threading.Lock())
+            self._reload_state.setdefault(name, {"status": "idle"})
+
+    def on_swap(self, name: str, callback: Callable[[Any], None]):
+        """
+        Call callback(new_model) after reload() publishes a new version
+
+        Used to drop state derived from the previous version, such as
+        cached predictions.
+
+        Args:
+            name: Registered model name
+            callback: Callable receiving the newly published model
+        """
+        with self._lock:
+            self._swap_listeners.setdefault(name, []).append(callback)
+
+    def get(self, name: str) -> Any:
+        """
+        Get a model, loading it on first access
+
+        Args:
+            name: Registered model name
+
+        Returns:
+            The shared model instance
+
+        Raises:
+            KeyError: If no loader is registered under this name
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        if name not in self._loaders:
+            raise KeyError(f"No model registered under '{name}'")
+
+        # Per-model lock so concurrent first requests trigger a single load
+        with self._locks[name]:
+            model = self._models.get(name)
+            if model is None:
+                model = self._load(name)
+        return model
+
+    def _load(self, name: str) -> Any:
+        """Run the loader for a model, publish it and record its load statistics"""
+        model, stats = self._build(name)
+        self._publish(name, model, stats)
+        return model
+
+    def _build(self, name: str, source: Optional[str] = None):
+        """Load and validate a model without publishing it"""
+        rss_before = _current_rss_bytes()
+        start = time.perf_counter()
+        loader = self._loaders[name]
+        model = loader(source) if source is not None else loader()
+        validator = self._validators.get(name)
+        if validator is not None:
+            validator(model)
+        load_seconds = time.perf_counter() - start
+        rss_after = _current_rss_bytes()
+
+        stats = {
+            "loaded_at": datetime.utcnow().isoformat(),
+            "load_seconds": round(load_seconds, 3),
+            "rss_delta_bytes": max(rss_after - rss_before, 0),
+            "process_rss_bytes": rss_after,
+            "source": source,
+            "version": getattr(model, "model_version", None)
+        }
+        return model, stats
+
+    def _publish(self, name: str, model: Any, stats: Dict[str, Any]):
+        """Make a loaded model visible to new requests"""
+        self._stats[name] = stats
+        self._models[name] = model
+        print(f"✅ Model '{name}' loaded in {stats['load_seconds']:.2f}s "
+              f"(+{stats['rss_delta_bytes'] / 1024 / 1024:.1f} MB RSS)")
+
+    def reload(self, name: str, source: Optional[str] = None) -> Any:
+        """
+        Load a new version of a model and swap it in atomically
+
+        The current model keeps serving while the replacement loads and
+        is validated. If loading or validation fails, the current model
+        stays in place and the error is raised.
+
+        Args:
+            name: Registered model name
+            source: Optional artifact location passed to the loader
+
+        Returns:
+            The newly published model
+        """
+        if name not in self._loaders:
+            raise KeyError(f"No model registered under '{name}'")
+
+        with self._reload_locks[name]:
+            self._reload_state[name] = {
+                "status": "loading",
+                "source": source,
+                "started_at": datetime.utcnow().isoformat()
+            }
+            try:
+                model, stats = self._build(name, source)
+            except Exception as e:
+                self._reload_state[name] = {
+                    "status": "failed",
+                    "source": source,
+                    "error": str(e),
+                    "finished_at": datetime.utcnow().isoformat()
+                }
+                print(f"❌ Reload failed for model '{name}': {e}")
+                raise
+
+            with self._locks[name]:
+                old_model = self._models.get(name)
+                self._publish(name, model, stats)
+            self._reload_state[name] = {
+                "status": "idle",
+                "source": source,
+                "finished_at": datetime.utcnow().isoformat()
+            }
+
+        for callback in self._swap_listeners.get(name, []):
+            try:
+                callback(model)
+            except Exception as e:
+                print(f"⚠️  Swap listener failed for model '{name}': {e}")
+
+        # Drop our reference to the old model; in-flight requests keep theirs
+        del old_model
+        gc.collect()
+        return model
+
+    def reload_in_background(self, name: str, source: Optional[str] = None) -> bool:
+        """
+        Start reload() on a background thread
+
+        Returns:
+            False if a reload of this model is already running
+        """
+        if name not in self._loaders:
+            raise KeyError(f"No model registered under '{name}'")
+        if self._reload_locks[name].locked():
+            return False
+
+        def run():
+            try:
+                self.reload(name, source)
+            except Exception:
+                pass  # Recorded in the reload state
+
+        threading.Thread(target=run, name=f"model-reload-{name}", daemon=True).start()
+        return True
+
+    def warm_up(self, names: Optional[Iterable[str]] = None):
+        """
+        Load models eagerly, e.g. from an application startup hook
+
+        A model that fails to load is reported and left for lazy loading
+        on first use.
+
+        Args:
+            names: Models to load (default: all registered models)
+        """
+        for name in list(names if names is not None else self._loaders):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"❌ Warm-up failed for model '{name}': {e}")
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a model is currently loaded"""
+        return name in self._models
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get load statistics for every registered model
+
+        Returns:
+            Mapping of model name to load time, RSS growth and load state
+        """
+        return {
+            name: {
+                "loaded": name in self._models,
+                **self._stats.get(name, {}),
+                "reload": self._reload_state.get(name, {"status": "idle"})
+            }
+            for name in self._loaders
+        }
+
+
+class ModelWatcher:
+    """
+    Polls a model directory and reloads the model when its files change
+
+    Subdirectories are watched too, so re-exporting the memory-mapped
+    model (model_dir/compiled) also triggers a reload. A change is only
+    acted on once the files have stayed unchanged for a full polling
+    interval, so a directory that is still being written is never loaded
+    half-way.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        name: str,
+        model_dir: str,
+        interval_seconds: float = 5.0
+    ):
+        """
+        Args:
+            registry: Registry holding the model
+            name: Registered model name
+            model_dir: Directory to watch
+            interval_seconds: Polling interval
+        """
+        self.registry = registry
+        self.name = name
+        self.model_dir = model_dir
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _snapshot(self) -> Dict[str, tuple]:
+        """Modification time and size of every file in the directory tree, by relative path"""
+        snapshot = {}
+        for root, _, files in os.walk(self.model_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # Removed while scanning; the next poll sees the new state
+                snapshot[os.path.relpath(path, self.model_dir)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _run(self):
+        loaded = self._snapshot()
+        pending = None
+        while not self._stop.wait(self.interval_seconds):
+            current = self._snapshot()
+            if current == loaded:
+                pending = None
+            elif current != pending:
+                # Changed since the last poll - wait until it settles
+                pending = current
+            else:
+                print(f"🔄 Model files changed in {self.model_dir}, reloading '{self.name}'")
+                try:
+                    self.registry.reload(self.name, self.model_dir)
+                except Exception:
+                    pass  # Keep serving the current model; state is in registry stats
+                loaded = current
+                pending = None
+
+    def start(self):
+        """Start watching on a daemon thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"model-watch-{self.name}", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop watching"""
+        self._stop.set()
+
+
+# Global registry instance
+model_registry = ModelRegistry()
@@ -0,0 +1,45 @@
+"""Opaque continuation tokens for keyset (cursor) pagination"""
+from typing import Any, List
+import base64
+import binascii
+import json
+
+
+def encode_cursor(sort: str, key: List[Any]) -> str:
+    """
+    Encode the sort key of the last row on a page as a continuation token
+
+    Args:
+        sort: Sort order the key belongs to (tokens only continue that order)
+        key: Sort column values of the last row, e.g. [risk_score, customer_id]
+
+    Returns:
+        URL-safe token
+    """
+    payload = json.dumps({"s": sort, "k": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str, sort: str) -> List[Any]:
+    """
+    Decode a continuation token produced by encode_cursor()
+
+    Args:
+        token: Token from a previous page
+        sort: Sort order of the current request
+
+    Returns:
+        Sort key of the last row of the previous page
+
+    Raises:
+        ValueError: If the token is malformed or belongs to another sort order
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(payload, dict) or payload.get("s") != sort or not isinstance(payload.get("k"), list):
+        raise ValueError("Cursor does not match the requested sort order")
+    return payload["k"]
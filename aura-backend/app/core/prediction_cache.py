@@ -0,0 +1,142 @@
+"""Bounded LRU cache for single-customer churn predictions"""
+from typing import Dict, Hashable, Optional, Set, Tuple
+from collections import OrderedDict
+import hashlib
+import threading
+
+import numpy as np
+
+from app.core.config import settings
+
+
+class PredictionCache:
+    """
+    LRU cache of churn probabilities keyed by encoded feature vector
+
+    Keys combine the model version with a hash of the scaled 19-feature
+    vector, so identical profiles share an entry (e.g. repeated what-if
+    requests) and a new model version never sees an old entry. Entries are
+    also indexed by customer_id so a customer's predictions can be dropped
+    when the customer row changes.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Args:
+            max_entries: Maximum number of cached predictions (0 disables the cache)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, bytes], float]" = OrderedDict()
+        self._keys_by_customer: Dict[Hashable, Set[Tuple[str, bytes]]] = {}
+        self._customers_by_key: Dict[Tuple[str, bytes], Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(features: np.ndarray, model_version: str) -> Tuple[str, bytes]:
+        """
+        Build the cache key for an encoded feature vector
+
+        Args:
+            features: Scaled (1, 19) float64 feature matrix
+            model_version: Version of the model producing the prediction
+        """
+        digest = hashlib.blake2b(np.ascontiguousarray(features).tobytes(), digest_size=16).digest()
+        return model_version, digest
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[float]:
+        """
+        Get a cached churn probability and mark it as recently used
+
+        Returns:
+            Cached probability, or None on a miss
+        """
+        with self._lock:
+            probability = self._entries.get(key)
+            if probability is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return probability
+
+    def set(self, key: Tuple[str, bytes], probability: float, customer_id: Optional[Hashable] = None):
+        """
+        Cache a churn probability, evicting the least recently used entries
+
+        Args:
+            key: Key from make_key()
+            probability: Churn probability to cache
+            customer_id: Customer the prediction was made for (enables
+                         invalidate_customer); None for anonymous profiles
+        """
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = probability
+            self._entries.move_to_end(key)
+            if customer_id is not None:
+                self._keys_by_customer.setdefault(customer_id, set()).add(key)
+                self._customers_by_key.setdefault(key, set()).add(customer_id)
+
+            while len(self._entries) > self.max_entries:
+                oldest, _ = self._entries.popitem(last=False)
+                self._unindex(oldest)
+                self.evictions += 1
+
+    def invalidate_customer(self, customer_id: Hashable):
+        """
+        Drop every cached prediction made for a customer
+
+        Args:
+            customer_id: Customer whose data changed
+        """
+        with self._lock:
+            for key in self._keys_by_customer.pop(customer_id, ()):
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+                self._unindex(key)
+
+    def clear(self):
+        """Drop all entries, e.g. after the model was swapped"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys_by_customer.clear()
+            self._customers_by_key.clear()
+
+    def _unindex(self, key: Tuple[str, bytes]):
+        """Remove a key from the customer index (lock held)"""
+        for customer_id in self._customers_by_key.pop(key, ()):
+            keys = self._keys_by_customer.get(customer_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_customer[customer_id]
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters for sizing
+
+        Returns:
+            Size, capacity, hit/miss/eviction/invalidation counts and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Global prediction cache instance
+prediction_cache = PredictionCache(settings.PREDICTION_CACHE_SIZE)
@@ -0,0 +1,92 @@
+"""Risk levels, customer lifetime value and the risk score histogram (shared by repositories and services)"""
+from typing import NamedTuple, Tuple, Union
+import numpy as np
+
+# Churn probability at which a customer becomes High / Medium risk
+HIGH_RISK_THRESHOLD = 0.7
+MEDIUM_RISK_THRESHOLD = 0.4
+
+# Customer lifetime value: monthly charges over the expected customer
+# lifetime, the tenure so far clipped to [LTV_MIN_MONTHS, LTV_MAX_MONTHS]
+LTV_MIN_MONTHS = 12
+LTV_MAX_MONTHS = 72
+
+# Risk score bins of RiskHistogram (bin width 0.001)
+RISK_HISTOGRAM_BINS = 1000
+
+
+def customer_ltv(monthly_charges, tenure):
+    """
+    Customer lifetime value (vectorized)
+    
+    Args:
+        monthly_charges: Monthly charges (scalar or array, None/NaN = 0)
+        tenure: Tenure in months (scalar or array, None/NaN = LTV_MIN_MONTHS)
+        
+    Returns:
+        monthly_charges * clip(tenure, LTV_MIN_MONTHS, LTV_MAX_MONTHS)
+    """
+    monthly_charges = np.nan_to_num(np.asarray(monthly_charges, dtype=np.float64))
+    tenure = np.nan_to_num(np.asarray(tenure, dtype=np.float64))
+    return monthly_charges * np.clip(tenure, LTV_MIN_MONTHS, LTV_MAX_MONTHS)
+
+
+class ScoredCustomers(NamedTuple):
+    """Scored customers as parallel arrays"""
+    customer_ids: np.ndarray  # object
+    risk_scores: np.ndarray  # float64, latest risk score
+    ltv: np.ndarray  # float64, customer_ltv()
+
+
+class RiskHistogram:
+    """
+    Scored customers and their LTV sum per risk score bin
+    
+    Bin i holds risk scores in [i / bins, (i + 1) / bins), 1.0 in the last
+    bin. Suffix sums built once answer "how many customers
+    at or above a threshold, and what is their LTV" in O(1) per threshold,
+    exact for thresholds on a bin edge and within the threshold's own bin
+    otherwise (CustomerRepository.get_targeting_totals corrects that bin).
+    """
+    
+    def __init__(self, counts: np.ndarray, ltv_sums: np.ndarray):
+        """
+        Args:
+            counts: Customers per bin
+            ltv_sums: LTV sum per bin
+        """
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.ltv_sums = np.asarray(ltv_sums, dtype=np.float64)
+        self.bins = len(self.counts)
+        # Totals of bins i..bins-1, with a trailing 0 for i == bins
+        self._counts_from = np.append(np.cumsum(self.counts[::-1])[::-1], 0)
+        self._ltv_from = np.append(np.cumsum(self.ltv_sums[::-1])[::-1], 0.0)
+    
+    @property
+    def total_customers(self) -> int:
+        """Scored customers"""
+        return int(self._counts_from[0])
+    
+    def bin_index(self, thresholds: Union[float, np.ndarray]) -> np.ndarray:
+        """Bins of risk thresholds: floor(threshold * bins), 1.0 in the last bin"""
+        scaled = np.asarray(thresholds, dtype=np.float64) * self.bins
+        return np.clip(scaled.astype(np.int64), 0, self.bins - 1)
+    
+    def edge_bins(self, thresholds: Union[float, np.ndarray]) -> np.ndarray:
+        """Bins whose lower edge (bin / bins) is nearest to each threshold"""
+        scaled = np.rint(np.asarray(thresholds, dtype=np.float64) * self.bins)
+        return np.clip(scaled, 0, self.bins - 1).astype(np.int64)
+    
+    def totals_from_bin(self, bin_indexes: Union[int, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Customers and LTV sum in the given bins and above"""
+        bin_indexes = np.asarray(bin_indexes)
+        return self._counts_from[bin_indexes], self._ltv_from[bin_indexes]
+    
+    def targeted(self, thresholds: Union[float, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Customers and LTV sum at or above risk thresholds, at bin resolution
+        
+        The threshold's own bin is counted in full, so the result is an
+        upper bound off by at most that bin's customers.
+        """
+        return self.totals_from_bin(self.bin_index(thresholds))
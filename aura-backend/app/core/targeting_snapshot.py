@@ -0,0 +1,100 @@
+"""Per-process snapshot of the scored customers for expected-value targeting"""
+from typing import Any, Callable, Optional
+import threading
+import time
+
+from app.core.config import settings
+
+
+class TargetingSnapshot:
+    """
+    Scored customer arrays kept in memory between targeting requests
+
+    Loading every scored customer takes seconds on large bases, ranking
+    them takes milliseconds. Writes do not invalidate the snapshot:
+    start_refresh() reloads it on a timer in the background while
+    requests keep ranking the previous copy, so a targeting list is at
+    most one refresh interval behind the database. A request only loads
+    synchronously for the first list, or when the snapshot is older than
+    max_age_seconds (no refresh thread running).
+    """
+
+    def __init__(self, max_age_seconds: float = 900.0):
+        self.max_age_seconds = max_age_seconds
+        self._data: Any = None
+        self._loaded_at: Optional[float] = None
+        # Held while loading, so concurrent loads wait for one another
+        self._load_lock = threading.Lock()
+        self._refresh_stop = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self.loads = 0
+
+    def _is_fresh(self) -> bool:
+        return self._data is not None and time.monotonic() - self._loaded_at <= self.max_age_seconds
+
+    def get(self, load: Callable[[], Any]) -> Any:
+        """
+        Get the snapshot, loading it if there is none or it is too old
+
+        Args:
+            load: Loads the data (concurrent requests wait for one load
+                  instead of loading again)
+        """
+        data = self._data
+        if self._is_fresh():
+            return data
+        with self._load_lock:
+            if not self._is_fresh():
+                self._store(load())
+            return self._data
+
+    def refresh(self, load: Callable[[], Any]):
+        """Reload the snapshot; requests keep getting the current copy meanwhile"""
+        with self._load_lock:
+            self._store(load())
+
+    def _store(self, data: Any):
+        self._data = data
+        self._loaded_at = time.monotonic()
+        self.loads += 1
+
+    def start_refresh(self, load: Callable[[], Any], interval_seconds: float = 300.0):
+        """
+        Run refresh() periodically on a daemon thread
+
+        Only a loaded snapshot is refreshed, so processes that never serve
+        a targeting list never load one.
+
+        Args:
+            load: Loads the data (opens its own database session)
+            interval_seconds: Time between refreshes
+        """
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_stop.clear()
+
+        def run():
+            while not self._refresh_stop.wait(interval_seconds):
+                if self._data is None:
+                    continue
+                try:
+                    self.refresh(load)
+                except Exception as e:
+                    print(f"⚠️  Targeting snapshot refresh failed: {e}")
+
+        self._refresh_thread = threading.Thread(target=run, name="targeting-snapshot-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def stop_refresh(self):
+        """Stop the periodic refresh thread"""
+        self._refresh_stop.set()
+
+    def clear(self):
+        """Drop the snapshot"""
+        with self._load_lock:
+            self._data = None
+            self._loaded_at = None
+
+
+# Global targeting snapshot instance
+targeting_snapshot = TargetingSnapshot(settings.TARGETING_SNAPSHOT_MAX_AGE_SECONDS)
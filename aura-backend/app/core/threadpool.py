@@ -0,0 +1,62 @@
+"""
+Thread pool for blocking route handlers
+
+Handlers that use a request-scoped DB session (Depends(get_db)) or run the
+model do synchronous work. Decorated with @blocking_handler, such a sync
+handler runs on a pool of API_THREADPOOL_SIZE threads while the event loop
+keeps serving other requests:
+
+    @router.get("/summary", response_model=DashboardSummaryResponse)
+    @blocking_handler
+    def get_dashboard_summary(db: Session = Depends(get_db)):
+        ...
+
+A plain def handler is not enough: FastAPI validates a def handler's
+response on the shared thread pool *before* closing its dependencies, so
+every request needs a second thread while its session still holds a
+pooled DB connection. Under load all threads end up waiting for a
+connection that only a queued request could release, and the server
+hangs until the pool timeout. Decorated handlers are coroutines to
+FastAPI, so their response is validated on the event loop and the session
+is closed right after.
+"""
+from typing import Any, Callable, TypeVar
+import functools
+
+import anyio.to_thread
+from anyio import CapacityLimiter
+from anyio.lowlevel import RunVar
+
+from app.core.config import settings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# One limiter per event loop, like anyio's default thread limiter
+_handler_limiter: RunVar[CapacityLimiter] = RunVar("aura_handler_limiter")
+
+
+def handler_limiter() -> CapacityLimiter:
+    """Capacity limiter of the blocking handler pool for the running event loop"""
+    try:
+        return _handler_limiter.get()
+    except LookupError:
+        limiter = CapacityLimiter(max(settings.API_THREADPOOL_SIZE, 1))
+        _handler_limiter.set(limiter)
+        return limiter
+
+
+def blocking_handler(func: F) -> F:
+    """
+    Run a sync route handler on the blocking handler thread pool
+
+    The wrapper keeps the handler's signature (FastAPI follows
+    __wrapped__), so parameters and dependencies work unchanged. The
+    undecorated function stays available as func.__wrapped__.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await anyio.to_thread.run_sync(
+            functools.partial(func, *args, **kwargs), limiter=handler_limiter()
+        )
+
+    return wrapper  # type: ignore[return-value]
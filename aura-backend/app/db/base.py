@@ -1,9 +1,89 @@
-from sqlalchemy import create_engine
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    create_engine() keyword arguments for a database URL
+
+    File SQLite databases and server databases (PostgreSQL) get a
+    QueuePool sized by DB_POOL_SIZE / DB_MAX_OVERFLOW; server databases
+    also get pre-ping and connection recycling. In-memory SQLite keeps
+    SQLAlchemy's default pool (one connection per thread).
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            return {}
+        return {
+            "connect_args": {"check_same_thread": False},
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS
+        }
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS
+    }
+
+
+def sqlite_pragmas(in_memory: bool = False) -> Dict[str, Any]:
+    """
+    PRAGMAs set on every new SQLite connection
+
+    WAL lets readers run while a prediction is being written (rollback
+    journal mode locks the whole file for the write); with
+    synchronous=NORMAL a commit only syncs the WAL at checkpoints. WAL and
+    mmap do not apply to in-memory databases.
+    """
+    pragmas = {
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KIB,
+        "synchronous": settings.SQLITE_SYNCHRONOUS
+    }
+    if not in_memory:
+        if settings.SQLITE_WAL:
+            pragmas["journal_mode"] = "WAL"
+        pragmas["mmap_size"] = settings.SQLITE_MMAP_SIZE
+    return pragmas
+
+
+def create_db_engine(database_url: Optional[str] = None, **kwargs: Any) -> Engine:
+    """
+    Create an engine configured for its backend (see engine_options and
+    sqlite_pragmas)
+
+    Args:
+        database_url: Database URL (default: settings.DATABASE_URL)
+        **kwargs: Extra create_engine() arguments, overriding the defaults
+    """
+    database_url = database_url or settings.DATABASE_URL
+    new_engine = create_engine(database_url, **{**engine_options(database_url), **kwargs})
+
+    if new_engine.dialect.name == "sqlite":
+        pragmas = sqlite_pragmas(in_memory=make_url(database_url).database in (None, "", ":memory:"))
+
+        @event.listens_for(new_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name} = {value}")
+            finally:
+                cursor.close()
+
+    return new_engine
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
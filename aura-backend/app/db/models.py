@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, JSON, DECIMAL
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, JSON, DECIMAL, Index
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -42,6 +42,15 @@ class Customer(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Customer search: equality / range filters, paged in customer_id order
+        Index("ix_customers_contract_customer_id", "contract", "customer_id"),
+        Index("ix_customers_internet_service_customer_id", "internet_service", "customer_id"),
+        # Tenure range filter and tenure / monthly charge sorting (keyset on customer_id)
+        Index("ix_customers_tenure_customer_id", "tenure", "customer_id"),
+        Index("ix_customers_monthly_charges_customer_id", "monthly_charges", "customer_id"),
+    )
 
 
 class PredictionRecord(Base):
@@ -59,6 +68,92 @@ class PredictionRecord(Base):
     user_id = Column(String(50))
 
 
+class CustomerLatestPrediction(Base):
+    """Latest prediction per customer - kept in sync by CustomerRepository.save_prediction(s)"""
+    __tablename__ = "customer_latest_prediction"
+    
+    customer_id = Column(String(50), ForeignKey("customers.customer_id"), primary_key=True)
+    prediction_id = Column(Integer, ForeignKey("predictions.id"))  # Audit row this was copied from
+    churn_probability = Column(Float, nullable=False)
+    risk_score = Column(Float, nullable=False)
+    risk_level = Column(String(20), nullable=False)  # Low, Medium, High
+    predicted_churn = Column(String(10), nullable=False)  # Yes, No
+    model_name = Column(String(100))
+    timestamp = Column(DateTime(timezone=True), nullable=False)
+    
+    __table_args__ = (
+        # Risk-sorted listing and its keyset cursor (risk_score, customer_id)
+        Index("ix_customer_latest_prediction_risk_score", "risk_score", "customer_id"),
+        # High-risk list: risk_level filter, risk_score order
+        Index("ix_customer_latest_prediction_level_score", "risk_level", "risk_score"),
+    )
+
+
+class RiskRollup(Base):
+    """Customers and risk score sum per dashboard segment - kept in sync by app.repositories.risk_rollup"""
+    __tablename__ = "risk_rollup"
+    
+    risk_level = Column(String(20), primary_key=True)  # Low, Medium, High, Unknown (no prediction)
+    contract = Column(String(50), primary_key=True)  # "" if not set
+    internet_service = Column(String(50), primary_key=True)  # "" if not set
+    customer_count = Column(Integer, nullable=False, default=0)
+    risk_score_sum = Column(Float, nullable=False, default=0.0)  # Sum of latest risk scores
+
+
+class RiskHistogramBin(Base):
+    """Scored customers and LTV sum per risk score bin - kept in sync by app.repositories.risk_rollup"""
+    __tablename__ = "risk_histogram"
+    
+    bin = Column(Integer, primary_key=True)  # floor(risk_score * RISK_HISTOGRAM_BINS), 1.0 in the last bin
+    customer_count = Column(Integer, nullable=False, default=0)
+    ltv_sum = Column(Float, nullable=False, default=0.0)  # Sum of customer lifetime values
+
+
+class DirtyCustomer(Base):
+    """Incremental scoring dirty set - customers whose features changed since their latest prediction"""
+    __tablename__ = "dirty_customers"
+    
+    customer_id = Column(String(50), ForeignKey("customers.customer_id"), primary_key=True)
+    marked_at = Column(DateTime(timezone=True), nullable=False)  # Last change; cleared only if unchanged since the read
+
+
+class ScoringRun(Base):
+    """Full-base scoring job runs - progress checkpoint for resuming an interrupted run"""
+    __tablename__ = "scoring_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String(20), nullable=False, default="running")  # running, completed, failed
+    model_version = Column(String(100))
+    only_unscored = Column(Boolean, default=False)  # Skip customers that already have a prediction
+    incremental = Column(Boolean, default=False)  # Only changed customers and stale model versions
+    total_customers = Column(Integer)  # Customers to score when the run started
+    scored_count = Column(Integer, default=0)
+    error_count = Column(Integer, default=0)
+    last_customer_id = Column(String(50))  # Checkpoint: every customer up to this ID is done
+    error = Column(String(500))
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+
+class BackgroundJob(Base):
+    """Background jobs (CSV load, scoring, seeding) - state shared by all API processes"""
+    __tablename__ = "background_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)  # load_csv, score_customers, seed_database
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, completed, failed, cancelled
+    params = Column(JSON)
+    progress = Column(JSON)  # Last progress report of the running job
+    result = Column(JSON)
+    error = Column(String(500))
+    cancel_requested = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+
 class Campaign(Base):
     """Campaigns catalog - available retention offers"""
     __tablename__ = "campaigns"
@@ -1,9 +1,18 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.orm import Session
+from app.core.cache import cache
 from app.core.config import settings
-from app.api import dashboard, customers, prediction, simulation
+from app.core.jobs import job_runner
+from app.core.model_registry import ModelWatcher, model_registry
+from app.core.targeting_snapshot import targeting_snapshot
+from app.api import admin, dashboard, customers, prediction, simulation
 from app.db.base import Base, engine
-import os
+from app.db.models import Customer, CustomerLatestPrediction, PredictionRecord, RiskHistogramBin, RiskRollup
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.risk_rollup import rebuild_risk_rollup
+from app.services.admin_jobs import register_admin_jobs
+from app.services.churn_predictor import CHURN_MODEL, DEFAULT_MODEL_DIR
 
 app = FastAPI(
     title="AURA API",
@@ -11,12 +20,73 @@ app = FastAPI(
     version="1.0.0"
 )
 
+def _load_scored_customers():
+    """Load the targeting snapshot in its own session (refresh thread)"""
+    with Session(bind=engine) as db:
+        return CustomerRepository(db).load_scored_customers()
+
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
     # Create tables if they don't exist
     Base.metadata.create_all(bind=engine)
     print("✅ Database tables created")
+    
+    # Populate the latest-prediction table for databases predating it
+    with Session(bind=engine) as db:
+        if (
+            db.query(CustomerLatestPrediction).first() is None
+            and db.query(PredictionRecord).first() is not None
+        ):
+            count = CustomerRepository(db).backfill_latest_predictions()
+            print(f"✅ Latest predictions backfilled for {count} customers")
+        
+        # ...and the dashboard risk rollup / histogram
+        if (
+            db.query(RiskRollup).first() is None and db.query(Customer).first() is not None
+        ) or (
+            db.query(RiskHistogramBin).first() is None and db.query(CustomerLatestPrediction).first() is not None
+        ):
+            segments = rebuild_risk_rollup(db)
+            db.commit()
+            print(f"✅ Risk rollup rebuilt ({segments} segments)")
+    
+    # Load ML models once per worker before serving traffic
+    if settings.MODEL_WARMUP:
+        model_registry.warm_up()
+    
+    # Pick up new model files without restarting the server
+    if settings.MODEL_WATCH:
+        model_dir = settings.MODEL_DIR or DEFAULT_MODEL_DIR
+        app.state.model_watcher = ModelWatcher(
+            model_registry, CHURN_MODEL, model_dir, settings.MODEL_WATCH_INTERVAL_SECONDS
+        )
+        app.state.model_watcher.start()
+        print(f"👀 Watching {model_dir} for model updates")
+    
+    # Remove expired cache entries even from shards that see no writes
+    if settings.CACHE_CLEANUP_INTERVAL_SECONDS > 0:
+        cache.start_cleanup(settings.CACHE_CLEANUP_INTERVAL_SECONDS)
+    
+    # Keep the targeting snapshot current without reloading it per request
+    if settings.TARGETING_SNAPSHOT_REFRESH_SECONDS > 0:
+        targeting_snapshot.start_refresh(_load_scored_customers, settings.TARGETING_SNAPSHOT_REFRESH_SECONDS)
+    
+    # Run admin jobs (CSV load, scoring, seeding) off the request path
+    if settings.JOB_WORKERS > 0:
+        job_runner.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    watcher = getattr(app.state, "model_watcher", None)
+    if watcher is not None:
+        watcher.stop()
+    cache.stop_cleanup()
+    targeting_snapshot.stop_refresh()
+    job_runner.stop()
+
+# Admin tasks run as background jobs; status via /api/admin/jobs/{job_id}
+register_admin_jobs(job_runner)
 
 # CORS middleware - Allow production and development origins
 allowed_origins = [
@@ -32,6 +102,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Totals of the streamed /api/simulation/targeting list
+    expose_headers=["X-Targeted-Customers", "X-Total-Cost", "X-Expected-Revenue", "X-Net-Gain"],
 )
 
 # Include routers
@@ -39,6 +111,7 @@ app.include_router(dashboard.router)
 app.include_router(customers.router)
 app.include_router(prediction.router)
 app.include_router(simulation.router)
+app.include_router(admin.router)
 
 @app.get("/")
 async def root():
@@ -52,252 +125,32 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
-@app.post("/load-csv-data")
-async def load_csv_data():
-    """Load all 7043 customers from TrustedModel CSV"""
-    from sqlalchemy.orm import Session
-    from app.db.models import Customer, PredictionRecord
-    import pandas as pd
-    import os
-    from datetime import datetime
-    
-    db = Session(bind=engine)
-    try:
-        # Check if already loaded
-        count = db.query(Customer).count()
-        if count >= 7000:
-            return {"message": f"Database already has {count} customers", "loaded": False}
-        
-        # Get CSV path - Fix for Render deployment
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        # Go up from app/main.py to aura-backend/
-        backend_dir = os.path.dirname(base_dir)
-        csv_path = os.path.join(backend_dir, "TrustedModel", "WA_Fn-UseC_-Telco-Customer-Churn.csv")
-        
-        # Read CSV
-        df = pd.read_csv(csv_path)
-        
-        # Clean data
-        df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
-        df['TotalCharges'].fillna(0, inplace=True)
-        
-        loaded_count = 0
-        
-        for _, row in df.iterrows():
-            customer = Customer(
-                customer_id=row['customerID'],
-                gender=row['gender'],
-                senior_citizen=int(row['SeniorCitizen']),
-                partner=row['Partner'],
-                dependents=row['Dependents'],
-                tenure=int(row['tenure']),
-                phone_service=row['PhoneService'],
-                multiple_lines=row['MultipleLines'],
-                internet_service=row['InternetService'],
-                online_security=row['OnlineSecurity'],
-                online_backup=row['OnlineBackup'],
-                device_protection=row['DeviceProtection'],
-                tech_support=row['TechSupport'],
-                streaming_tv=row['StreamingTV'],
-                streaming_movies=row['StreamingMovies'],
-                contract=row['Contract'],
-                paperless_billing=row['PaperlessBilling'],
-                payment_method=row['PaymentMethod'],
-                monthly_charges=float(row['MonthlyCharges']),
-                total_charges=float(row['TotalCharges']),
-                churn=row['Churn']
-            )
-            db.add(customer)
-            loaded_count += 1
-        
-        db.commit()
-        return {"message": f"Loaded {loaded_count} customers from CSV", "loaded": True, "count": loaded_count}
-        
-    except Exception as e:
-        db.rollback()
-        return {"error": str(e), "loaded": False}
-    finally:
-        db.close()
+def _job_accepted(job: dict) -> dict:
+    """202 response body for a submitted background job"""
+    return {
+        "message": f"Job {job['id']} ({job['kind']}) queued",
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": f"/api/admin/jobs/{job['id']}"
+    }
 
-@app.post("/predict-all-customers")
-async def predict_all_customers(batch_size: int = 100):
-    """Run ML predictions for all customers in database (in batches to avoid timeout)"""
-    from sqlalchemy.orm import Session
-    from app.db.models import Customer, PredictionRecord
-    from app.services.churn_predictor import ChurnPredictor
-    from app.repositories.customer_repository import CustomerRepository
-    
-    db = Session(bind=engine)
-    try:
-        predictor = ChurnPredictor()
-        repo = CustomerRepository(db)
-        
-        # Get customers without predictions
-        customers_with_predictions = db.query(PredictionRecord.customer_id).distinct().all()
-        predicted_ids = [c[0] for c in customers_with_predictions]
-        
-        customers = db.query(Customer).filter(
-            ~Customer.customer_id.in_(predicted_ids)
-        ).limit(batch_size).all()
-        
-        total = len(customers)
-        
-        if total == 0:
-            # Check total customers
-            all_customers = db.query(Customer).count()
-            all_predictions = db.query(PredictionRecord).distinct(PredictionRecord.customer_id).count()
-            return {
-                "message": "All customers already have predictions",
-                "total_customers": all_customers,
-                "total_predictions": all_predictions,
-                "predicted": 0
-            }
-        
-        success_count = 0
-        error_count = 0
-        
-        for customer in customers:
-            try:
-                # Prepare customer data
-                customer_data = {
-                    "customer_id": customer.customer_id,
-                    "gender": customer.gender,
-                    "senior_citizen": customer.senior_citizen,
-                    "partner": customer.partner,
-                    "dependents": customer.dependents,
-                    "tenure": customer.tenure,
-                    "contract": customer.contract,
-                    "paperless_billing": customer.paperless_billing,
-                    "payment_method": customer.payment_method,
-                    "monthly_charges": float(customer.monthly_charges),
-                    "total_charges": float(customer.total_charges),
-                    "phone_service": customer.phone_service,
-                    "multiple_lines": customer.multiple_lines,
-                    "internet_service": customer.internet_service,
-                    "online_security": customer.online_security,
-                    "online_backup": customer.online_backup,
-                    "device_protection": customer.device_protection,
-                    "tech_support": customer.tech_support,
-                    "streaming_tv": customer.streaming_tv,
-                    "streaming_movies": customer.streaming_movies
-                }
-                
-                # Get ML prediction
-                prediction = predictor.predict(customer_data)
-                
-                # Save to database (overwrites existing)
-                repo.save_prediction(
-                    customer_id=customer.customer_id,
-                    risk_score=prediction["churn_probability"],
-                    risk_level=prediction["risk_level"]
-                )
-                
-                success_count += 1
-                    
-            except Exception as e:
-                error_count += 1
-                print(f"Error for customer {customer.customer_id}: {e}")
-        
-        # Check remaining
-        remaining = db.query(Customer).filter(
-            ~Customer.customer_id.in_(
-                db.query(PredictionRecord.customer_id).distinct()
-            )
-        ).count()
-        
-        return {
-            "message": f"Batch predictions complete",
-            "batch_size": total,
-            "success": success_count,
-            "errors": error_count,
-            "remaining": remaining,
-            "call_again": remaining > 0
-        }
-        
-    except Exception as e:
-        db.rollback()
-        return {"error": str(e), "predicted": 0}
-    finally:
-        db.close()
+@app.post("/load-csv-data", status_code=202)
+def load_csv_data():
+    """Load all 7043 customers from TrustedModel CSV (background job)"""
+    return _job_accepted(job_runner.submit("load_csv"))
 
-@app.post("/seed-database")
-async def seed_database():
-    """Manually seed the database with sample data"""
-    from sqlalchemy.orm import Session
-    from app.db.models import Customer, PredictionRecord
-    import random
-    from datetime import datetime
+@app.post("/predict-all-customers", status_code=202)
+def predict_all_customers(incremental: bool = False):
+    """
+    Run ML predictions for customers without one (background job)
     
-    db = Session(bind=engine)
-    try:
-        # Check if already seeded
-        count = db.query(Customer).count()
-        if count > 0:
-            return {"message": f"Database already has {count} customers", "seeded": False}
-        
-        # Create 50 sample customers using TrustedModel schema
-        GENDERS = ["Male", "Female"]
-        YES_NO = ["Yes", "No"]
-        CONTRACTS = ["Month-to-month", "One year", "Two year"]
-        PAYMENT_METHODS = ["Electronic check", "Mailed check", "Bank transfer (automatic)", "Credit card (automatic)"]
-        INTERNET_SERVICES = ["DSL", "Fiber optic", "No"]
-        INTERNET_OPTIONS = ["Yes", "No", "No internet service"]
-        PHONE_OPTIONS = ["Yes", "No", "No phone service"]
-        
-        for i in range(50):
-            tenure = random.randint(1, 72)
-            monthly_charges = round(random.uniform(20, 120), 2)
-            total_charges = round(monthly_charges * tenure, 2)
-            risk_score = random.uniform(0, 1)
-            
-            customer = Customer(
-                customer_id=f"C{10000 + i}",
-                gender=random.choice(GENDERS),
-                senior_citizen=random.randint(0, 1),
-                partner=random.choice(YES_NO),
-                dependents=random.choice(YES_NO),
-                tenure=tenure,
-                contract=random.choice(CONTRACTS),
-                paperless_billing=random.choice(YES_NO),
-                payment_method=random.choice(PAYMENT_METHODS),
-                monthly_charges=monthly_charges,
-                total_charges=total_charges,
-                phone_service=random.choice(YES_NO),
-                multiple_lines=random.choice(PHONE_OPTIONS),
-                internet_service=random.choice(INTERNET_SERVICES),
-                online_security=random.choice(INTERNET_OPTIONS),
-                online_backup=random.choice(INTERNET_OPTIONS),
-                device_protection=random.choice(INTERNET_OPTIONS),
-                tech_support=random.choice(INTERNET_OPTIONS),
-                streaming_tv=random.choice(INTERNET_OPTIONS),
-                streaming_movies=random.choice(INTERNET_OPTIONS),
-                churn="No"
-            )
-            db.add(customer)
-            
-            # Create prediction record
-            if risk_score >= 0.7:
-                risk_level = "high"
-            elif risk_score >= 0.4:
-                risk_level = "medium"
-            else:
-                risk_level = "low"
-                
-            pred_record = PredictionRecord(
-                customer_id=customer.customer_id,
-                churn_probability=risk_score,
-                risk_score=risk_score,
-                risk_level=risk_level,
-                predicted_churn="Yes" if risk_score >= 0.5 else "No",
-                model_name="Voting Classifier",
-                timestamp=datetime.utcnow()
-            )
-            db.add(pred_record)
-        
-        db.commit()
-        return {"message": "Database seeded with 50 customers", "seeded": True, "count": 50}
-    except Exception as e:
-        db.rollback()
-        return {"error": str(e), "seeded": False}
-    finally:
-        db.close()
+    With incremental=true, also rescore customers whose features changed
+    or whose prediction came from another model version.
+    """
+    job = job_runner.submit("score_customers", only_unscored=not incremental, incremental=incremental)
+    return _job_accepted(job)
+
+@app.post("/seed-database", status_code=202)
+def seed_database():
+    """Manually seed the database with sample data (background job)"""
+    return _job_accepted(job_runner.submit("seed_database"))
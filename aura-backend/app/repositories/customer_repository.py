@@ -1,11 +1,26 @@
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
+from contextlib import nullcontext
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import Row, func, desc, insert, select, delete, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from datetime import datetime
+import numpy as np
+import pandas as pd
 from pydantic import BaseModel
 
-from app.db.models import Customer, PredictionRecord
+from app.db.models import (
+    Customer, CustomerLatestPrediction, DirtyCustomer, PredictionRecord, RiskHistogramBin, RiskRollup
+)
 from app.core.cache import cache
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.prediction_cache import prediction_cache
+from app.core.risk import RISK_HISTOGRAM_BINS, RiskHistogram, ScoredCustomers, customer_ltv
+from app.core.targeting_snapshot import targeting_snapshot
+from app.repositories.risk_rollup import (
+    CUSTOMER_LTV, RISK_BIN, ROLLUP_CUSTOMER_COLUMNS, UNSCORED_RISK_LEVEL, rebuild_risk_rollup,
+    track_risk_rollup
+)
+from app.services.feature_encoder import FEATURE_SPECS
 
 
 class SummaryStats(BaseModel):
@@ -17,6 +32,48 @@ class SummaryStats(BaseModel):
     risk_distribution: Dict[str, int]
 
 
+class CustomerFilters(BaseModel):
+    """Customer search filters (all optional, combined with AND)"""
+    contracts: Optional[List[str]] = None
+    internet_services: Optional[List[str]] = None
+    tenure_min: Optional[int] = None
+    tenure_max: Optional[int] = None
+    risk_levels: Optional[List[str]] = None  # Low, Medium, High
+    risk_min: Optional[float] = None
+    risk_max: Optional[float] = None
+    customer_id_prefix: Optional[str] = None
+
+
+# Columns copied from the audit row into customer_latest_prediction
+LATEST_PREDICTION_COLUMNS = (
+    "churn_probability", "risk_score", "risk_level", "predicted_churn", "model_name", "timestamp"
+)
+
+
+# Columns of the customer list projections (customer + latest prediction)
+CUSTOMER_LIST_COLUMNS = (
+    Customer.customer_id,
+    Customer.internet_service,
+    Customer.monthly_charges,
+    Customer.tenure,
+    CustomerLatestPrediction.risk_score,
+    CustomerLatestPrediction.risk_level,
+)
+
+# Sort orders of customer search / cursor pagination
+CUSTOMER_SORT_COLUMNS = {
+    "customer_id": Customer.customer_id,
+    "risk": CustomerLatestPrediction.risk_score,
+    "tenure": Customer.tenure,
+    "monthly_charges": Customer.monthly_charges,
+}
+
+CUSTOMER_COUNT_CACHE_KEY = "customer_count"
+
+# Customer fields the churn model reads; changing one marks the customer dirty
+FEATURE_KEYS = frozenset(spec.key for spec in FEATURE_SPECS)
+
+
 class CustomerRepository:
     """
     Data access layer for customer information
@@ -67,8 +124,8 @@ class CustomerRepository:
         """
         Get customers with high risk scores
         
-        This queries the most recent predictions and returns customers
-        with risk_level = 'High', ordered by risk score descending.
+        This reads each customer's most recent prediction and returns
+        customers with risk_level = 'High', ordered by risk score descending.
         
         Args:
             limit: Maximum number of customers to return
@@ -76,30 +133,15 @@ class CustomerRepository:
         Returns:
             List of Customer objects with high risk
         """
-        # Subquery to get latest prediction for each customer
-        latest_predictions = (
-            self.db.query(
-                PredictionRecord.customer_id,
-                func.max(PredictionRecord.timestamp).label('max_timestamp')
-            )
-            .group_by(PredictionRecord.customer_id)
-            .subquery()
-        )
-        
-        # Join to get customers with high risk
+        # Current risk comes from the one-row-per-customer latest prediction table
         high_risk_customers = (
             self.db.query(Customer)
             .join(
-                PredictionRecord,
-                Customer.customer_id == PredictionRecord.customer_id
-            )
-            .join(
-                latest_predictions,
-                (PredictionRecord.customer_id == latest_predictions.c.customer_id) &
-                (PredictionRecord.timestamp == latest_predictions.c.max_timestamp)
+                CustomerLatestPrediction,
+                Customer.customer_id == CustomerLatestPrediction.customer_id
             )
-            .filter(PredictionRecord.risk_level == 'High')
-            .order_by(desc(PredictionRecord.risk_score))
+            .filter(CustomerLatestPrediction.risk_level == 'High')
+            .order_by(desc(CustomerLatestPrediction.risk_score))
             .limit(limit)
             .all()
         )
@@ -117,38 +159,251 @@ class CustomerRepository:
         # SQLite syntax (current database)
         return self.db.query(Customer).order_by(func.random()).first()
     
-    def get_all_customers(self, skip: int = 0, limit: int = 100) -> List[Customer]:
+    def get_all_customers(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after_customer_id: Optional[str] = None
+    ) -> List[Customer]:
         """
         Get all customers with pagination
         
+        Args:
+            skip: Number of records to skip (OFFSET; cost grows with depth)
+            limit: Maximum number of records to return
+            after_customer_id: Return customers after this ID instead of
+                               skipping (keyset; same cost for every page)
+            
+        Returns:
+            List of Customer objects ordered by customer_id
+        """
+        query = self.db.query(Customer).order_by(Customer.customer_id)
+        if after_customer_id is not None:
+            query = query.filter(Customer.customer_id > after_customer_id)
+        else:
+            query = query.offset(skip)
+        return query.limit(limit).all()
+    
+    def get_high_risk_with_predictions(self, limit: int = 10) -> List[Row]:
+        """
+        Get high-risk customers together with their latest prediction
+        
+        One query joining customers with customer_latest_prediction that
+        selects only the columns the list endpoints render.
+        
+        Args:
+            limit: Maximum number of customers to return
+            
+        Returns:
+            Rows with CUSTOMER_LIST_COLUMNS fields, highest risk first
+        """
+        return (
+            self.db.query(*CUSTOMER_LIST_COLUMNS)
+            .join(
+                CustomerLatestPrediction,
+                Customer.customer_id == CustomerLatestPrediction.customer_id
+            )
+            .filter(CustomerLatestPrediction.risk_level == 'High')
+            .order_by(desc(CustomerLatestPrediction.risk_score))
+            .limit(limit)
+            .all()
+        )
+    
+    def get_customers_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        sort: str = "customer_id"
+    ) -> Tuple[List[Row], Optional[str]]:
+        """
+        Get a page of customers with their latest prediction by cursor
+        
+        Args:
+            cursor: Continuation token from the previous page (None = first page)
+            limit: Maximum number of rows to return
+            sort: "customer_id" (ascending, all customers) or "risk"
+                  (risk_score descending, customers with a prediction)
+            
+        Returns:
+            (rows with CUSTOMER_LIST_COLUMNS fields, next cursor or None on
+            the last page)
+            
+        Raises:
+            ValueError: Unknown sort order or invalid cursor
+        """
+        if sort not in ("customer_id", "risk"):
+            raise ValueError(f"Unknown sort order: {sort}")
+        return self.search_customers(sort=sort, descending=sort == "risk", cursor=cursor, limit=limit)
+    
+    def search_customers(
+        self,
+        filters: Optional[CustomerFilters] = None,
+        sort: str = "customer_id",
+        descending: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Row], Optional[str]]:
+        """
+        Filter, sort and page customers with their latest prediction
+        
+        Filters and sorting run in SQL. Pages use keyset pagination: the
+        cursor holds the (sort value, customer_id) of the previous page's
+        last row and the next page starts right after it via an index
+        seek, so every page costs the same as the first.
+        
+        Args:
+            filters: Conditions combined with AND (None = all customers)
+            sort: Key of CUSTOMER_SORT_COLUMNS. Sorting by risk only returns
+                  customers with a prediction; sorting by tenure or
+                  monthly_charges skips customers without that value.
+            descending: Sort direction
+            cursor: Continuation token from the previous page (None = first page)
+            limit: Maximum number of rows to return
+            
+        Returns:
+            (rows with CUSTOMER_LIST_COLUMNS fields, next cursor or None on
+            the last page)
+            
+        Raises:
+            ValueError: Unknown sort order or invalid cursor
+        """
+        if sort not in CUSTOMER_SORT_COLUMNS:
+            raise ValueError(f"Unknown sort order: {sort}")
+        cursor_sort = f"{sort}:{'desc' if descending else 'asc'}"
+        key = decode_cursor(cursor, cursor_sort) if cursor else None
+        filters = filters or CustomerFilters()
+        
+        query = self._filtered_customers(select(*CUSTOMER_LIST_COLUMNS), filters, sort == "risk")
+        
+        # customer_id breaks ties so the keyset is unique
+        if sort == "customer_id":
+            sort_columns = (Customer.customer_id,)
+        elif sort == "risk":
+            # Served by ix_customer_latest_prediction_risk_score
+            sort_columns = (CustomerLatestPrediction.risk_score, CustomerLatestPrediction.customer_id)
+        else:
+            sort_columns = (CUSTOMER_SORT_COLUMNS[sort], Customer.customer_id)
+            query = query.where(CUSTOMER_SORT_COLUMNS[sort].isnot(None))
+        
+        if key is not None:
+            if len(key) != len(sort_columns):
+                raise ValueError("Invalid cursor")
+            position = sort_columns[0] if len(sort_columns) == 1 else tuple_(*sort_columns)
+            bound = key[0] if len(key) == 1 else tuple_(*key)
+            query = query.where(position < bound if descending else position > bound)
+        query = query.order_by(*[desc(column) if descending else column for column in sort_columns])
+        
+        # One extra row tells whether another page exists
+        rows = self.db.execute(query.limit(limit + 1)).all()
+        if len(rows) <= limit:
+            return rows, None
+        
+        rows = rows[:limit]
+        next_key = [getattr(rows[-1], column.key) for column in sort_columns]
+        return rows, encode_cursor(cursor_sort, next_key)
+    
+    def count_search_results(self, filters: Optional[CustomerFilters] = None) -> int:
+        """
+        Count customers matching search filters exactly
+        
+        Args:
+            filters: Conditions combined with AND (None = all customers)
+            
+        Returns:
+            Number of matching customers
+        """
+        query = self._filtered_customers(
+            select(func.count(Customer.customer_id)), filters or CustomerFilters(), False
+        )
+        return self.db.execute(query).scalar() or 0
+    
+    @staticmethod
+    def _filtered_customers(query, filters: CustomerFilters, require_prediction: bool):
+        """Join customer_latest_prediction onto a customers query and apply filters"""
+        risk_filtered = (
+            filters.risk_levels or filters.risk_min is not None or filters.risk_max is not None
+        )
+        query = query.select_from(Customer).join(
+            CustomerLatestPrediction,
+            Customer.customer_id == CustomerLatestPrediction.customer_id,
+            isouter=not (require_prediction or risk_filtered)
+        )
+        
+        if filters.contracts:
+            query = query.where(Customer.contract.in_(filters.contracts))
+        if filters.internet_services:
+            query = query.where(Customer.internet_service.in_(filters.internet_services))
+        if filters.tenure_min is not None:
+            query = query.where(Customer.tenure >= filters.tenure_min)
+        if filters.tenure_max is not None:
+            query = query.where(Customer.tenure <= filters.tenure_max)
+        if filters.risk_levels:
+            query = query.where(CustomerLatestPrediction.risk_level.in_(filters.risk_levels))
+        if filters.risk_min is not None:
+            query = query.where(CustomerLatestPrediction.risk_score >= filters.risk_min)
+        if filters.risk_max is not None:
+            query = query.where(CustomerLatestPrediction.risk_score <= filters.risk_max)
+        if filters.customer_id_prefix:
+            # The range lets the primary key index serve the search (LIKE
+            # alone cannot use it on SQLite); LIKE keeps it exact
+            prefix = filters.customer_id_prefix
+            query = query.where(
+                Customer.customer_id >= prefix,
+                Customer.customer_id < prefix[:-1] + chr(ord(prefix[-1]) + 1),
+                Customer.customer_id.startswith(prefix, autoescape=True)
+            )
+        return query
+    
+    def get_customers_with_predictions(self, skip: int = 0, limit: int = 100) -> List[Row]:
+        """
+        Get a page of customers together with their latest prediction
+        
+        Customers without a prediction are included with risk_score and
+        risk_level set to None.
+        
         Args:
             skip: Number of records to skip
             limit: Maximum number of records to return
             
         Returns:
-            List of Customer objects
+            Rows with CUSTOMER_LIST_COLUMNS fields, ordered by customer_id
         """
-        return self.db.query(Customer).offset(skip).limit(limit).all()
+        # Page over customer ids alone so skipped rows are never joined
+        page = (
+            select(Customer.customer_id)
+            .order_by(Customer.customer_id)
+            .offset(skip)
+            .limit(limit)
+            .subquery()
+        )
+        return (
+            self.db.query(*CUSTOMER_LIST_COLUMNS)
+            .join(page, Customer.customer_id == page.c.customer_id)
+            .outerjoin(
+                CustomerLatestPrediction,
+                Customer.customer_id == CustomerLatestPrediction.customer_id
+            )
+            .order_by(Customer.customer_id)
+            .all()
+        )
     
-    def get_summary_stats(self, use_cache: bool = True) -> SummaryStats:
+    def get_summary_stats(self) -> SummaryStats:
         """
         Calculate dashboard summary statistics
         
-        Args:
-            use_cache: Whether to use cache (default: True)
+        Read from the risk_rollup segments (a few dozen rows), which are
+        updated with every prediction, so the result is always current.
         
         Returns:
             SummaryStats with total customers, risk counts, and distribution
         """
-        # Check cache first
-        if use_cache:
-            cache_key = "summary_stats"
-            cached = cache.get(cache_key)
-            if cached is not None:
-                return cached
-        
-        # Total customers
-        total_customers = self.db.query(func.count(Customer.customer_id)).scalar() or 0
+        levels = {
+            risk_level: (int(count), float(score_sum))
+            for risk_level, count, score_sum in self.db.query(
+                RiskRollup.risk_level, func.sum(RiskRollup.customer_count), func.sum(RiskRollup.risk_score_sum)
+            ).group_by(RiskRollup.risk_level)
+        }
+        total_customers = sum(count for count, _ in levels.values())
         
         if total_customers == 0:
             return SummaryStats(
@@ -159,47 +414,23 @@ class CustomerRepository:
                 risk_distribution={"low": 0, "medium": 0, "high": 0}
             )
         
-        # Get latest predictions for risk statistics
-        latest_predictions_subquery = (
-            self.db.query(
-                PredictionRecord.customer_id,
-                func.max(PredictionRecord.timestamp).label('max_timestamp')
-            )
-            .group_by(PredictionRecord.customer_id)
-            .subquery()
-        )
-        
-        latest_predictions = (
-            self.db.query(PredictionRecord)
-            .join(
-                latest_predictions_subquery,
-                (PredictionRecord.customer_id == latest_predictions_subquery.c.customer_id) &
-                (PredictionRecord.timestamp == latest_predictions_subquery.c.max_timestamp)
-            )
-            .all()
-        )
+        high_risk_count = levels.get("High", (0, 0.0))[0]
+        medium_risk_count = levels.get("Medium", (0, 0.0))[0]
+        low_risk_count = levels.get("Low", (0, 0.0))[0]
+        predicted_count = total_customers - levels.get(UNSCORED_RISK_LEVEL, (0, 0.0))[0]
         
         # Calculate statistics
-        if latest_predictions:
-            high_risk_count = sum(1 for p in latest_predictions if p.risk_level == 'High')
-            medium_risk_count = sum(1 for p in latest_predictions if p.risk_level == 'Medium')
-            low_risk_count = sum(1 for p in latest_predictions if p.risk_level == 'Low')
-            
-            # Average risk score
-            total_risk = sum(float(p.risk_score) for p in latest_predictions)
-            average_risk = total_risk / len(latest_predictions)
+        if predicted_count:
+            average_risk = sum(score_sum for _, score_sum in levels.values()) / predicted_count
             
             # Monthly churn rate (estimated as percentage of high-risk customers)
             monthly_churn_rate = (high_risk_count / total_customers) * 100 * 0.3  # 30% of high-risk actually churn
         else:
             # No predictions yet - return defaults
-            high_risk_count = 0
-            medium_risk_count = 0
-            low_risk_count = 0
             average_risk = 0.0
             monthly_churn_rate = 0.0
         
-        stats = SummaryStats(
+        return SummaryStats(
             total_customers=total_customers,
             high_risk_count=high_risk_count,
             average_risk=round(average_risk, 2),
@@ -210,12 +441,100 @@ class CustomerRepository:
                 "high": high_risk_count
             }
         )
+    
+    def get_risk_segments(self) -> List[RiskRollup]:
+        """
+        Customer count and risk score sum per (risk_level, contract,
+        internet_service) segment
         
-        # Cache result (5 minutes TTL)
-        if use_cache:
-            cache.set("summary_stats", stats, ttl_seconds=300)
+        Customers without a prediction have risk_level "Unknown"; missing
+        contract / internet_service values are "".
+        """
+        return self.db.query(RiskRollup).all()
+    
+    def get_risk_histogram(self) -> RiskHistogram:
+        """
+        Scored customers and LTV sum per risk score bin
         
-        return stats
+        Read from the risk_histogram table (at most RISK_HISTOGRAM_BINS
+        rows), which is updated with every prediction.
+        """
+        counts = np.zeros(RISK_HISTOGRAM_BINS, dtype=np.int64)
+        ltv_sums = np.zeros(RISK_HISTOGRAM_BINS, dtype=np.float64)
+        rows = self.db.execute(
+            select(RiskHistogramBin.bin, RiskHistogramBin.customer_count, RiskHistogramBin.ltv_sum)
+        ).all()
+        if rows:
+            bins, bin_counts, bin_ltv_sums = zip(*rows)
+            counts[list(bins)] = bin_counts
+            ltv_sums[list(bins)] = bin_ltv_sums
+        return RiskHistogram(counts, ltv_sums)
+    
+    def get_targeting_totals(
+        self,
+        risk_threshold: float,
+        histogram: Optional[RiskHistogram] = None
+    ) -> Tuple[int, float]:
+        """
+        Exact number and LTV sum of customers with risk_score >= risk_threshold
+        
+        Bins above the threshold's bin come from the histogram; only the
+        customers of the threshold's own bin (about 1/RISK_HISTOGRAM_BINS
+        of the scored customers) are read.
+        
+        Args:
+            risk_threshold: Minimum risk score (0-1)
+            histogram: Histogram already read with get_risk_histogram()
+            
+        Returns:
+            (customer count, LTV sum)
+        """
+        if histogram is None:
+            histogram = self.get_risk_histogram()
+        boundary_bin = int(histogram.bin_index(risk_threshold))
+        count, ltv_sum = histogram.totals_from_bin(boundary_bin + 1)
+        
+        boundary_count, boundary_ltv_sum = self.db.execute(
+            select(func.count(), func.coalesce(func.sum(CUSTOMER_LTV), 0.0))
+            .select_from(CustomerLatestPrediction)
+            .join(Customer, Customer.customer_id == CustomerLatestPrediction.customer_id)
+            .where(
+                # Index range around the bin, exact bin match
+                CustomerLatestPrediction.risk_score >= risk_threshold,
+                CustomerLatestPrediction.risk_score < (boundary_bin + 2) / RISK_HISTOGRAM_BINS,
+                RISK_BIN == boundary_bin
+            )
+        ).one()
+        return int(count) + boundary_count, float(ltv_sum) + float(boundary_ltv_sum)
+    
+    def get_scored_customers(self) -> ScoredCustomers:
+        """
+        Every scored customer's ID, latest risk score and LTV
+        
+        Served from the per-process targeting snapshot (see
+        app.core.targeting_snapshot), so only the first request reads
+        the tables; later ones may be one refresh interval behind.
+        """
+        return targeting_snapshot.get(self.load_scored_customers)
+    
+    def load_scored_customers(self) -> ScoredCustomers:
+        """Read every scored customer's ID, latest risk score and LTV from the database"""
+        scored = pd.read_sql(
+            select(
+                CustomerLatestPrediction.customer_id,
+                CustomerLatestPrediction.risk_score,
+                Customer.monthly_charges,
+                Customer.tenure
+            ).join(Customer, Customer.customer_id == CustomerLatestPrediction.customer_id),
+            self.db.connection()
+        )
+        return ScoredCustomers(
+            customer_ids=scored["customer_id"].to_numpy(dtype=object),
+            risk_scores=scored["risk_score"].to_numpy(dtype=np.float64),
+            ltv=customer_ltv(
+                scored["monthly_charges"].to_numpy(dtype=np.float64), scored["tenure"].to_numpy(dtype=np.float64)
+            )
+        )
     
     def save_prediction(
         self,
@@ -223,17 +542,22 @@ class CustomerRepository:
         risk_score: float,
         risk_level: str,
         shap_values: dict = None,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        model_name: str = "Voting Classifier"
     ) -> PredictionRecord:
         """
         Store prediction in audit trail
         
+        The customer's row in customer_latest_prediction is updated in the
+        same transaction.
+        
         Args:
             customer_id: Customer ID
             risk_score: Predicted risk score (0-1)
             risk_level: Risk level classification (Low/Medium/High)
             shap_values: SHAP feature importance values as dict (optional, not stored)
             user_id: Optional user ID who made the prediction
+            model_name: Model version that produced the prediction
             
         Returns:
             Created PredictionRecord object
@@ -246,17 +570,143 @@ class CustomerRepository:
             risk_score=risk_score,  # Same as churn_probability
             risk_level=risk_level,
             predicted_churn=predicted_churn,
-            model_name="Voting Classifier",
+            model_name=model_name,
             user_id=user_id,
             timestamp=datetime.utcnow()
         )
         
         self.db.add(prediction)
+        self.db.flush()
+        self._upsert_latest_predictions([self._latest_row(prediction.id, prediction.__dict__)])
         self.db.commit()
         self.db.refresh(prediction)
         
         return prediction
     
+    def save_predictions(self, predictions: List[Dict], commit: bool = True) -> int:
+        """
+        Store many predictions in the audit trail with one statement
+        
+        Audit rows are inserted with a single executemany and the matching
+        customer_latest_prediction rows are upserted in the same transaction.
+        
+        Args:
+            predictions: Dicts with customer_id, risk_score, risk_level and
+                         optionally model_name, user_id, timestamp
+            commit: Commit the transaction (False lets the caller batch
+                    further writes into it)
+            
+        Returns:
+            Number of predictions stored
+        """
+        if not predictions:
+            return 0
+        
+        now = datetime.utcnow()
+        rows = [
+            {
+                "customer_id": p["customer_id"],
+                "churn_probability": p["risk_score"],
+                "risk_score": p["risk_score"],
+                "risk_level": p["risk_level"],
+                "predicted_churn": "Yes" if p["risk_score"] >= 0.5 else "No",
+                "model_name": p.get("model_name", "Voting Classifier"),
+                "user_id": p.get("user_id"),
+                "timestamp": p.get("timestamp") or now
+            }
+            for p in predictions
+        ]
+        
+        prediction_ids = self.db.scalars(
+            insert(PredictionRecord).returning(PredictionRecord.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        self._upsert_latest_predictions([
+            self._latest_row(prediction_id, row) for prediction_id, row in zip(prediction_ids, rows)
+        ])
+        
+        if commit:
+            self.db.commit()
+        return len(rows)
+    
+    @staticmethod
+    def _latest_row(prediction_id: int, values: Dict) -> Dict:
+        """customer_latest_prediction values for one audit row"""
+        row = {column: values[column] for column in LATEST_PREDICTION_COLUMNS}
+        row["customer_id"] = values["customer_id"]
+        row["prediction_id"] = prediction_id
+        return row
+    
+    def _upsert_latest_predictions(self, rows: List[Dict]):
+        """
+        Insert or replace latest-prediction rows
+        
+        A row only replaces an existing one if it is at least as recent,
+        so writes arriving out of order keep the newest prediction. The
+        risk rollup is updated in the same transaction.
+        """
+        with track_risk_rollup(self.db, [row["customer_id"] for row in rows]):
+            self._write_latest_predictions(rows)
+    
+    def _write_latest_predictions(self, rows: List[Dict]):
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            statement = dialect_insert(CustomerLatestPrediction)
+            statement = statement.on_conflict_do_update(
+                index_elements=[CustomerLatestPrediction.customer_id],
+                set_={
+                    column: statement.excluded[column]
+                    for column in ("prediction_id",) + LATEST_PREDICTION_COLUMNS
+                },
+                where=statement.excluded.timestamp >= CustomerLatestPrediction.timestamp
+            )
+            self.db.execute(statement, rows)
+            return
+        
+        # Other databases: read-compare-write through the session
+        for row in rows:
+            current = self.db.get(CustomerLatestPrediction, row["customer_id"])
+            if current is None:
+                self.db.add(CustomerLatestPrediction(**row))
+            elif row["timestamp"] >= current.timestamp:
+                for column, value in row.items():
+                    setattr(current, column, value)
+            self.db.flush()
+    
+    def backfill_latest_predictions(self) -> int:
+        """
+        Rebuild customer_latest_prediction (and the risk rollup) from the
+        predictions audit table
+        
+        Used after predictions were written without save_prediction(s)
+        (seed scripts, bulk loads) and to populate an empty table.
+        
+        Returns:
+            Number of customers with a latest prediction
+        """
+        ranked = select(
+            PredictionRecord.id.label("prediction_id"),
+            PredictionRecord.customer_id,
+            *[getattr(PredictionRecord, column) for column in LATEST_PREDICTION_COLUMNS],
+            func.row_number().over(
+                partition_by=PredictionRecord.customer_id,
+                order_by=(PredictionRecord.timestamp.desc(), PredictionRecord.id.desc())
+            ).label("position")
+        ).subquery()
+        columns = ["customer_id", "prediction_id", *LATEST_PREDICTION_COLUMNS]
+        
+        self.db.execute(delete(CustomerLatestPrediction))
+        self.db.execute(
+            insert(CustomerLatestPrediction).from_select(
+                columns,
+                select(*[ranked.c[column] for column in columns]).where(ranked.c.position == 1)
+            )
+        )
+        rebuild_risk_rollup(self.db)
+        self.db.commit()
+        return self.db.query(func.count(CustomerLatestPrediction.customer_id)).scalar() or 0
+    
     def get_customer_prediction_history(
         self,
         customer_id: str,
@@ -280,7 +730,7 @@ class CustomerRepository:
             .all()
         )
     
-    def get_latest_prediction(self, customer_id: str) -> Optional[PredictionRecord]:
+    def get_latest_prediction(self, customer_id: str) -> Optional[CustomerLatestPrediction]:
         """
         Get most recent prediction for a customer
         
@@ -288,14 +738,10 @@ class CustomerRepository:
             customer_id: Customer ID
             
         Returns:
-            Latest PredictionRecord or None if no predictions exist
+            CustomerLatestPrediction (same risk fields as PredictionRecord)
+            or None if no predictions exist
         """
-        return (
-            self.db.query(PredictionRecord)
-            .filter(PredictionRecord.customer_id == customer_id)
-            .order_by(desc(PredictionRecord.timestamp))
-            .first()
-        )
+        return self.db.get(CustomerLatestPrediction, customer_id)
     
     def create_customer(self, customer_data: dict) -> Customer:
         """
@@ -308,9 +754,14 @@ class CustomerRepository:
             Created Customer object
         """
         customer = Customer(**customer_data)
-        self.db.add(customer)
+        with track_risk_rollup(self.db, [customer.customer_id]):
+            self.db.add(customer)
+            self.db.flush()
+        self.mark_customers_dirty([customer.customer_id])
         self.db.commit()
         self.db.refresh(customer)
+        
+        cache.delete(CUSTOMER_COUNT_CACHE_KEY)
         return customer
     
     def update_customer(self, customer_id: str, customer_data: dict) -> Optional[Customer]:
@@ -328,16 +779,27 @@ class CustomerRepository:
         if not customer:
             return None
         
-        for key, value in customer_data.items():
-            if hasattr(customer, key):
-                setattr(customer, key, value)
-        
+        features_changed = False
+        # Only segment / bin columns can change the risk rollup
+        rollup_changed = any(
+            key in ROLLUP_CUSTOMER_COLUMNS and getattr(customer, key) != value for key, value in customer_data.items()
+        )
+        with track_risk_rollup(self.db, [customer_id]) if rollup_changed else nullcontext():
+            for key, value in customer_data.items():
+                if hasattr(customer, key):
+                    if key in FEATURE_KEYS and getattr(customer, key) != value:
+                        features_changed = True
+                    setattr(customer, key, value)
+        
+        # Incremental scoring picks the customer up again
+        if features_changed:
+            self.mark_customers_dirty([customer_id])
         self.db.commit()
         self.db.refresh(customer)
         
         # Invalidate cache for this customer
         cache.delete(f"customer:{customer_id}")
-        cache.delete("summary_stats")
+        prediction_cache.invalidate_customer(customer_id)
         
         return customer
     
@@ -355,15 +817,98 @@ class CustomerRepository:
         if not customer:
             return False
         
-        self.db.delete(customer)
+        with track_risk_rollup(self.db, [customer_id]):
+            self.db.query(CustomerLatestPrediction).filter(
+                CustomerLatestPrediction.customer_id == customer_id
+            ).delete()
+            self.db.query(DirtyCustomer).filter(DirtyCustomer.customer_id == customer_id).delete()
+            self.db.delete(customer)
         self.db.commit()
+        
+        cache.delete(CUSTOMER_COUNT_CACHE_KEY)
+        
+        prediction_cache.invalidate_customer(customer_id)
         return True
     
-    def count_customers(self) -> int:
+    def mark_customers_dirty(self, customer_ids: List[str]):
+        """
+        Add customers to the incremental scoring dirty set (not committed)
+        
+        Customers already in the set get a new marked_at, so a scoring run
+        that read them before this change keeps them in the set.
+        
+        Args:
+            customer_ids: Customers whose model features changed
+        """
+        if not customer_ids:
+            return
+        
+        now = datetime.utcnow()
+        rows = [{"customer_id": customer_id, "marked_at": now} for customer_id in customer_ids]
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            statement = dialect_insert(DirtyCustomer)
+            statement = statement.on_conflict_do_update(
+                index_elements=[DirtyCustomer.customer_id],
+                set_={"marked_at": statement.excluded.marked_at}
+            )
+            self.db.execute(statement, rows)
+            return
+        
+        for row in rows:
+            self.db.merge(DirtyCustomer(**row))
+        self.db.flush()
+    
+    def clear_dirty_customers(self, marks: List[Tuple[str, datetime]]):
+        """
+        Remove rescored customers from the dirty set (not committed)
+        
+        Args:
+            marks: (customer_id, marked_at) as read before scoring; entries
+                   marked again since then stay in the set
+        """
+        if marks:
+            self.db.execute(
+                delete(DirtyCustomer).where(tuple_(DirtyCustomer.customer_id, DirtyCustomer.marked_at).in_(marks))
+            )
+    
+    def count_customers(self, exact: bool = True) -> int:
         """
         Get total customer count
         
+        Args:
+            exact: Run COUNT(*) (a full scan). With False, return a cached
+                   estimate from database statistics instead.
+            
         Returns:
             Total number of customers
         """
-        return self.db.query(func.count(Customer.customer_id)).scalar() or 0
+        if exact:
+            return self.db.query(func.count(Customer.customer_id)).scalar() or 0
+        
+        cached = cache.get(CUSTOMER_COUNT_CACHE_KEY)
+        if cached is not None:
+            return cached
+        
+        count = self._estimate_customer_count()
+        cache.set(CUSTOMER_COUNT_CACHE_KEY, count, ttl_seconds=300)
+        return count
+    
+    def _estimate_customer_count(self) -> int:
+        """Cheap row count estimate (exact count where no estimate is available)"""
+        dialect = self.db.get_bind().dialect.name
+        estimate = None
+        if dialect == "sqlite":
+            # Rowids are assigned in insertion order: one index-free lookup,
+            # overcounts only by deleted rows
+            estimate = self.db.execute(text("SELECT max(rowid) FROM customers")).scalar()
+        elif dialect == "postgresql":
+            # Planner statistics, maintained by ANALYZE / autovacuum (-1 = never analyzed)
+            estimate = self.db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'customers'::regclass")
+            ).scalar()
+        
+        if estimate is None or estimate < 0:
+            return self.count_customers(exact=True)
+        return int(estimate)
@@ -0,0 +1,289 @@
+"""
+Risk rollup - customer counts and risk score sums per dashboard segment
+
+The risk_rollup table holds one row per (risk_level, contract,
+internet_service): how many customers are in the segment and the sum of
+their latest risk scores. Customers without a prediction are counted
+under UNSCORED_RISK_LEVEL. Dashboard statistics read these few rows
+instead of scanning customer_latest_prediction.
+
+The risk_histogram table holds the scored customers and their lifetime
+value sum per risk score bin (RISK_HISTOGRAM_BINS bins), from which ROI
+simulations count the customers above any threshold.
+
+Every write that can move a customer between segments or bins (a new
+latest prediction, a contract, internet_service, tenure or charges
+change, creating, deleting or bulk loading customers) runs inside
+track_risk_rollup(): the segments and bins of the touched customers are
+aggregated before and after the write and the difference is added to
+both tables in the same transaction. Writes that were skipped (e.g. an
+out-of-order prediction) produce no difference.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import Integer, bindparam, case, delete, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import FunctionElement
+
+from app.db.models import Customer, CustomerLatestPrediction, RiskHistogramBin, RiskRollup
+from app.core.risk import LTV_MAX_MONTHS, LTV_MIN_MONTHS, RISK_HISTOGRAM_BINS
+
+# risk_level of customers without a prediction
+UNSCORED_RISK_LEVEL = "Unknown"
+
+# Customer IDs per segment lookup (bound parameters of one IN list)
+ROLLUP_ID_BATCH = 5000
+
+# Customer columns that place a customer in a segment or risk score bin
+# (risk_level comes from the latest prediction); writes to other columns
+# need no tracking
+ROLLUP_CUSTOMER_COLUMNS = frozenset({"contract", "internet_service", "tenure", "monthly_charges"})
+
+Executor = Union[Session, Connection]
+Segment = Tuple[str, str, str]
+SegmentTotals = Dict[Segment, List[float]]
+BinTotals = Dict[int, List[float]]
+
+
+class floor_int(FunctionElement):
+    """floor() of a non-negative number as an INTEGER"""
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(floor_int)
+def _compile_floor_int(element, compiler, **kw):
+    return f"CAST(FLOOR({compiler.process(element.clauses, **kw)}) AS INTEGER)"
+
+
+@compiles(floor_int, "sqlite")
+def _compile_floor_int_sqlite(element, compiler, **kw):
+    # SQLite truncates REAL -> INTEGER casts (FLOOR needs the math extension)
+    return f"CAST({compiler.process(element.clauses, **kw)} AS INTEGER)"
+
+
+_customers = Customer.__table__
+_latest_predictions = CustomerLatestPrediction.__table__
+_risk_rollup = RiskRollup.__table__
+_risk_histogram = RiskHistogramBin.__table__
+
+# Same bins as RiskHistogram.bin_index: floor(score * bins), 1.0 in the last bin
+RISK_BIN = case(
+    (_latest_predictions.c.risk_score >= 1.0, RISK_HISTOGRAM_BINS - 1),
+    else_=floor_int(_latest_predictions.c.risk_score * RISK_HISTOGRAM_BINS)
+)
+
+# Same as app.core.risk.customer_ltv
+_tenure = func.coalesce(_customers.c.tenure, 0)
+CUSTOMER_LTV = func.coalesce(_customers.c.monthly_charges, 0.0) * case(
+    (_tenure < LTV_MIN_MONTHS, LTV_MIN_MONTHS),
+    (_tenure > LTV_MAX_MONTHS, LTV_MAX_MONTHS),
+    else_=_tenure
+)
+
+SEGMENT_COLUMNS = (
+    func.coalesce(_latest_predictions.c.risk_level, literal(UNSCORED_RISK_LEVEL)).label("risk_level"),
+    func.coalesce(_customers.c.contract, literal("")).label("contract"),
+    func.coalesce(_customers.c.internet_service, literal("")).label("internet_service"),
+)
+
+# Customers per segment with their risk score sum
+SEGMENTS_QUERY = (
+    select(
+        *SEGMENT_COLUMNS,
+        func.count().label("customer_count"),
+        func.coalesce(func.sum(_latest_predictions.c.risk_score), 0.0).label("risk_score_sum")
+    )
+    .select_from(_customers.outerjoin(
+        _latest_predictions, _latest_predictions.c.customer_id == _customers.c.customer_id
+    ))
+    .group_by(*SEGMENT_COLUMNS)
+)
+
+# Scored customers and their LTV sum per risk score bin
+HISTOGRAM_QUERY = (
+    select(RISK_BIN.label("bin"), func.count().label("customer_count"), func.sum(CUSTOMER_LTV).label("ltv_sum"))
+    .select_from(_customers.join(
+        _latest_predictions, _latest_predictions.c.customer_id == _customers.c.customer_id
+    ))
+    .group_by(RISK_BIN)
+)
+
+# Built once: statement construction costs more than running them for a few rows
+# Segment and bin totals of some customers (bin is NULL for unscored ones)
+CUSTOMER_TOTALS_QUERY = (
+    select(
+        *SEGMENT_COLUMNS,
+        RISK_BIN.label("bin"),
+        func.count().label("customer_count"),
+        func.coalesce(func.sum(_latest_predictions.c.risk_score), 0.0).label("risk_score_sum"),
+        func.sum(CUSTOMER_LTV).label("ltv_sum")
+    )
+    .select_from(_customers.outerjoin(
+        _latest_predictions, _latest_predictions.c.customer_id == _customers.c.customer_id
+    ))
+    .where(_customers.c.customer_id.in_(bindparam("customer_ids", expanding=True)))
+    .group_by(*SEGMENT_COLUMNS, RISK_BIN)
+)
+LOCK_CUSTOMERS_QUERY = (
+    select(_customers.c.customer_id)
+    .where(_customers.c.customer_id.in_(bindparam("customer_ids", expanding=True)))
+    .with_for_update()
+)
+
+
+def _connection(executor: Executor) -> Connection:
+    """The executor's connection (a Session's is bound to its transaction)"""
+    return executor.connection() if isinstance(executor, Session) else executor
+
+
+def _customer_totals(
+    connection: Connection, customer_ids: List[str], lock: bool = False
+) -> Tuple[SegmentTotals, BinTotals]:
+    """Segment and risk score bin totals of the given customers"""
+    totals: SegmentTotals = defaultdict(lambda: [0, 0.0])
+    bin_totals: BinTotals = defaultdict(lambda: [0, 0.0])
+    lock = lock and connection.dialect.name == "postgresql"
+    for start in range(0, len(customer_ids), ROLLUP_ID_BATCH):
+        parameters = {"customer_ids": customer_ids[start:start + ROLLUP_ID_BATCH]}
+        if lock:
+            # Concurrent writers to the same customers wait here, so each
+            # one sees the segments left by the previous one
+            connection.execute(LOCK_CUSTOMERS_QUERY, parameters).all()
+        for risk_level, contract, internet_service, risk_bin, count, score_sum, ltv_sum in connection.execute(
+            CUSTOMER_TOTALS_QUERY, parameters
+        ):
+            segment_total = totals[(risk_level, contract, internet_service)]
+            segment_total[0] += count
+            segment_total[1] += score_sum
+            if risk_bin is not None:
+                bin_total = bin_totals[risk_bin]
+                bin_total[0] += count
+                bin_total[1] += ltv_sum
+    return totals, bin_totals
+
+
+def _upsert_statement(dialect: str, table, sum_columns: Tuple[str, ...]):
+    """INSERT ... ON CONFLICT adding the sum columns to an existing row"""
+    dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+    statement = dialect_insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=list(table.primary_key.columns),
+        set_={column: table.c[column] + statement.excluded[column] for column in sum_columns}
+    )
+
+
+UPSERT_STATEMENTS = {
+    dialect: _upsert_statement(dialect, _risk_rollup, ("customer_count", "risk_score_sum"))
+    for dialect in ("sqlite", "postgresql")
+}
+HISTOGRAM_UPSERT_STATEMENTS = {
+    dialect: _upsert_statement(dialect, _risk_histogram, ("customer_count", "ltv_sum"))
+    for dialect in ("sqlite", "postgresql")
+}
+
+
+def _apply_deltas(connection: Connection, table, statements: Dict, rows: List[Dict]) -> int:
+    """Add count / sum differences to the rows of a rollup table, returning the number of rows"""
+    if not rows:
+        return 0
+    statement = statements.get(connection.dialect.name)
+    if statement is not None:
+        connection.execute(statement, rows)
+        return len(rows)
+
+    # Other databases: update, insert where no row was updated
+    key_columns = [column.name for column in table.primary_key.columns]
+    for row in rows:
+        updated = connection.execute(
+            table.update()
+            .where(*[table.c[column] == row[column] for column in key_columns])
+            .values({
+                column: table.c[column] + value for column, value in row.items() if column not in key_columns
+            })
+        ).rowcount
+        if not updated:
+            connection.execute(insert(table), [row])
+    return len(rows)
+
+
+def apply_rollup_deltas(executor: Executor, deltas: SegmentTotals, bin_deltas: Optional[BinTotals] = None) -> int:
+    """
+    Add per-segment count and score sum differences to risk_rollup and
+    per-bin count and LTV sum differences to risk_histogram (not committed)
+
+    Returns:
+        Number of segment and bin rows changed (zero differences are skipped)
+    """
+    connection = _connection(executor)
+    changed = _apply_deltas(connection, _risk_rollup, UPSERT_STATEMENTS, [
+        {
+            "risk_level": risk_level,
+            "contract": contract,
+            "internet_service": internet_service,
+            "customer_count": int(count),
+            "risk_score_sum": float(score_sum)
+        }
+        for (risk_level, contract, internet_service), (count, score_sum) in deltas.items()
+        if count or score_sum
+    ])
+    changed += _apply_deltas(connection, _risk_histogram, HISTOGRAM_UPSERT_STATEMENTS, [
+        {"bin": int(risk_bin), "customer_count": int(count), "ltv_sum": float(ltv_sum)}
+        for risk_bin, (count, ltv_sum) in (bin_deltas or {}).items()
+        if count or ltv_sum
+    ])
+    return changed
+
+
+@contextmanager
+def track_risk_rollup(executor: Executor, customer_ids: Iterable[str]) -> Iterator[None]:
+    """
+    Keep risk_rollup and risk_histogram in sync with writes to the given
+    customers
+
+    Usage:
+        with track_risk_rollup(db, customer_ids):
+            ... write customers / latest predictions ...
+
+    Both tables are updated in the caller's transaction (not committed).
+    Sessions are flushed before the customers are read again. A write that
+    moved nothing writes nothing.
+    """
+    customer_ids = list(dict.fromkeys(customer_ids))
+    before, bins_before = _customer_totals(_connection(executor), customer_ids, lock=True)
+    yield
+    if isinstance(executor, Session):
+        executor.flush()
+    deltas, bin_deltas = _customer_totals(_connection(executor), customer_ids)
+    for totals, previous in ((deltas, before), (bin_deltas, bins_before)):
+        for key, (count, total) in previous.items():
+            totals[key][0] -= count
+            totals[key][1] -= total
+    apply_rollup_deltas(executor, deltas, bin_deltas)
+
+
+def rebuild_risk_rollup(executor: Executor) -> int:
+    """
+    Recompute risk_rollup and risk_histogram from customers and
+    customer_latest_prediction (not committed)
+
+    Returns:
+        Number of segments
+    """
+    connection = _connection(executor)
+    connection.execute(delete(_risk_rollup))
+    connection.execute(
+        insert(_risk_rollup).from_select(
+            ["risk_level", "contract", "internet_service", "customer_count", "risk_score_sum"], SEGMENTS_QUERY
+        )
+    )
+    connection.execute(delete(_risk_histogram))
+    connection.execute(
+        insert(_risk_histogram).from_select(["bin", "customer_count", "ltv_sum"], HISTOGRAM_QUERY)
+    )
+    return connection.execute(select(func.count()).select_from(_risk_rollup)).scalar() or 0
@@ -0,0 +1,149 @@
+"""
+Admin Jobs - long-running admin tasks as background jobs
+
+Handlers for app.core.jobs: loading the Telco CSV, scoring customers and
+seeding sample data. Each one is safe to run again after an interruption:
+the CSV load upserts, scoring runs resume from their checkpoint and
+seeding only runs on an empty database.
+"""
+from typing import Dict, Optional
+from datetime import datetime
+import os
+import random
+
+from app.core.jobs import JobContext, JobRunner
+from app.db.models import Customer, PredictionRecord
+from app.repositories.customer_repository import CustomerRepository
+from app.services.bulk_loader import load_customers_csv
+from app.services.churn_predictor import get_predictor
+from app.services.scoring_job import ScoringJob
+
+# aura-backend/TrustedModel/WA_Fn-UseC_-Telco-Customer-Churn.csv
+TELCO_CSV_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "TrustedModel", "WA_Fn-UseC_-Telco-Customer-Churn.csv"
+)
+
+# The full Telco dataset has 7043 customers
+LOADED_CUSTOMER_COUNT = 7000
+
+SAMPLE_CUSTOMER_COUNT = 50
+
+
+def load_csv_job(context: JobContext, csv_path: Optional[str] = None) -> Dict:
+    """Load all customers from the TrustedModel CSV (skipped if already loaded)"""
+    with context.session_factory() as db:
+        count = db.query(Customer).count()
+        bind = db.get_bind()
+    if count >= LOADED_CUSTOMER_COUNT:
+        return {"message": f"Database already has {count} customers", "loaded": False}
+
+    # Stream the CSV into the customers table (upsert on customer_id)
+    loaded_count = load_customers_csv(
+        bind, csv_path or TELCO_CSV_PATH, on_progress=lambda loaded: context.report(loaded=loaded)
+    )
+    return {"message": f"Loaded {loaded_count} customers from CSV", "loaded": True, "count": loaded_count}
+
+
+def score_customers_job(context: JobContext, only_unscored: bool = True, incremental: bool = False) -> Dict:
+    """Score customers with the churn model (all / unscored / changed only)"""
+    job = ScoringJob(
+        get_predictor(),
+        session_factory=context.session_factory,
+        only_unscored=only_unscored,
+        incremental=incremental,
+        verbose=False,
+        on_progress=lambda progress: context.report(**progress)
+    )
+    result = job.run()
+    return {
+        "message": "Predictions complete",
+        "run_id": result["run_id"],
+        "success": result["scored"],
+        "errors": result["errors"],
+        "total": result["total"],
+        "rows_per_second": result["rows_per_second"]
+    }
+
+
+def seed_database_job(context: JobContext) -> Dict:
+    """Seed an empty database with sample customers and predictions"""
+    with context.session_factory() as db:
+        # Check if already seeded
+        count = db.query(Customer).count()
+        if count > 0:
+            return {"message": f"Database already has {count} customers", "seeded": False}
+
+        # Create sample customers using TrustedModel schema
+        GENDERS = ["Male", "Female"]
+        YES_NO = ["Yes", "No"]
+        CONTRACTS = ["Month-to-month", "One year", "Two year"]
+        PAYMENT_METHODS = ["Electronic check", "Mailed check", "Bank transfer (automatic)", "Credit card (automatic)"]
+        INTERNET_SERVICES = ["DSL", "Fiber optic", "No"]
+        INTERNET_OPTIONS = ["Yes", "No", "No internet service"]
+        PHONE_OPTIONS = ["Yes", "No", "No phone service"]
+
+        for i in range(SAMPLE_CUSTOMER_COUNT):
+            tenure = random.randint(1, 72)
+            monthly_charges = round(random.uniform(20, 120), 2)
+            total_charges = round(monthly_charges * tenure, 2)
+            risk_score = random.uniform(0, 1)
+
+            customer = Customer(
+                customer_id=f"C{10000 + i}",
+                gender=random.choice(GENDERS),
+                senior_citizen=random.randint(0, 1),
+                partner=random.choice(YES_NO),
+                dependents=random.choice(YES_NO),
+                tenure=tenure,
+                contract=random.choice(CONTRACTS),
+                paperless_billing=random.choice(YES_NO),
+                payment_method=random.choice(PAYMENT_METHODS),
+                monthly_charges=monthly_charges,
+                total_charges=total_charges,
+                phone_service=random.choice(YES_NO),
+                multiple_lines=random.choice(PHONE_OPTIONS),
+                internet_service=random.choice(INTERNET_SERVICES),
+                online_security=random.choice(INTERNET_OPTIONS),
+                online_backup=random.choice(INTERNET_OPTIONS),
+                device_protection=random.choice(INTERNET_OPTIONS),
+                tech_support=random.choice(INTERNET_OPTIONS),
+                streaming_tv=random.choice(INTERNET_OPTIONS),
+                streaming_movies=random.choice(INTERNET_OPTIONS),
+                churn="No"
+            )
+            db.add(customer)
+
+            # Create prediction record
+            if risk_score >= 0.7:
+                risk_level = "high"
+            elif risk_score >= 0.4:
+                risk_level = "medium"
+            else:
+                risk_level = "low"
+
+            pred_record = PredictionRecord(
+                customer_id=customer.customer_id,
+                churn_probability=risk_score,
+                risk_score=risk_score,
+                risk_level=risk_level,
+                predicted_churn="Yes" if risk_score >= 0.5 else "No",
+                model_name="Voting Classifier",
+                timestamp=datetime.utcnow()
+            )
+            db.add(pred_record)
+
+        db.commit()
+        CustomerRepository(db).backfill_latest_predictions()
+    return {
+        "message": f"Database seeded with {SAMPLE_CUSTOMER_COUNT} customers",
+        "seeded": True,
+        "count": SAMPLE_CUSTOMER_COUNT
+    }
+
+
+def register_admin_jobs(runner: JobRunner):
+    """Register the admin job handlers with a job runner"""
+    runner.register("load_csv", load_csv_job)
+    runner.register("score_customers", score_customers_job)
+    runner.register("seed_database", seed_database_job)
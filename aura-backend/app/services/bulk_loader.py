@@ -0,0 +1,247 @@
+"""
+Bulk Loader - streams the Telco customer CSV into the customers table
+
+The CSV is read in chunks, cleaned column-wise and written with one
+statement per chunk: a driver-level executemany INSERT ... ON CONFLICT on
+SQLite and COPY into a staging table followed by INSERT ... ON CONFLICT
+on PostgreSQL. Rows are upserted on customer_id, so loading the same file
+twice leaves the table unchanged. The dashboard risk rollup is updated
+with every chunk, or rebuilt once at the end of large loads.
+
+On SQLite, index maintenance dominates large loads. Loads into an empty
+table therefore drop the secondary indexes and rebuild them once at the
+end, and every load runs with a larger page cache.
+"""
+from typing import IO, Callable, Iterator, Optional, Union
+import csv
+import io
+
+import pandas as pd
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.cache import cache
+from app.db.models import Customer
+from app.repositories.risk_rollup import rebuild_risk_rollup, track_risk_rollup
+from app.services.feature_encoder import FEATURE_SPECS
+
+# CSV column -> customers column
+CSV_COLUMNS = {"customerID": "customer_id", **{spec.name: spec.key for spec in FEATURE_SPECS}, "Churn": "churn"}
+
+DEFAULT_CHUNK_ROWS = 50000
+
+# SQLite page cache during loads, in KiB (negative PRAGMA cache_size)
+SQLITE_LOAD_CACHE_KIB = 262144
+
+# Tracking the risk rollup costs about four times more per loaded row than
+# rebuilding it costs per customer: loads past this fraction of the
+# existing customers stop tracking and rebuild it once at the end
+ROLLUP_REBUILD_FRACTION = 0.25
+
+
+def read_customer_chunks(
+    source: Union[str, IO],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    max_rows: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Read the Telco CSV as cleaned DataFrames with customers column names
+
+    TotalCharges is blank for customers with zero tenure; those values
+    (and any other non-numeric ones) become 0.0.
+
+    Args:
+        source: CSV path or file object
+        chunk_rows: Rows per chunk
+        max_rows: Read at most this many rows (None = whole file)
+
+    Yields:
+        DataFrames with the columns of CSV_COLUMNS' values
+    """
+    dtypes = {column: str for column in CSV_COLUMNS}
+    dtypes.update({"SeniorCitizen": "int64", "tenure": "int64", "MonthlyCharges": "float64"})
+    reader = pd.read_csv(
+        source,
+        usecols=list(CSV_COLUMNS),
+        dtype=dtypes,
+        chunksize=chunk_rows,
+        nrows=max_rows,
+        keep_default_na=False
+    )
+    for chunk in reader:
+        chunk = chunk.rename(columns=CSV_COLUMNS)[list(CSV_COLUMNS.values())]
+        chunk["total_charges"] = pd.to_numeric(chunk["total_charges"], errors="coerce").fillna(0.0)
+        yield chunk
+
+
+def load_customers_csv(
+    bind: Union[Engine, Connection],
+    source: Union[str, IO],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    max_rows: Optional[int] = None,
+    verbose: bool = False,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Upsert all customers of a Telco CSV file
+
+    Each chunk is written in its own transaction when given an Engine;
+    with a Connection the caller owns the transaction.
+
+    Args:
+        bind: Engine or Connection of the target database
+        source: CSV path or file object
+        chunk_rows: Rows per chunk / write statement
+        max_rows: Load at most this many rows (None = whole file)
+        verbose: Print progress after every chunk
+        on_progress: Called with the rows written so far after every
+                     chunk; an exception it raises stops the load
+
+    Returns:
+        Number of rows written
+    """
+    if isinstance(bind, Engine):
+        with bind.connect() as connection:
+            return _load(connection, source, chunk_rows, max_rows, verbose, on_progress, commit_chunks=True)
+    return _load(bind, source, chunk_rows, max_rows, verbose, on_progress, commit_chunks=False)
+
+
+def _load(
+    connection: Connection,
+    source: Union[str, IO],
+    chunk_rows: int,
+    max_rows: Optional[int],
+    verbose: bool,
+    on_progress: Optional[Callable[[int], None]],
+    commit_chunks: bool
+) -> int:
+    sqlite_load = connection.dialect.name == "sqlite"
+    existing_rows = connection.execute(select(func.count()).select_from(Customer.__table__)).scalar()
+    initial_load = existing_rows == 0
+    dropped_indexes = []
+    if sqlite_load:
+        previous_cache_size = connection.exec_driver_sql("PRAGMA cache_size").scalar()
+        connection.exec_driver_sql(f"PRAGMA cache_size = -{SQLITE_LOAD_CACHE_KIB}")
+        if initial_load:
+            dropped_indexes = list(Customer.__table__.indexes)
+            for index in dropped_indexes:
+                index.drop(bind=connection, checkfirst=True)
+
+    loaded = 0
+    completed = False
+    rebuild_rollup = initial_load
+    try:
+        for chunk in read_customer_chunks(source, chunk_rows, max_rows):
+            if rebuild_rollup:
+                _write_chunk(connection, chunk)
+            else:
+                # Contract / internet_service changes move scored customers between rollup segments
+                with track_risk_rollup(connection, chunk["customer_id"].tolist()):
+                    _write_chunk(connection, chunk)
+            if commit_chunks:
+                connection.commit()
+            loaded += len(chunk)
+            rebuild_rollup = rebuild_rollup or loaded > existing_rows * ROLLUP_REBUILD_FRACTION
+            if verbose:
+                print(f"  ✅ Loaded {loaded} customers")
+            if on_progress is not None:
+                on_progress(loaded)
+        completed = True
+    finally:
+        if commit_chunks:
+            connection.rollback()
+        # Committed chunks stay after a failure, so their segments are counted too
+        if rebuild_rollup and (completed or commit_chunks):
+            rebuild_risk_rollup(connection)
+            if commit_chunks:
+                connection.commit()
+        if dropped_indexes:
+            if verbose:
+                print("  🔨 Rebuilding customer indexes...")
+            for index in dropped_indexes:
+                index.create(bind=connection, checkfirst=True)
+            if commit_chunks:
+                connection.commit()
+        if sqlite_load:
+            connection.exec_driver_sql(f"PRAGMA cache_size = {previous_cache_size}")
+
+    # Cached customers and counts may describe the previous rows
+    cache.invalidate_pattern("customer:")
+    cache.delete("customer_count")
+    return loaded
+
+
+def _write_chunk(connection: Connection, chunk: pd.DataFrame):
+    """Upsert one cleaned chunk with the fastest path of the connection's dialect"""
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        _copy_chunk(connection, chunk)
+    elif dialect == "sqlite":
+        _executemany_chunk(connection, chunk)
+    else:
+        # Generic path: replace existing rows, then insert the chunk
+        customer_ids = chunk["customer_id"].tolist()
+        connection.execute(Customer.__table__.delete().where(Customer.customer_id.in_(customer_ids)))
+        connection.execute(Customer.__table__.insert(), _records(chunk))
+
+
+def _records(chunk: pd.DataFrame) -> list:
+    """Chunk rows as dicts of plain Python values"""
+    return chunk.astype(object).to_dict("records")
+
+
+def _executemany_chunk(connection: Connection, chunk: pd.DataFrame):
+    """
+    SQLite: one executemany INSERT ... ON CONFLICT DO UPDATE
+
+    The statement is compiled once and run through the driver with plain
+    tuples, skipping per-row parameter processing in SQLAlchemy. Rows are
+    written in primary key order, and existing rows are only updated when
+    a value changed, so re-ingesting a file rewrites no rows or indexes.
+    """
+    table = Customer.__table__
+    updated = [column for column in chunk.columns if column != "customer_id"]
+    statement = sqlite.insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[Customer.customer_id],
+        set_={
+            **{column: statement.excluded[column] for column in updated},
+            "updated_at": func.now()
+        },
+        where=or_(*[table.c[column].is_distinct_from(statement.excluded[column]) for column in updated])
+    )
+    chunk = chunk.sort_values("customer_id")
+    compiled = statement.compile(dialect=connection.dialect, column_keys=list(chunk.columns))
+    rows = chunk[list(compiled.positiontup)].itertuples(index=False, name=None)
+    connection.exec_driver_sql(compiled.string, list(rows))
+
+
+def _copy_chunk(connection: Connection, chunk: pd.DataFrame):
+    """PostgreSQL: COPY into a staging table, then one INSERT ... ON CONFLICT"""
+    # ON CONFLICT cannot touch the same row twice in one statement
+    chunk = chunk.drop_duplicates("customer_id", keep="last")
+    columns = ", ".join(chunk.columns)
+    updated = [column for column in chunk.columns if column != "customer_id"]
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in updated)
+    changed = " OR ".join(f"customers.{column} IS DISTINCT FROM EXCLUDED.{column}" for column in updated)
+
+    connection.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS customers_staging "
+        "(LIKE customers INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+    ))
+    buffer = io.StringIO()
+    chunk.to_csv(buffer, index=False, header=False, quoting=csv.QUOTE_MINIMAL)
+    buffer.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY customers_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+    connection.execute(text(
+        f"INSERT INTO customers ({columns}) "
+        f"SELECT {columns} FROM customers_staging "
+        f"ON CONFLICT (customer_id) DO UPDATE SET {updates}, updated_at = now() WHERE {changed}"
+    ))
+    connection.execute(text("DELETE FROM customers_staging"))
@@ -2,26 +2,95 @@
 Churn Predictor Service - TrustedModel Implementation
 Uses Voting Classifier (Random Forest + Gradient Boosting + Logistic Regression)
 """
+import hashlib
 import pickle
 import numpy as np
-from typing import Dict, List
+import pandas as pd
+from typing import Any, Dict, List, Tuple, Union
 import os
+import threading
+
+from app.core import risk
+from app.core.config import settings
+from app.core.model_registry import model_registry
+from app.core.prediction_cache import prediction_cache
+from app.services.feature_encoder import FeatureEncoder
+from app.services.tree_ensemble import COMPILED_DIR, MANIFEST_FILE, CompiledVotingModel, file_sha256
+
+# Absolute path to aura-backend/models
+DEFAULT_MODEL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "models"
+)
+
+# Rows per predict_proba call in batch inference
+DEFAULT_CHUNK_SIZE = 10000
+
+# Calls with fewer rows go to the compiled evaluator, larger ones to the
+# scikit-learn model. sklearn's fixed per-call cost (~20 ms) dominates
+# small calls; its Cython tree loops win again on large chunks (about 2x
+# on 10k-row scoring chunks). With the memory-mapped export the pickle is
+# only loaded on the first large call.
+COMPILED_MAX_ROWS = 512
+
+# Reference profile used to validate a model before it starts serving
+SMOKE_TEST_CUSTOMER = {
+    "customer_id": "smoke-test",
+    "gender": "Female",
+    "senior_citizen": 0,
+    "partner": "No",
+    "dependents": "No",
+    "tenure": 3,
+    "contract": "Month-to-month",
+    "paperless_billing": "Yes",
+    "payment_method": "Electronic check",
+    "monthly_charges": 85.0,
+    "total_charges": 255.0,
+    "phone_service": "Yes",
+    "multiple_lines": "No",
+    "internet_service": "Fiber optic",
+    "online_security": "No",
+    "online_backup": "No",
+    "device_protection": "No",
+    "tech_support": "No",
+    "streaming_tv": "Yes",
+    "streaming_movies": "No"
+}
+
 
 class ChurnPredictor:
     """Churn prediction service using TrustedModel"""
     
+    # Column positions of tenure, MonthlyCharges and TotalCharges
+    NUMERIC_INDICES = [4, 17, 18]
+    # Churn probability at which a customer becomes High / Medium risk
+    HIGH_RISK_THRESHOLD = risk.HIGH_RISK_THRESHOLD
+    MEDIUM_RISK_THRESHOLD = risk.MEDIUM_RISK_THRESHOLD
+    # Customer fields echoed back in each prediction result, with their defaults
+    RESULT_FIELDS = {
+        "customer_id": "unknown",
+        "tenure": 0,
+        "monthly_charges": 0.0,
+        "contract": "Unknown",
+        "internet_service": "Unknown"
+    }
+    
     def __init__(self, model_path: str = None):
         """Initialize the predictor with trained model"""
         if model_path is None:
-            # Get absolute path to models directory
-            import os
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            model_path = os.path.join(base_dir, "models")
+            model_path = DEFAULT_MODEL_DIR
         self.model_path = model_path
         self.model = None
+        self.compiled = None
+        # best_model.pkl to unpickle on the first large call (memory-mapped export only)
+        self._lazy_model_file = None
+        self._lazy_model_lock = threading.Lock()
         self.scaler = None
+        self._scale_mean = None
+        self._scale_scale = None
         self.feature_names = None
         self.metadata = None
+        self.encoder = None
+        self.model_version = None
         self._load_model()
     
     def _load_model(self):
@@ -30,16 +99,34 @@ class ChurnPredictor:
             # Use the model_path set in __init__
             model_dir = self.model_path
             
-            # Load model
+            # Content hash identifies the model version in prediction records
             model_file = os.path.join(model_dir, "best_model.pkl")
-            print(f"Loading model from: {model_file}")
-            with open(model_file, "rb") as f:
-                self.model = pickle.load(f)
+            model_digest = file_sha256(model_file) if os.path.isfile(model_file) else None
             
-            # Load scaler
-            scaler_file = os.path.join(model_dir, "scaler.pkl")
-            with open(scaler_file, "rb") as f:
-                self.scaler = pickle.load(f)
+            # Prefer the memory-mapped export when it was built from this best_model.pkl
+            compiled = self._load_compiled(model_dir, model_digest)
+            if compiled is not None:
+                self.compiled = compiled
+                if model_digest is not None:
+                    self._lazy_model_file = model_file
+                model_digest = compiled.source_sha256
+                self._scale_mean = compiled.arrays["scaler_mean"]
+                self._scale_scale = compiled.arrays["scaler_scale"]
+            else:
+                # Load model
+                print(f"Loading model from: {model_file}")
+                with open(model_file, "rb") as f:
+                    self.model = pickle.load(f)
+                
+                # Load scaler
+                scaler_file = os.path.join(model_dir, "scaler.pkl")
+                with open(scaler_file, "rb") as f:
+                    self.scaler = pickle.load(f)
+                self._scale_mean = self.scaler.mean_
+                self._scale_scale = self.scaler.scale_
+                
+                if settings.MODEL_USE_COMPILED:
+                    self.compiled = self._compile(self.model, self.scaler, model_digest)
             
             # Load feature names
             features_file = os.path.join(model_dir, "feature_names.pkl")
@@ -52,7 +139,14 @@ class ChurnPredictor:
             with open(metadata_file, "r") as f:
                 self.metadata = json.load(f)
             
-            print(f"✅ Model loaded: {self.metadata['model_name']}")
+            # Build the feature encoder once and check it against the training vocabularies
+            self.encoder = FeatureEncoder.from_metadata(self.metadata)
+            
+            self.model_version = self.metadata.get(
+                "model_version", f"{self.metadata['model_name']}@{(model_digest or 'unknown')[:12]}"
+            )
+            
+            print(f"✅ Model loaded: {self.model_version}")
             print(f"   Accuracy: {self.metadata['accuracy']:.4f}")
             print(f"   ROC-AUC: {self.metadata['roc_auc']:.4f}")
             
@@ -60,125 +154,144 @@ class ChurnPredictor:
             print(f"❌ Error loading model: {e}")
             raise
     
-    def _prepare_features(self, customer_data: Dict) -> np.ndarray:
+    @staticmethod
+    def _load_compiled(model_dir: str, model_digest: str):
         """
-        Prepare customer features for prediction
-        
-        Expected features (19):
-        1. gender (encoded)
-        2. SeniorCitizen (0 or 1)
-        3. Partner (encoded)
-        4. Dependents (encoded)
-        5. tenure (scaled)
-        6. PhoneService (encoded)
-        7. MultipleLines (encoded)
-        8. InternetService (encoded)
-        9. OnlineSecurity (encoded)
-        10. OnlineBackup (encoded)
-        11. DeviceProtection (encoded)
-        12. TechSupport (encoded)
-        13. StreamingTV (encoded)
-        14. StreamingMovies (encoded)
-        15. Contract (encoded)
-        16. PaperlessBilling (encoded)
-        17. PaymentMethod (encoded)
-        18. MonthlyCharges (scaled)
-        19. TotalCharges (scaled)
-        """
-        
-        # Encoding mappings (same as training)
-        gender_map = {'Female': 0, 'Male': 1}
-        yes_no_map = {'No': 0, 'Yes': 1}
-        multiple_lines_map = {'No': 0, 'No phone service': 1, 'Yes': 2}
-        internet_map = {'DSL': 0, 'Fiber optic': 1, 'No': 2}
-        internet_service_map = {'No': 0, 'No internet service': 1, 'Yes': 2}
-        contract_map = {'Month-to-month': 0, 'One year': 1, 'Two year': 2}
-        payment_map = {
-            'Bank transfer (automatic)': 0,
-            'Credit card (automatic)': 1,
-            'Electronic check': 2,
-            'Mailed check': 3
-        }
-        
-        # Extract and encode features
-        features = []
-        
-        # 1. gender
-        features.append(gender_map.get(customer_data.get('gender', 'Male'), 1))
-        
-        # 2. SeniorCitizen
-        features.append(customer_data.get('senior_citizen', 0))
-        
-        # 3. Partner
-        features.append(yes_no_map.get(customer_data.get('partner', 'No'), 0))
-        
-        # 4. Dependents
-        features.append(yes_no_map.get(customer_data.get('dependents', 'No'), 0))
-        
-        # 5. tenure (will be scaled)
-        features.append(customer_data.get('tenure', 0))
-        
-        # 6. PhoneService
-        features.append(yes_no_map.get(customer_data.get('phone_service', 'No'), 0))
-        
-        # 7. MultipleLines
-        features.append(multiple_lines_map.get(customer_data.get('multiple_lines', 'No'), 0))
+        Load the memory-mapped export from model_dir/compiled if it is usable
         
-        # 8. InternetService
-        features.append(internet_map.get(customer_data.get('internet_service', 'No'), 2))
-        
-        # 9. OnlineSecurity
-        features.append(internet_service_map.get(customer_data.get('online_security', 'No'), 0))
+        Returns:
+            CompiledVotingModel, or None to fall back to the pickled model
+        """
+        compiled_dir = os.path.join(model_dir, COMPILED_DIR)
+        if not settings.MODEL_USE_COMPILED or not os.path.isfile(os.path.join(compiled_dir, MANIFEST_FILE)):
+            return None
         
-        # 10. OnlineBackup
-        features.append(internet_service_map.get(customer_data.get('online_backup', 'No'), 0))
+        compiled = CompiledVotingModel.load(compiled_dir, mmap_mode="r")
+        if model_digest is not None and compiled.source_sha256 != model_digest:
+            print(f"⚠️  {compiled_dir} was exported from a different best_model.pkl, ignoring it")
+            return None
         
-        # 11. DeviceProtection
-        features.append(internet_service_map.get(customer_data.get('device_protection', 'No'), 0))
+        print(f"Loading compiled model from: {compiled_dir} (memory-mapped)")
+        return compiled
+    
+    @staticmethod
+    def _compile(model, scaler, model_digest: str):
+        """
+        Compile the unpickled model for fast small-batch inference
         
-        # 12. TechSupport
-        features.append(internet_service_map.get(customer_data.get('tech_support', 'No'), 0))
+        Returns:
+            CompiledVotingModel, or None if the model type is not supported
+        """
+        try:
+            return CompiledVotingModel.from_voting_classifier(model, scaler, model_digest)
+        except ValueError as e:
+            print(f"⚠️  Serving with scikit-learn only: {e}")
+            return None
+    
+    def _sklearn_model(self):
+        """
+        Get the scikit-learn model, unpickling it on first use when serving the memory-mapped export
         
-        # 13. StreamingTV
-        features.append(internet_service_map.get(customer_data.get('streaming_tv', 'No'), 0))
+        Returns:
+            The fitted model, or None if only the compiled export is available
+        """
+        if self.model is not None or self._lazy_model_file is None:
+            return self.model
+        
+        with self._lazy_model_lock:
+            if self.model is None and self._lazy_model_file is not None:
+                model_file = self._lazy_model_file
+                try:
+                    with open(model_file, "rb") as f:
+                        content = f.read()
+                    # The file may have been replaced since the export was checked against it
+                    if hashlib.sha256(content).hexdigest() != self.compiled.source_sha256:
+                        raise ValueError("best_model.pkl no longer matches the compiled export")
+                    print(f"Loading model from: {model_file} (large batch scoring)")
+                    self.model = pickle.loads(content)
+                except Exception as e:
+                    print(f"⚠️  Scoring large batches with the compiled model: {e}")
+                self._lazy_model_file = None
+        return self.model
+    
+    def _predict_churn_proba(self, features_array: np.ndarray) -> np.ndarray:
+        """
+        Churn probability for each row of a scaled (n, 19) matrix
         
-        # 14. StreamingMovies
-        features.append(internet_service_map.get(customer_data.get('streaming_movies', 'No'), 0))
+        Uses the compiled evaluator for small calls and scikit-learn for
+        large chunks (or the compiled evaluator for everything, when it is
+        the only model available).
+        """
+        if self.compiled is not None and len(features_array) < COMPILED_MAX_ROWS:
+            return self.compiled.predict_churn_proba(features_array)
+        model = self._sklearn_model()
+        if model is None:
+            return self.compiled.predict_churn_proba(features_array)
+        return model.predict_proba(features_array)[:, 1]
+    
+    def _scale_numeric(self, features_array: np.ndarray) -> np.ndarray:
+        """Scale the numeric columns of an encoded (n, 19) matrix in place"""
+        # Scale only numeric features (indices 4, 17, 18 = tenure, MonthlyCharges, TotalCharges)
+        # The scaler was trained on only these 3 features; same arithmetic as StandardScaler.transform
+        numeric_features = features_array[:, self.NUMERIC_INDICES]  # Extract numeric columns
+        numeric_features -= self._scale_mean
+        numeric_features /= self._scale_scale
+        numeric_scaled = numeric_features
         
-        # 15. Contract
-        features.append(contract_map.get(customer_data.get('contract', 'Month-to-month'), 0))
+        # Replace numeric features with scaled versions
+        features_array[:, self.NUMERIC_INDICES] = numeric_scaled
         
-        # 16. PaperlessBilling
-        features.append(yes_no_map.get(customer_data.get('paperless_billing', 'No'), 0))
+        return features_array
+    
+    def _prepare_features(self, customer_data: Dict) -> np.ndarray:
+        """
+        Prepare customer features for prediction
         
-        # 17. PaymentMethod
-        features.append(payment_map.get(customer_data.get('payment_method', 'Electronic check'), 2))
+        Expected features (19), in training order - see FEATURE_SPECS:
+        gender, SeniorCitizen, Partner, Dependents, tenure (scaled),
+        PhoneService, MultipleLines, InternetService, OnlineSecurity,
+        OnlineBackup, DeviceProtection, TechSupport, StreamingTV,
+        StreamingMovies, Contract, PaperlessBilling, PaymentMethod,
+        MonthlyCharges (scaled), TotalCharges (scaled)
+        """
+        return self._scale_numeric(self.encoder.encode_one(customer_data))
+    
+    def _prepare_features_batch(self, customers_data: Any) -> Tuple[np.ndarray, List[int], Dict[int, str]]:
+        """
+        Encode many customers into one (n, 19) matrix and scale it once
         
-        # 18. MonthlyCharges (will be scaled)
-        features.append(customer_data.get('monthly_charges', 0.0))
+        Rows that cannot be encoded (e.g. non-numeric tenure) are left out of
+        the matrix and reported per input index instead of failing the batch.
         
-        # 19. TotalCharges (will be scaled)
-        features.append(customer_data.get('total_charges', 0.0))
+        Args:
+            customers_data: DataFrame, list of dicts or SQLAlchemy rows
         
-        # Convert to numpy array
-        features_array = np.array(features).reshape(1, -1)
+        Returns:
+            Tuple of (scaled feature matrix, input index of each matrix row,
+            error message per failed input index)
+        """
+        features_array, errors = self.encoder.encode(customers_data)
         
-        # Scale only numeric features (indices 4, 17, 18 = tenure, MonthlyCharges, TotalCharges)
-        # The scaler was trained on only these 3 features
-        numeric_features = features_array[:, [4, 17, 18]]  # Extract numeric columns
-        numeric_scaled = self.scaler.transform(numeric_features)
+        if errors:
+            valid = np.ones(len(features_array), dtype=bool)
+            valid[list(errors)] = False
+            row_indices = np.flatnonzero(valid).tolist()
+            features_array = features_array[valid]
+        else:
+            row_indices = list(range(len(features_array)))
         
-        # Replace numeric features with scaled versions
-        features_array[:, [4, 17, 18]] = numeric_scaled
+        if len(features_array) > 0:
+            self._scale_numeric(features_array)
         
-        return features_array
+        return features_array, row_indices, errors
     
-    def predict(self, customer_data: Dict) -> Dict:
+    def predict(self, customer_data: Dict, use_cache: bool = True) -> Dict:
         """
         Predict churn probability for a single customer
         
         Args:
             customer_data: Dictionary with customer features
+            use_cache: Whether to use the prediction cache (default: True)
         
         Returns:
             Dictionary with prediction results
@@ -186,67 +299,165 @@ class ChurnPredictor:
         # Prepare features
         features = self._prepare_features(customer_data)
         
-        # Get prediction probability
-        churn_probability = self.model.predict_proba(features)[0][1]
+        # Same encoded profile and model version -> same probability
+        cache_key = prediction_cache.make_key(features, self.model_version) if use_cache else None
+        churn_probability = prediction_cache.get(cache_key) if use_cache else None
+        
+        if churn_probability is None:
+            # Get prediction probability
+            churn_probability = float(self._predict_churn_proba(features)[0])
+            if use_cache:
+                prediction_cache.set(cache_key, churn_probability, customer_data.get("customer_id"))
         
+        return self._build_result(customer_data, churn_probability)
+    
+    @classmethod
+    def _risk_level(cls, churn_probability: float) -> str:
+        """Map a churn probability to its risk level"""
+        if churn_probability >= cls.HIGH_RISK_THRESHOLD:
+            return "High"
+        elif churn_probability >= cls.MEDIUM_RISK_THRESHOLD:
+            return "Medium"
+        return "Low"
+    
+    @classmethod
+    def risk_levels(cls, churn_probabilities: np.ndarray) -> np.ndarray:
+        """Risk level of every probability in an array (vectorized _risk_level)"""
+        return np.where(
+            churn_probabilities >= cls.HIGH_RISK_THRESHOLD, "High",
+            np.where(churn_probabilities >= cls.MEDIUM_RISK_THRESHOLD, "Medium", "Low")
+        )
+    
+    def _build_result(self, customer_data: Dict, churn_probability: float) -> Dict:
+        """Build the prediction result dictionary for one customer"""
         # Get binary prediction
         predicted_churn = "Yes" if churn_probability >= 0.5 else "No"
         
         # Determine risk level
-        if churn_probability >= 0.7:
-            risk_level = "High"
-        elif churn_probability >= 0.4:
-            risk_level = "Medium"
-        else:
-            risk_level = "Low"
+        risk_level = self._risk_level(churn_probability)
+        
+        # Echoed customer fields, with the same defaults as the batch path
+        echoed = {key: customer_data.get(key, default) for key, default in self.RESULT_FIELDS.items()}
         
         return {
-            "customer_id": customer_data.get("customer_id", "unknown"),
+            "customer_id": echoed.pop("customer_id"),
             "churn_probability": float(churn_probability),
             "predicted_churn": predicted_churn,
             "risk_level": risk_level,
             "model_name": self.metadata["model_name"],
-            "tenure": customer_data.get("tenure", 0),
-            "monthly_charges": customer_data.get("monthly_charges", 0.0),
-            "contract": customer_data.get("contract", "Unknown"),
-            "internet_service": customer_data.get("internet_service", "Unknown")
+            "model_version": self.model_version,
+            **echoed
         }
     
-    def predict_batch(self, customers_data: List[Dict]) -> List[Dict]:
+    def predict_proba_batch(self, features_array: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+        """
+        Churn probabilities for an already encoded and scaled (n, 19) matrix
+        
+        Scores one chunk of rows at a time to bound peak memory.
+        """
+        probabilities = np.empty(features_array.shape[0], dtype=np.float64)
+        for start in range(0, features_array.shape[0], chunk_size):
+            chunk = features_array[start:start + chunk_size]
+            probabilities[start:start + chunk_size] = self._predict_churn_proba(chunk)
+        return probabilities
+    
+    def score_customers(self, customers_data: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[np.ndarray, List[int], Dict[int, str]]:
+        """
+        Churn probabilities for many customers without building result dicts
+        
+        Args:
+            customers_data: DataFrame, list of dicts or SQLAlchemy rows
+            chunk_size: Maximum number of rows per predict_proba call
+        
+        Returns:
+            Tuple of (probability per scored row, input index of each scored
+            row, error message per input index that could not be encoded)
+        """
+        features_array, row_indices, errors = self._prepare_features_batch(customers_data)
+        if len(features_array) == 0:
+            return np.empty(0, dtype=np.float64), row_indices, errors
+        return self.predict_proba_batch(features_array, chunk_size), row_indices, errors
+    
+    def predict_batch(self, customers_data: Union[List[Dict], pd.DataFrame, List[Any]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict]:
         """
         Predict churn probability for multiple customers
         
+        Customers are encoded into a single matrix, the numeric columns are
+        scaled once and the model is called once per chunk. A customer that
+        fails to encode, or a chunk the model rejects, falls back to per-row
+        handling so one bad record only produces an error entry for itself.
+        
         Args:
-            customers_data: List of customer data dictionaries
+            customers_data: List of customer data dictionaries, a DataFrame
+                            with the same column names, or Customer rows
+            chunk_size: Maximum number of rows per predict_proba call
         
         Returns:
-            List of prediction results
+            List of prediction results, in input order
         """
-        predictions = []
-        for customer_data in customers_data:
+        features_array, row_indices, errors = self._prepare_features_batch(customers_data)
+        
+        probabilities = {}
+        for start in range(0, len(row_indices), chunk_size):
+            chunk_indices = row_indices[start:start + chunk_size]
             try:
-                prediction = self.predict(customer_data)
-                predictions.append(prediction)
-            except Exception as e:
-                print(f"Error predicting for customer {customer_data.get('customer_id')}: {e}")
+                chunk_probabilities = self.predict_proba_batch(features_array[start:start + chunk_size], chunk_size)
+                probabilities.update(zip(chunk_indices, chunk_probabilities))
+            except Exception:
+                # Isolate the failing row(s) by scoring this chunk one customer at a time
+                for row, i in enumerate(chunk_indices, start):
+                    try:
+                        probabilities[i] = self._predict_churn_proba(features_array[row:row + 1])[0]
+                    except Exception as e:
+                        errors[i] = str(e)
+        
+        # Read the echoed fields column-wise so DataFrames and ORM rows need no per-row dicts
+        columns = {
+            key: self.encoder.column(customers_data, key, default).tolist()
+            for key, default in self.RESULT_FIELDS.items()
+        }
+        
+        predictions = []
+        for i in range(len(customers_data)):
+            customer_data = {key: values[i] for key, values in columns.items()}
+            if i in errors:
+                print(f"Error predicting for customer {customer_data['customer_id']}: {errors[i]}")
                 predictions.append({
-                    "customer_id": customer_data.get("customer_id", "unknown"),
-                    "error": str(e)
+                    "customer_id": customer_data["customer_id"],
+                    "error": errors[i]
                 })
+            else:
+                predictions.append(self._build_result(customer_data, probabilities[i]))
         
         return predictions
     
     def get_model_info(self) -> Dict:
         """Get model metadata"""
         return self.metadata
+    
+    def smoke_test(self):
+        """
+        Run a reference prediction to validate a freshly loaded model
+        
+        Raises:
+            ValueError: If the model does not return a valid probability
+        """
+        probability = self.predict(SMOKE_TEST_CUSTOMER, use_cache=False)["churn_probability"]
+        if not 0.0 <= probability <= 1.0:
+            raise ValueError(f"Smoke prediction returned invalid probability {probability}")
+
 
+# Shared predictor, loaded once per process through the model registry
+CHURN_MODEL = "churn_predictor"
+model_registry.register(
+    CHURN_MODEL,
+    lambda model_path=None: ChurnPredictor(model_path or settings.MODEL_DIR or None),
+    validator=ChurnPredictor.smoke_test
+)
+# Cached probabilities belong to the previous model version
+model_registry.on_swap(CHURN_MODEL, lambda predictor: prediction_cache.clear())
 
-# Global predictor instance
-_predictor = None
 
 def get_predictor() -> ChurnPredictor:
-    """Get or create the global predictor instance"""
-    global _predictor
-    if _predictor is None:
-        _predictor = ChurnPredictor()
-    return _predictor
+    """Get the process-wide predictor instance (FastAPI dependency)"""
+    return model_registry.get(CHURN_MODEL)
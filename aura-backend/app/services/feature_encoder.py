@@ -0,0 +1,228 @@
+"""
+Feature Encoder - TrustedModel 19-feature layout
+
+Built once per loaded model. Categorical vocabularies are held as NumPy
+lookup tables in the same (sorted) order LabelEncoder used during training,
+so whole columns can be encoded at once from a DataFrame, a list of dicts
+or SQLAlchemy rows.
+"""
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+
+class FeatureSpec(NamedTuple):
+    """One model input column"""
+    name: str  # Column name used in training (train_trustedmodel.py)
+    key: str  # Customer field name (API / database)
+    default: Any  # Value used when the field is missing
+    vocabulary: Optional[Tuple[str, ...]] = None  # Categories for encoded columns, None for numeric
+
+
+YES_NO = ("No", "Yes")
+INTERNET_OPTIONS = ("No", "No internet service", "Yes")
+
+# Training column order. Vocabularies are sorted exactly like LabelEncoder.classes_
+FEATURE_SPECS: Tuple[FeatureSpec, ...] = (
+    FeatureSpec("gender", "gender", "Male", ("Female", "Male")),
+    FeatureSpec("SeniorCitizen", "senior_citizen", 0),
+    FeatureSpec("Partner", "partner", "No", YES_NO),
+    FeatureSpec("Dependents", "dependents", "No", YES_NO),
+    FeatureSpec("tenure", "tenure", 0),
+    FeatureSpec("PhoneService", "phone_service", "No", YES_NO),
+    FeatureSpec("MultipleLines", "multiple_lines", "No", ("No", "No phone service", "Yes")),
+    FeatureSpec("InternetService", "internet_service", "No", ("DSL", "Fiber optic", "No")),
+    FeatureSpec("OnlineSecurity", "online_security", "No", INTERNET_OPTIONS),
+    FeatureSpec("OnlineBackup", "online_backup", "No", INTERNET_OPTIONS),
+    FeatureSpec("DeviceProtection", "device_protection", "No", INTERNET_OPTIONS),
+    FeatureSpec("TechSupport", "tech_support", "No", INTERNET_OPTIONS),
+    FeatureSpec("StreamingTV", "streaming_tv", "No", INTERNET_OPTIONS),
+    FeatureSpec("StreamingMovies", "streaming_movies", "No", INTERNET_OPTIONS),
+    FeatureSpec("Contract", "contract", "Month-to-month", ("Month-to-month", "One year", "Two year")),
+    FeatureSpec("PaperlessBilling", "paperless_billing", "No", YES_NO),
+    FeatureSpec(
+        "PaymentMethod", "payment_method", "Electronic check",
+        ("Bank transfer (automatic)", "Credit card (automatic)", "Electronic check", "Mailed check")
+    ),
+    FeatureSpec("MonthlyCharges", "monthly_charges", 0.0),
+    FeatureSpec("TotalCharges", "total_charges", 0.0),
+)
+
+
+class FeatureEncoder:
+    """
+    Columnar encoder for the TrustedModel feature layout
+
+    Unknown categories encode to the code of the field's default value,
+    matching the behaviour of the original per-field dict lookups. Missing
+    or non-numeric values in numeric columns are reported as row errors.
+    """
+
+    def __init__(self, specs: Sequence[FeatureSpec] = FEATURE_SPECS):
+        """
+        Build lookup tables for the given feature layout
+
+        Args:
+            specs: Model input columns in training order
+        """
+        self.specs = tuple(specs)
+        self.feature_names = [spec.name for spec in self.specs]
+        self.n_features = len(self.specs)
+        self.numeric_indices = [i for i, spec in enumerate(self.specs) if spec.vocabulary is None]
+
+        # NumPy vocabularies for column-wise encoding, dicts for the single-row path
+        self._vocabularies = {}
+        self._default_codes = {}
+        self._code_maps = {}
+        for i, spec in enumerate(self.specs):
+            if spec.vocabulary is None:
+                continue
+            self._vocabularies[i] = np.array(spec.vocabulary, dtype=object)
+            self._default_codes[i] = spec.vocabulary.index(spec.default)
+            self._code_maps[i] = {category: code for code, category in enumerate(spec.vocabulary)}
+
+    @classmethod
+    def from_metadata(cls, metadata: Dict) -> "FeatureEncoder":
+        """
+        Build the encoder and verify it against the trained model's metadata
+
+        Args:
+            metadata: Contents of model_metadata.json
+
+        Raises:
+            ValueError: If the feature order or a categorical vocabulary
+                        differs from the one the model was trained with
+        """
+        encoder = cls()
+        encoder.validate(metadata)
+        return encoder
+
+    def validate(self, metadata: Dict):
+        """
+        Check feature order and LabelEncoder vocabularies against model metadata
+
+        Args:
+            metadata: Contents of model_metadata.json
+
+        Raises:
+            ValueError: On any mismatch
+        """
+        features = metadata.get("features")
+        if features is not None and list(features) != self.feature_names:
+            raise ValueError(
+                f"Model feature order {list(features)} does not match encoder order {self.feature_names}"
+            )
+
+        vocabularies = metadata.get("categorical_vocabularies")
+        if vocabularies is None:
+            print("⚠️  model_metadata.json has no categorical_vocabularies, skipping vocabulary check")
+            return
+
+        for spec in self.specs:
+            if spec.vocabulary is None:
+                if spec.name in vocabularies:
+                    raise ValueError(f"Feature '{spec.name}' is numeric in the encoder but categorical in the model")
+                continue
+            trained = vocabularies.get(spec.name)
+            if trained is None:
+                raise ValueError(f"Model metadata has no vocabulary for categorical feature '{spec.name}'")
+            if list(trained) != list(spec.vocabulary):
+                raise ValueError(
+                    f"Vocabulary mismatch for '{spec.name}': model was trained with {list(trained)}, "
+                    f"encoder uses {list(spec.vocabulary)}"
+                )
+
+    def encode_one(self, customer_data: Dict) -> np.ndarray:
+        """
+        Encode a single customer dictionary into a (1, n_features) matrix (unscaled)
+
+        Raises:
+            ValueError/TypeError: If a numeric field cannot be converted
+        """
+        features = np.empty((1, self.n_features), dtype=np.float64)
+        row = features[0]
+        for i, spec in enumerate(self.specs):
+            value = customer_data.get(spec.key, spec.default)
+            if spec.vocabulary is None:
+                row[i] = float(value)
+            else:
+                row[i] = self._code_maps[i].get(value, self._default_codes[i])
+        if not np.isfinite(row[self.numeric_indices]).all():
+            raise ValueError("Input contains NaN or infinity")
+        return features
+
+    def encode(
+        self,
+        data: Any,
+        out: Optional[np.ndarray] = None,
+        dtype: type = np.float64
+    ) -> Tuple[np.ndarray, Dict[int, str]]:
+        """
+        Encode many customers column by column (unscaled)
+
+        Args:
+            data: DataFrame, list of dicts, or sequence of objects exposing
+                  the fields as attributes (SQLAlchemy rows / ORM objects)
+            out: Optional preallocated (n, n_features) buffer to write into
+            dtype: Buffer dtype when `out` is not given (float32 or float64)
+
+        Returns:
+            Tuple of (feature matrix, error message per failed row index).
+            Rows listed in the error dict hold undefined values.
+        """
+        n = len(data)
+        if out is None:
+            out = np.empty((n, self.n_features), dtype=dtype)
+        elif out.shape != (n, self.n_features):
+            raise ValueError(f"Output buffer shape {out.shape} does not match ({n}, {self.n_features})")
+
+        errors = {}
+        for i, spec in enumerate(self.specs):
+            values = self.column(data, spec.key, spec.default)
+            if spec.vocabulary is None:
+                self._encode_numeric(values, out[:, i], errors)
+            else:
+                self._encode_categorical(i, values, out[:, i])
+
+        return out, errors
+
+    def column(self, data: Any, key: str, default: Any = None) -> np.ndarray:
+        """
+        Extract one field from every customer as a NumPy array
+
+        Args:
+            data: DataFrame, list of dicts, or sequence of attribute objects
+            key: Customer field name
+            default: Value used where the field is missing
+        """
+        if isinstance(data, pd.DataFrame):
+            if key in data.columns:
+                return data[key].to_numpy()
+            return np.full(len(data), default, dtype=object)
+        if len(data) > 0 and isinstance(data[0], dict):
+            return np.array([row.get(key, default) for row in data], dtype=object)
+        return np.array([getattr(row, key, default) for row in data], dtype=object)
+
+    def _encode_categorical(self, index: int, values: np.ndarray, out: np.ndarray):
+        """Write category codes for one column, unknown values get the default code"""
+        out[:] = self._default_codes[index]
+        for code, category in enumerate(self._vocabularies[index]):
+            if code != self._default_codes[index]:
+                out[values == category] = code
+
+    @staticmethod
+    def _encode_numeric(values: np.ndarray, out: np.ndarray, errors: Dict[int, str]):
+        """Write a numeric column, recording rows that cannot be converted"""
+        try:
+            out[:] = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            # Slow path: find the offending rows one by one
+            for row, value in enumerate(values):
+                try:
+                    out[row] = float(value)
+                except (TypeError, ValueError) as e:
+                    out[row] = 0.0
+                    errors.setdefault(row, str(e))
+
+        for row in np.flatnonzero(~np.isfinite(out)):
+            errors.setdefault(int(row), "Input contains NaN or infinity")
@@ -1,6 +1,9 @@
-from typing import Dict
+from typing import Dict, NamedTuple, Optional
+import numpy as np
 from pydantic import BaseModel
 
+from app.core.risk import HIGH_RISK_THRESHOLD, MEDIUM_RISK_THRESHOLD, RiskHistogram, ScoredCustomers
+
 
 class SimulationResult(BaseModel):
     """ROI simulation result model"""
@@ -14,6 +17,23 @@ class SimulationResult(BaseModel):
     coverage_percentage: float
 
 
+class TargetList(NamedTuple):
+    """Customers selected for a campaign, highest expected value first"""
+    customer_ids: np.ndarray
+    risk_scores: np.ndarray
+    ltv: np.ndarray
+    expected_values: np.ndarray  # risk score * LTV * uplift
+    cost_per_customer: float
+    
+    @property
+    def total_cost(self) -> float:
+        return len(self.customer_ids) * self.cost_per_customer
+    
+    @property
+    def expected_revenue(self) -> float:
+        return float(self.expected_values.sum())
+
+
 class ROISimulator:
     """
     ROI simulation service for retention campaigns
@@ -45,7 +65,9 @@ class ROISimulator:
         risk_threshold: float,
         campaign_budget: float,
         total_customers: int,
-        risk_distribution: Dict[str, int]
+        risk_distribution: Dict[str, int],
+        targeted_customers: Optional[int] = None,
+        targeted_ltv: Optional[float] = None
     ) -> SimulationResult:
         """
         Simulate campaign ROI for given parameters
@@ -56,14 +78,19 @@ class ROISimulator:
             total_customers: Total customer base size
             risk_distribution: Count of customers by risk level
                               {"low": count, "medium": count, "high": count}
+            targeted_customers: Exact number of customers at or above the
+                                threshold (default: estimated from risk_distribution)
+            targeted_ltv: LTV sum of the targeted customers
+                          (default: targeted_customers * avg_customer_ltv)
             
         Returns:
             SimulationResult with ROI metrics
         """
         # Calculate targeted customers based on risk threshold
-        targeted_customers = self._calculate_targeted_customers(
-            risk_threshold, risk_distribution
-        )
+        if targeted_customers is None:
+            targeted_customers = self._calculate_targeted_customers(
+                risk_threshold, risk_distribution
+            )
         
         if targeted_customers == 0:
             # No customers to target
@@ -91,7 +118,10 @@ class ROISimulator:
         retained_customers = int(targeted_customers * expected_retention_rate)
         
         # Projected revenue (retained customers * LTV)
-        projected_revenue = retained_customers * self.avg_customer_ltv
+        if targeted_ltv is None:
+            projected_revenue = retained_customers * self.avg_customer_ltv
+        else:
+            projected_revenue = targeted_ltv * expected_retention_rate
         
         # ROI calculation: ((Revenue - Cost) / Cost) * 100
         if total_cost > 0:
@@ -116,6 +146,107 @@ class ROISimulator:
             coverage_percentage=coverage_percentage
         )
     
+    def simulate_grid(
+        self,
+        risk_bins: np.ndarray,
+        campaign_budgets: np.ndarray,
+        total_customers: int,
+        histogram: RiskHistogram
+    ) -> Dict[str, np.ndarray]:
+        """
+        Simulate campaign ROI for every (threshold, budget) combination
+        
+        Vectorized simulate() with the targeted customers and their LTV
+        from the histogram: each threshold is a bin edge and targets the
+        customers in that bin and above.
+        
+        Args:
+            risk_bins: Risk thresholds as histogram bins (threshold =
+                       bin / histogram.bins, see RiskHistogram.edge_bins), shape (T,)
+            campaign_budgets: Total budgets in Turkish Lira, shape (B,)
+            total_customers: Total customer base size
+            histogram: Risk score histogram of the scored customers
+            
+        Returns:
+            targeted_customers, projected_revenue, coverage_percentage of
+            shape (T,) and cost_per_customer, total_cost, roi, net_gain of
+            shape (T, B)
+        """
+        campaign_budgets = np.asarray(campaign_budgets, dtype=np.float64)
+        targeted_customers, targeted_ltv = histogram.totals_from_bin(risk_bins)
+        
+        # Thresholds without customers get zeros, like simulate()
+        targeting = targeted_customers > 0
+        targeted = np.where(targeting, targeted_customers, 1)[:, None]
+        budgets = np.where(targeting[:, None], campaign_budgets[None, :], 0.0)
+        
+        cost_per_customer = budgets / targeted
+        total_cost = np.minimum(budgets, cost_per_customer * targeted)
+        projected_revenue = np.where(targeting, targeted_ltv * self.campaign_effectiveness, 0.0)
+        net_gain = projected_revenue[:, None] - total_cost
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roi = np.where(total_cost > 0, net_gain / total_cost * 100, 0.0)
+        coverage_percentage = targeted_customers / total_customers * 100 if total_customers else targeted_customers * 0.0
+        
+        return {
+            "targeted_customers": targeted_customers,
+            "projected_revenue": projected_revenue,
+            "coverage_percentage": coverage_percentage,
+            "cost_per_customer": cost_per_customer,
+            "total_cost": total_cost,
+            "roi": roi,
+            "net_gain": net_gain
+        }
+    
+    def select_targets(
+        self,
+        customers: ScoredCustomers,
+        campaign_budget: float,
+        cost_per_customer: float,
+        uplift: Optional[float] = None
+    ) -> TargetList:
+        """
+        Pick the customers to contact for the highest expected net gain
+        
+        A customer's expected saved revenue is risk score * LTV * uplift.
+        With the same cost for every contact, the optimal set within the
+        budget is the top floor(budget / cost) customers by expected value,
+        leaving out those whose expected value does not cover the cost.
+        The top-k is found with a partial partition (O(n)), and only the
+        selected customers are sorted.
+        
+        Args:
+            customers: Scored customers
+            campaign_budget: Total budget in Turkish Lira
+            cost_per_customer: Cost of one contact in Turkish Lira
+            uplift: Probability that a contacted churner is retained
+                    (default: campaign_effectiveness)
+            
+        Returns:
+            TargetList ranked by expected value
+        """
+        if uplift is None:
+            uplift = self.campaign_effectiveness
+        expected_values = customers.risk_scores * customers.ltv * uplift
+        
+        profitable = np.flatnonzero(expected_values > cost_per_customer)
+        k = min(int(campaign_budget // cost_per_customer), len(profitable))
+        if k == 0:
+            selected = profitable[:0]
+        elif k < len(profitable):
+            selected = profitable[np.argpartition(-expected_values[profitable], k - 1)[:k]]
+        else:
+            selected = profitable
+        ranked = selected[np.argsort(-expected_values[selected], kind="stable")]
+        
+        return TargetList(
+            customer_ids=customers.customer_ids[ranked],
+            risk_scores=customers.risk_scores[ranked],
+            ltv=customers.ltv[ranked],
+            expected_values=expected_values[ranked],
+            cost_per_customer=cost_per_customer
+        )
+    
     def _calculate_targeted_customers(
         self,
         risk_threshold: float,
@@ -131,37 +262,22 @@ class ROISimulator:
         Returns:
             Number of customers with risk >= threshold
         """
-        targeted = 0
+        # Risk level bands; customers are assumed to be spread
+        # uniformly within a band
+        bands = (
+            ("low", 0.0, MEDIUM_RISK_THRESHOLD),
+            ("medium", MEDIUM_RISK_THRESHOLD, HIGH_RISK_THRESHOLD),
+            ("high", HIGH_RISK_THRESHOLD, 1.0),
+        )
         
-        # High risk: 0.7-1.0
-        if risk_threshold <= 0.7:
-            targeted += risk_distribution.get("high", 0)
-        
-        # Medium risk: 0.3-0.7
-        if risk_threshold <= 0.3:
-            targeted += risk_distribution.get("medium", 0)
-        
-        # Low risk: 0-0.3
-        if risk_threshold <= 0.0:
-            targeted += risk_distribution.get("low", 0)
-        
-        # If threshold is between ranges, estimate proportionally
-        if 0.3 < risk_threshold < 0.7:
-            # Partial medium risk customers
-            medium_count = risk_distribution.get("medium", 0)
-            # Estimate: assume uniform distribution within medium range
-            proportion = (0.7 - risk_threshold) / 0.4
-            targeted += int(medium_count * proportion)
-            # All high risk
-            targeted += risk_distribution.get("high", 0)
-        elif 0.0 < risk_threshold < 0.3:
-            # Partial low risk customers
-            low_count = risk_distribution.get("low", 0)
-            proportion = (0.3 - risk_threshold) / 0.3
-            targeted += int(low_count * proportion)
-            # All medium and high
-            targeted += risk_distribution.get("medium", 0)
-            targeted += risk_distribution.get("high", 0)
+        targeted = 0
+        for level, lower, upper in bands:
+            count = risk_distribution.get(level, 0)
+            if risk_threshold <= lower:
+                targeted += count
+            elif risk_threshold < upper:
+                # Partial band
+                targeted += round(count * (upper - risk_threshold) / (upper - lower))
         
         return targeted
     
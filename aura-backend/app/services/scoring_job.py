@@ -0,0 +1,402 @@
+"""
+Scoring Job - rescores the customer base in resumable chunks
+
+Customers are read in customer_id order one chunk at a time, scored with
+one batched model call per chunk and written with one bulk insert. Each
+chunk's predictions and the run's checkpoint (last scored customer_id)
+are committed in the same transaction, so a killed run resumes right
+after the last committed chunk without scoring anyone twice.
+
+With workers > 1, chunks are scored in a process pool while this process
+stays the only writer: it reads ahead, keeps up to two chunks per worker
+in flight and writes the results back in customer_id order, so the
+checkpoint semantics do not change.
+
+Incremental runs only score customers that need it: no prediction yet,
+a prediction from another model version, features changed since the
+prediction (customers.updated_at), or an entry in the dirty set kept by
+CustomerRepository.create_customer / update_customer. Every run removes
+the customers it scored from the dirty set.
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import multiprocessing
+import threading
+import time
+
+import pandas as pd
+from sqlalchemy import exists, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.db.models import Customer, CustomerLatestPrediction, DirtyCustomer, ScoringRun
+from app.repositories.customer_repository import CustomerRepository
+from app.services.churn_predictor import ChurnPredictor
+from app.services.feature_encoder import FEATURE_SPECS
+
+# Customers read, scored and committed together
+DEFAULT_SCORING_CHUNK = 5000
+
+# customer_id plus the model input fields
+SCORING_COLUMNS = [Customer.customer_id] + [getattr(Customer, spec.key) for spec in FEATURE_SPECS]
+
+# Runs in these states are picked up again by resume
+RESUMABLE_STATUSES = ("running", "failed")
+
+# Chunks in flight per worker process (scoring ahead of the writer)
+CHUNKS_PER_WORKER = 2
+
+# Model of a pool worker process, set once by _init_worker
+_worker_predictor: Optional[ChurnPredictor] = None
+
+# (probability per scored row, input index of each scored row, errors per input index)
+ChunkScores = Tuple[Any, List[int], Dict[int, str]]
+
+# (customer_id, marked_at) of the chunk's customers in the dirty set, as read
+DirtyMarks = List[Tuple[str, datetime]]
+
+
+def _init_worker(predictor: Union[ChurnPredictor, str]):
+    """
+    Pool initializer: keep the worker's model in a module global
+
+    Forked workers receive the parent's predictor itself and share its
+    arrays copy-on-write. Spawned workers receive the model directory and
+    load it once; the compiled export is memory-mapped, so they share its
+    pages through the OS page cache.
+    """
+    global _worker_predictor
+    _worker_predictor = ChurnPredictor(predictor) if isinstance(predictor, str) else predictor
+
+
+def _score_in_worker(frame: pd.DataFrame) -> ChunkScores:
+    """Pool task: score one chunk with the worker's model"""
+    return _worker_predictor.score_customers(frame)
+
+
+class ScoringJob:
+    """
+    Full-base (or unscored-only / incremental) scoring run with checkpointing
+
+    Only one run per model version and mode should be active at a time:
+    resuming picks up the newest unfinished run, including one whose
+    process was killed while its status was still "running".
+    """
+
+    def __init__(
+        self,
+        predictor: ChurnPredictor,
+        session_factory: Callable[[], Session] = SessionLocal,
+        chunk_size: int = DEFAULT_SCORING_CHUNK,
+        only_unscored: bool = False,
+        verbose: bool = True,
+        workers: Optional[int] = None,
+        incremental: bool = False,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        """
+        Args:
+            predictor: Loaded churn predictor
+            session_factory: Creates database sessions
+            chunk_size: Customers per read / model call / commit
+            only_unscored: Score only customers without any prediction
+            verbose: Print progress after every chunk
+            workers: Scoring processes (None = settings.SCORING_WORKERS,
+                     1 = score in this process)
+            incremental: Score only new, changed or dirty customers and
+                         customers scored by another model version
+            on_progress: Called with progress() after every chunk; an
+                         exception it raises stops the run (resumable)
+        """
+        self.predictor = predictor
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.only_unscored = only_unscored
+        self.verbose = verbose
+        self.workers = max(1, workers if workers is not None else settings.SCORING_WORKERS)
+        self.incremental = incremental
+        self.on_progress = on_progress
+
+    def run(self, resume: bool = True, max_customers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Score customers until all are done (or max_customers were scored)
+
+        Args:
+            resume: Continue the newest unfinished run for this model
+                    version instead of starting over
+            max_customers: Stop after about this many customers (rounded up
+                           to whole chunks); the run stays resumable
+
+        Returns:
+            Progress of the run (see progress()) plus the customers
+            processed / failed by this call
+        """
+        with self.session_factory() as db:
+            run = self._resumable_run(db) if resume else None
+            if run is None:
+                run = ScoringRun(
+                    status="running",
+                    model_version=self.predictor.model_version,
+                    only_unscored=self.only_unscored,
+                    incremental=self.incremental,
+                    scored_count=0,
+                    error_count=0
+                )
+                db.add(run)
+            else:
+                run.status = "running"
+                run.error = None
+            remaining = db.execute(
+                self._customers_query(run.last_customer_id, func.count(Customer.customer_id))
+            ).scalar() or 0
+            if run.total_customers is None:
+                run.total_customers = remaining
+            db.commit()
+            run_id = run.id
+            checkpoint = run.last_customer_id
+
+        if self.verbose:
+            action = "Resuming" if remaining != run.total_customers else "Starting"
+            print(f"🔄 {action} scoring run {run_id}: {remaining} customers to score")
+
+        started = time.perf_counter()
+        processed_now = failed_now = 0
+        try:
+            for frame, marks, scores in self._scored_chunks(checkpoint, max_customers):
+                failed_now += self._write_chunk(run_id, frame, marks, scores)
+                processed_now += len(frame)
+                if self.verbose or self.on_progress is not None:
+                    progress = self.progress(run_id, started, processed_now, remaining)
+                    if self.verbose:
+                        self._print_progress(progress)
+                    if self.on_progress is not None:
+                        self.on_progress(progress)
+        except Exception as e:
+            with self.session_factory() as db:
+                run = db.get(ScoringRun, run_id)
+                run.status = "failed"
+                run.error = str(e)[:500]
+                db.commit()
+            print(f"❌ Scoring run {run_id} failed: {e}")
+            raise
+
+        with self.session_factory() as db:
+            run = db.get(ScoringRun, run_id)
+            if max_customers is None or processed_now < max_customers:
+                run.status = "completed"
+                run.finished_at = datetime.utcnow()
+            db.commit()
+
+        result = self.progress(run_id, started, processed_now, remaining)
+        result["processed"] = processed_now
+        result["failed"] = failed_now
+        if self.verbose and result["status"] == "completed":
+            print(f"✅ Scoring run {run_id} complete: {result['scored']} scored, {result['errors']} errors")
+        return result
+
+    def _resumable_run(self, db: Session) -> Optional[ScoringRun]:
+        """Newest unfinished run of the same model version and mode"""
+        return (
+            db.query(ScoringRun)
+            .filter(
+                ScoringRun.status.in_(RESUMABLE_STATUSES),
+                ScoringRun.model_version == self.predictor.model_version,
+                ScoringRun.only_unscored == self.only_unscored,
+                ScoringRun.incremental == self.incremental
+            )
+            .order_by(ScoringRun.id.desc())
+            .first()
+        )
+
+    def _customers_query(self, after_customer_id: Optional[str], *columns):
+        """Customers still to score after the checkpoint, in customer_id order"""
+        query = (
+            select(*(columns or SCORING_COLUMNS + [DirtyCustomer.marked_at]))
+            .select_from(Customer)
+            .outerjoin(DirtyCustomer, DirtyCustomer.customer_id == Customer.customer_id)
+        )
+        if after_customer_id is not None:
+            query = query.where(Customer.customer_id > after_customer_id)
+        if self.only_unscored:
+            query = query.where(
+                ~exists().where(CustomerLatestPrediction.customer_id == Customer.customer_id)
+            )
+        if self.incremental:
+            latest = CustomerLatestPrediction
+            query = query.outerjoin(latest, latest.customer_id == Customer.customer_id).where(
+                or_(
+                    latest.customer_id.is_(None),
+                    latest.model_name.is_distinct_from(self.predictor.model_version),
+                    Customer.updated_at > latest.timestamp,
+                    DirtyCustomer.customer_id.is_not(None)
+                )
+            )
+        return query
+
+    def _read_chunks(
+        self,
+        after_customer_id: Optional[str],
+        max_customers: Optional[int]
+    ) -> Iterator[Tuple[pd.DataFrame, DirtyMarks]]:
+        """
+        Customers after the checkpoint as DataFrames of chunk_size rows,
+        with their dirty-set marks
+
+        Keyset reads: each chunk is one short query in its own session, so
+        no cursor stays open across the writer's commits.
+        """
+        read = 0
+        while max_customers is None or read < max_customers:
+            with self.session_factory() as db:
+                rows = db.execute(
+                    self._customers_query(after_customer_id)
+                    .order_by(Customer.customer_id)
+                    .limit(self.chunk_size)
+                ).all()
+            if not rows:
+                return
+            after_customer_id = rows[-1].customer_id
+            read += len(rows)
+            frame = pd.DataFrame(
+                [row[:len(SCORING_COLUMNS)] for row in rows], columns=[column.key for column in SCORING_COLUMNS]
+            )
+            yield frame, [(row.customer_id, row.marked_at) for row in rows if row.marked_at is not None]
+
+    def _scored_chunks(
+        self,
+        after_customer_id: Optional[str],
+        max_customers: Optional[int]
+    ) -> Iterator[Tuple[pd.DataFrame, DirtyMarks, ChunkScores]]:
+        """Chunks with their dirty-set marks and scores, in customer_id order"""
+        chunks = self._read_chunks(after_customer_id, max_customers)
+        single_chunk = max_customers is not None and max_customers <= self.chunk_size
+        if self.workers == 1 or single_chunk:
+            for frame, marks in chunks:
+                yield frame, marks, self.predictor.score_customers(frame)
+            return
+
+        pool = self._pool()
+        try:
+            pending = deque()
+            for frame, marks in chunks:
+                pending.append((frame, marks, pool.submit(_score_in_worker, frame)))
+                if len(pending) >= self.workers * CHUNKS_PER_WORKER:
+                    frame, marks, future = pending.popleft()
+                    yield frame, marks, future.result()
+            while pending:
+                frame, marks, future = pending.popleft()
+                yield frame, marks, future.result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """
+        Worker pool sharing this job's model
+
+        Forks when that is safe (a single-threaded process on a platform
+        with fork), so workers inherit the loaded model; otherwise spawns
+        workers that load it from the model directory.
+        """
+        if "fork" in multiprocessing.get_all_start_methods() and threading.active_count() == 1:
+            context, model = multiprocessing.get_context("fork"), self.predictor
+        else:
+            context, model = multiprocessing.get_context("spawn"), self.predictor.model_path
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=context, initializer=_init_worker, initargs=(model,)
+        )
+
+    def _write_chunk(self, run_id: int, frame: pd.DataFrame, marks: DirtyMarks, scores: ChunkScores) -> int:
+        """
+        Store a scored chunk, clear its dirty marks and move the run's
+        checkpoint past it
+
+        Returns:
+            Number of customers in the chunk that failed to encode
+        """
+        probabilities, row_indices, errors = scores
+        customer_ids = frame["customer_id"].to_numpy()[row_indices]
+        risk_levels = ChurnPredictor.risk_levels(probabilities)
+
+        now = datetime.utcnow()
+        model_version = self.predictor.model_version
+        with self.session_factory() as db:
+            repo = CustomerRepository(db)
+            repo.save_predictions(
+                [
+                    {
+                        "customer_id": customer_id,
+                        "risk_score": probability,
+                        "risk_level": risk_level,
+                        "model_name": model_version,
+                        "timestamp": now
+                    }
+                    for customer_id, probability, risk_level
+                    in zip(customer_ids.tolist(), probabilities.tolist(), risk_levels.tolist())
+                ],
+                commit=False
+            )
+            for i in errors:
+                print(f"   ❌ Error for customer {frame['customer_id'].iat[i]}: {errors[i]}")
+            # Customers that failed to encode stay dirty
+            failed = {frame["customer_id"].iat[i] for i in errors}
+            repo.clear_dirty_customers([mark for mark in marks if mark[0] not in failed])
+
+            # Checkpoint in the same transaction as the predictions
+            run = db.get(ScoringRun, run_id)
+            run.last_customer_id = frame["customer_id"].iat[-1]
+            run.scored_count += len(row_indices)
+            run.error_count += len(errors)
+            db.commit()
+        return len(errors)
+
+    def progress(
+        self,
+        run_id: int,
+        started: Optional[float] = None,
+        processed_now: int = 0,
+        remaining_at_start: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Progress, throughput and ETA of a run
+
+        Args:
+            run_id: ScoringRun ID
+            started: perf_counter() value when this process started working on the run
+            processed_now: Customers processed since then
+            remaining_at_start: Customers that were left when this process started
+
+        Returns:
+            Dictionary with run_id, status, scored, errors, total,
+            rows_per_second and eta_seconds (None when unknown)
+        """
+        with self.session_factory() as db:
+            run = db.get(ScoringRun, run_id)
+            elapsed = time.perf_counter() - started if started is not None else 0.0
+            rate = processed_now / elapsed if elapsed > 0 else 0.0
+            left = max(remaining_at_start - processed_now, 0)
+            return {
+                "run_id": run.id,
+                "status": run.status,
+                "model_version": run.model_version,
+                "scored": run.scored_count,
+                "errors": run.error_count,
+                "total": run.total_customers,
+                "last_customer_id": run.last_customer_id,
+                "elapsed_seconds": round(elapsed, 1),
+                "rows_per_second": round(rate, 1),
+                "eta_seconds": round(left / rate, 1) if rate > 0 else None
+            }
+
+    @staticmethod
+    def _print_progress(progress: Dict[str, Any]):
+        done = progress["scored"] + progress["errors"]
+        total = progress["total"] or 0
+        percent = done / total * 100 if total else 100.0
+        eta = f"{progress['eta_seconds']:.0f}s" if progress["eta_seconds"] is not None else "?"
+        print(
+            f"   Progress: {done}/{total} ({percent:.1f}%) - "
+            f"{progress['rows_per_second']:,.0f} customers/s, ETA {eta}"
+        )
@@ -0,0 +1,372 @@
+"""
+Compiled Voting Classifier - memory-mappable model artifact
+
+The trained VotingClassifier (Random Forest + Gradient Boosting + Logistic
+Regression, soft voting) is exported as flat NumPy arrays: every tree's
+nodes are concatenated into shared feature/threshold/next/value arrays,
+next to the LR coefficients and the scaler parameters. Loading with
+mmap_mode='r' lets all uvicorn workers share the same page-cache pages
+instead of each unpickling its own copy, and serving does not need
+scikit-learn at all. The same arrays can also be built in memory from an
+unpickled model (CompiledVotingModel.from_voting_classifier).
+"""
+from typing import Dict, Optional, Tuple
+import hashlib
+import json
+import os
+import numpy as np
+
+COMPILED_DIR = "compiled"
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 2
+
+# Array files making up a compiled model
+ARRAY_NAMES = (
+    "rf_feature", "rf_threshold", "rf_next", "rf_value", "rf_roots",
+    "gb_feature", "gb_threshold", "gb_next", "gb_value", "gb_roots",
+    "lr_coef", "scaler_mean", "scaler_scale",
+)
+
+# Rows traversed together; keeps the (rows x trees) working set cache-sized
+BLOCK_ROWS = 64
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _round_down_float32(threshold: np.ndarray) -> np.ndarray:
+    """
+    Largest float32 not above each float64 threshold
+
+    For any float32 x, x > t holds exactly when x > t rounded down to
+    float32, so splits can be decided in float32 without changing a single
+    scikit-learn decision.
+    """
+    rounded = threshold.astype(np.float32)
+    too_high = rounded.astype(np.float64) > threshold
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
+
+
+def _flatten_trees(trees, leaf_value) -> Dict[str, np.ndarray]:
+    """
+    Concatenate sklearn trees into flat slot arrays with global ids
+
+    Every node owns two consecutive slots, 2 * node (go left) and
+    2 * node + 1 (go right). Both slots hold the node's split feature and
+    threshold, and each slot's "next" entry is the first slot of the child
+    taken in that direction, so one traversal step is
+
+        slot = next[slot + (x[feature[slot]] > threshold[slot])]
+
+    Leaves point back to themselves (with an infinite threshold), so a
+    fixed number of steps always ends on the right leaf.
+
+    Args:
+        trees: Fitted sklearn Tree objects (estimator.tree_)
+        leaf_value: Callable mapping a Tree to its per-node output values
+    """
+    features, thresholds, nexts, values, roots = [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for tree in trees:
+        n_nodes = tree.node_count
+        node_ids = np.arange(n_nodes) + offset
+        is_leaf = tree.children_left == -1
+
+        feature = np.where(is_leaf, 0, tree.feature)
+        threshold = _round_down_float32(np.where(is_leaf, np.inf, tree.threshold))
+        left = np.where(is_leaf, node_ids, tree.children_left + offset)
+        right = np.where(is_leaf, node_ids, tree.children_right + offset)
+
+        features.append(np.repeat(feature, 2).astype(np.int32))
+        thresholds.append(np.repeat(threshold, 2))
+        nexts.append((2 * np.column_stack([left, right])).ravel().astype(np.int32))
+        values.append(np.asarray(leaf_value(tree), dtype=np.float64))
+        roots.append(2 * offset)
+
+        offset += n_nodes
+        max_depth = max(max_depth, int(tree.max_depth))
+
+    return {
+        "feature": np.concatenate(features),
+        "threshold": np.concatenate(thresholds),
+        "next": np.concatenate(nexts),
+        "value": np.concatenate(values),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "max_depth": max_depth,
+    }
+
+
+def _classifier_leaf_probability(tree) -> np.ndarray:
+    """Positive-class probability at each node, normalised like DecisionTreeClassifier.predict_proba"""
+    value = tree.value[:, 0, :]
+    normalizer = value.sum(axis=1)
+    normalizer[normalizer == 0.0] = 1.0
+    return value[:, 1] / normalizer
+
+
+def _regressor_leaf_value(tree) -> np.ndarray:
+    """Raw output at each node of a gradient boosting regression tree"""
+    return tree.value[:, 0, 0]
+
+
+def compile_voting_classifier(model, scaler, source_sha256: Optional[str] = None) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """
+    Flatten a soft-voting rf/gb/lr VotingClassifier into NumPy arrays
+
+    Args:
+        model: Fitted VotingClassifier with 'rf', 'gb' and 'lr' estimators
+        scaler: Fitted StandardScaler for the numeric columns
+        source_sha256: Digest of the pickled model being compiled
+
+    Returns:
+        Tuple of (arrays keyed by ARRAY_NAMES, manifest)
+
+    Raises:
+        ValueError: If the model is not a supported binary soft-voting ensemble
+    """
+    estimators = getattr(model, "named_estimators_", None)
+    if getattr(model, "voting", None) != "soft" or estimators is None or set(estimators) != {"rf", "gb", "lr"}:
+        raise ValueError("Only soft-voting VotingClassifier(rf, gb, lr) models can be compiled")
+    if len(model.classes_) != 2:
+        raise ValueError("Only binary classifiers can be compiled")
+
+    rf, gb, lr = estimators["rf"], estimators["gb"], estimators["lr"]
+    rf_arrays = _flatten_trees([tree.tree_ for tree in rf.estimators_], _classifier_leaf_probability)
+    gb_arrays = _flatten_trees([stage[0].tree_ for stage in gb.estimators_], _regressor_leaf_value)
+
+    # Constant raw score of the prior (DummyClassifier) init estimator
+    n_features = int(model.n_features_in_)
+    gb_init = float(gb._raw_predict_init(np.zeros((1, n_features), dtype=np.float32))[0, 0])
+
+    arrays = {"lr_coef": np.asarray(lr.coef_[0], dtype=np.float64),
+              "scaler_mean": np.asarray(scaler.mean_, dtype=np.float64),
+              "scaler_scale": np.asarray(scaler.scale_, dtype=np.float64)}
+    for prefix, flat in (("rf", rf_arrays), ("gb", gb_arrays)):
+        for key in ("feature", "threshold", "next", "value", "roots"):
+            arrays[f"{prefix}_{key}"] = np.ascontiguousarray(flat[key])
+
+    # Voting weights follow the estimator order of the VotingClassifier
+    names = [name for name, _ in model.estimators]
+    weights = model.weights if model.weights is not None else [1.0] * len(names)
+    weight_by_name = dict(zip(names, weights))
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "n_features": n_features,
+        "weights": {name: float(weight_by_name[name]) for name in ("rf", "gb", "lr")},
+        "rf_n_trees": len(rf.estimators_),
+        "rf_max_depth": rf_arrays["max_depth"],
+        "gb_n_trees": len(gb.estimators_),
+        "gb_max_depth": gb_arrays["max_depth"],
+        "gb_init": gb_init,
+        "gb_learning_rate": float(gb.learning_rate),
+        "lr_intercept": float(lr.intercept_[0]),
+        "source_sha256": source_sha256,
+    }
+    return arrays, manifest
+
+
+def export_voting_classifier(model, scaler, out_dir: str, source_sha256: Optional[str] = None):
+    """
+    Write a soft-voting rf/gb/lr VotingClassifier as memory-mappable arrays
+
+    Args:
+        model: Fitted VotingClassifier with 'rf', 'gb' and 'lr' estimators
+        scaler: Fitted StandardScaler for the numeric columns
+        out_dir: Directory to write the .npy files and manifest into
+        source_sha256: Digest of the pickled model this export came from
+    """
+    arrays, manifest = compile_voting_classifier(model, scaler, source_sha256)
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name in ARRAY_NAMES:
+        np.save(os.path.join(out_dir, f"{name}.npy"), arrays[name])
+
+    # Manifest last: its presence marks a complete export
+    with open(os.path.join(out_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+class TreeEnsemble:
+    """
+    All trees of one ensemble evaluated together
+
+    Rows are processed in blocks; within a block every (row, tree) pair
+    advances one level per step. Pairs that reached their leaf are dropped
+    every other level, so the work follows the actual path lengths rather
+    than the depth of the deepest tree.
+    """
+
+    def __init__(self, feature, threshold, next_slot, value, roots, max_depth: int):
+        # Plain ndarray views - np.memmap's subclass overhead is noticeable per call
+        self.feature = np.asarray(feature)
+        self.threshold = np.asarray(threshold)
+        self.next_slot = np.asarray(next_slot)
+        self.value = np.asarray(value)
+        self.roots = np.asarray(roots)
+        self.max_depth = int(max_depth)
+
+    def leaf_values(self, X32: np.ndarray) -> np.ndarray:
+        """
+        Leaf value of every tree for every row
+
+        Args:
+            X32: (n, n_features) float32 inputs (trees split on float32 like scikit-learn)
+
+        Returns:
+            (n, n_trees) float64 array
+        """
+        X32 = np.ascontiguousarray(X32, dtype=np.float32)
+        out = np.empty((X32.shape[0], len(self.roots)), dtype=np.float64)
+        for start in range(0, X32.shape[0], BLOCK_ROWS):
+            block = X32[start:start + BLOCK_ROWS]
+            out[start:start + len(block)] = self.value[self._leaf_slots(block) >> 1]
+        return out
+
+    def _leaf_slots(self, X32: np.ndarray) -> np.ndarray:
+        """Leaf slot reached by every (row, tree) pair of one block"""
+        n_rows, n_features = X32.shape
+        flat_X = X32.ravel()
+        slot = np.tile(self.roots, n_rows)
+        row_offset = np.repeat(np.arange(n_rows, dtype=np.int32) * n_features, len(self.roots))
+
+        leaf = None  # Final slots, filled in as pairs are compacted away
+        active = None  # Positions in `leaf` still being traversed
+        for depth in range(self.max_depth):
+            go_right = flat_X.take(row_offset + self.feature.take(slot)) > self.threshold.take(slot)
+            next_slot = self.next_slot.take(slot + go_right)
+            if depth < 3 or depth % 2 == 0:
+                slot = next_slot
+                continue
+
+            moved = next_slot != slot
+            if active is None:
+                leaf = next_slot.copy()
+                active = np.flatnonzero(moved)
+            else:
+                leaf[active] = next_slot
+                active = active[moved]
+            slot = next_slot[moved]
+            row_offset = row_offset[moved]
+            if not len(slot):
+                break
+
+        if active is None:
+            leaf = slot
+        elif len(slot):
+            leaf[active] = slot
+        return leaf.reshape(n_rows, len(self.roots))
+
+
+def _expit(x: np.ndarray) -> np.ndarray:
+    """Logistic sigmoid"""
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class CompiledVotingModel:
+    """
+    NumPy evaluator for a compiled soft-voting rf/gb/lr ensemble
+
+    Mirrors scikit-learn's predict_proba to within floating point rounding:
+    trees compare float32 inputs against float64 thresholds, the forest
+    averages normalised leaf probabilities, boosting adds
+    learning_rate * leaf values to the prior score, and the three
+    probabilities are combined with the voting weights. Every tree of an
+    ensemble is evaluated in the same vectorised pass, skipping
+    scikit-learn's per-call input validation and per-estimator dispatch.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], manifest: Dict):
+        self.arrays = arrays
+        self.manifest = manifest
+        self.n_features_in_ = manifest["n_features"]
+        self.source_sha256 = manifest.get("source_sha256")
+
+        self.rf = TreeEnsemble(
+            arrays["rf_feature"], arrays["rf_threshold"], arrays["rf_next"],
+            arrays["rf_value"], arrays["rf_roots"], manifest["rf_max_depth"]
+        )
+        self.gb = TreeEnsemble(
+            arrays["gb_feature"], arrays["gb_threshold"], arrays["gb_next"],
+            arrays["gb_value"], arrays["gb_roots"], manifest["gb_max_depth"]
+        )
+        self._lr_coef = np.asarray(arrays["lr_coef"])
+        self._lr_intercept = manifest["lr_intercept"]
+        self._rf_n_trees = manifest["rf_n_trees"]
+        self._gb_init = manifest["gb_init"]
+        self._gb_learning_rate = manifest["gb_learning_rate"]
+
+        weights = manifest["weights"]
+        total = weights["rf"] + weights["gb"] + weights["lr"]
+        self._weights = (weights["rf"] / total, weights["gb"] / total, weights["lr"] / total)
+
+    @classmethod
+    def from_voting_classifier(cls, model, scaler, source_sha256: Optional[str] = None) -> "CompiledVotingModel":
+        """
+        Compile a fitted VotingClassifier in memory
+
+        Raises:
+            ValueError: If the model is not a supported binary soft-voting ensemble
+        """
+        arrays, manifest = compile_voting_classifier(model, scaler, source_sha256)
+        return cls(arrays, manifest)
+
+    @classmethod
+    def load(cls, model_dir: str, mmap_mode: Optional[str] = "r") -> "CompiledVotingModel":
+        """
+        Load an exported model
+
+        Args:
+            model_dir: Directory written by export_voting_classifier
+            mmap_mode: np.load memory-map mode ('r' shares pages between
+                       processes; None reads the arrays into the heap)
+
+        Raises:
+            ValueError: If the export format is not supported
+        """
+        with open(os.path.join(model_dir, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format: {manifest.get('format_version')}")
+
+        arrays = {
+            name: np.load(os.path.join(model_dir, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in ARRAY_NAMES
+        }
+        return cls(arrays, manifest)
+
+    def predict_churn_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Churn probability for scaled (n, n_features) inputs
+
+        Returns:
+            (n,) array of P(churn)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        X32 = X.astype(np.float32)
+
+        rf_proba = self.rf.leaf_values(X32).sum(axis=1) / self._rf_n_trees
+        gb_raw = self._gb_init + self._gb_learning_rate * self.gb.leaf_values(X32).sum(axis=1)
+        gb_proba = _expit(gb_raw)
+        lr_proba = _expit(X @ self._lr_coef + self._lr_intercept)
+
+        w_rf, w_gb, w_lr = self._weights
+        return w_rf * rf_proba + w_gb * gb_proba + w_lr * lr_proba
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for scaled (n, n_features) inputs
+
+        Returns:
+            (n, 2) array of [P(no churn), P(churn)]
+        """
+        churn = self.predict_churn_proba(X)
+        return np.column_stack([1.0 - churn, churn])
@@ -0,0 +1 @@
+"""Performance benchmarks - run from aura-backend/ with `python -m benchmarks.<name>`"""
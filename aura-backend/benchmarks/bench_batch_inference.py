@@ -0,0 +1,56 @@
+"""
+Batch inference throughput: per-row predict() loop vs predict_batch()
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_batch_inference [--model-dir models] [--sizes 1 100 10000 1000000]
+
+The per-row loop is only timed up to --loop-limit rows; larger sizes
+would take minutes and add nothing to the comparison.
+"""
+import argparse
+import time
+import warnings
+
+from app.services.churn_predictor import ChurnPredictor
+from benchmarks.synthetic import make_customers
+
+warnings.filterwarnings("ignore")
+
+
+def _rows_per_sec(n: int, seconds: float) -> str:
+    return f"{n / seconds:>12,.0f}" if seconds > 0 else f"{'inf':>12}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", default=None, help="Model directory (default: models/)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000, 1_000_000])
+    parser.add_argument("--loop-limit", type=int, default=10_000)
+    args = parser.parse_args()
+    
+    predictor = ChurnPredictor(args.model_dir)
+    
+    print(f"\n{'rows':>10} | {'loop rows/s':>12} | {'batch rows/s':>12} | {'speedup':>8}")
+    print("-" * 52)
+    for n in args.sizes:
+        customers = make_customers(n).to_dict("records")
+        
+        loop_rate = None
+        if n <= args.loop_limit:
+            start = time.perf_counter()
+            for customer in customers:
+                predictor.predict(customer)
+            loop_seconds = time.perf_counter() - start
+            loop_rate = n / loop_seconds
+        
+        start = time.perf_counter()
+        predictor.predict_batch(customers)
+        batch_seconds = time.perf_counter() - start
+        
+        loop_col = _rows_per_sec(n, loop_seconds) if loop_rate else f"{'-':>12}"
+        speedup = f"{(n / batch_seconds) / loop_rate:>7.1f}x" if loop_rate else f"{'-':>8}"
+        print(f"{n:>10,} | {loop_col} | {_rows_per_sec(n, batch_seconds)} | {speedup}")
+
+
+if __name__ == "__main__":
+    main()
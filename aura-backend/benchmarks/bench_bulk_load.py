@@ -0,0 +1,107 @@
+"""
+Customer CSV ingest: per-row ORM adds vs the bulk loader
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_bulk_load [--rows 1000000] [--orm-rows 100000] [--dir /tmp]
+
+Writes a CSV of --rows customers by repeating the Telco dataset with
+unique customer IDs, then times into a fresh SQLite file:
+- the previous loader (df.iterrows(), one Customer object per row, one
+  commit), on the first --orm-rows rows
+- load_customers_csv on the whole file (initial load)
+- load_customers_csv on the same file again (idempotent re-ingest)
+- load_customers_csv on the file with every tenure changed (full update)
+"""
+import argparse
+import os
+import time
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import Customer
+from app.services.bulk_loader import load_customers_csv
+from tests.conftest import TELCO_CSV
+
+
+def _write_csv(path: str, n_rows: int, tenure_shift: int = 0):
+    df = pd.read_csv(TELCO_CSV)
+    copies = -(-n_rows // len(df))
+    big = pd.concat([df] * copies, ignore_index=True).head(n_rows)
+    big["customerID"] = big["customerID"] + "-" + (big.index // len(df)).astype(str).str.zfill(4)
+    big["tenure"] = big["tenure"] + tenure_shift
+    big.to_csv(path, index=False)
+
+
+def _fresh_engine(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def _orm_load(engine, csv_path: str, n_rows: int):
+    """Previous /load-csv-data implementation"""
+    df = pd.read_csv(csv_path, nrows=n_rows)
+    df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
+    df['TotalCharges'] = df['TotalCharges'].fillna(0)
+    with Session(bind=engine) as db:
+        for _, row in df.iterrows():
+            db.add(Customer(
+                customer_id=row['customerID'], gender=row['gender'], senior_citizen=int(row['SeniorCitizen']),
+                partner=row['Partner'], dependents=row['Dependents'], tenure=int(row['tenure']),
+                phone_service=row['PhoneService'], multiple_lines=row['MultipleLines'],
+                internet_service=row['InternetService'], online_security=row['OnlineSecurity'],
+                online_backup=row['OnlineBackup'], device_protection=row['DeviceProtection'],
+                tech_support=row['TechSupport'], streaming_tv=row['StreamingTV'],
+                streaming_movies=row['StreamingMovies'], contract=row['Contract'],
+                paperless_billing=row['PaperlessBilling'], payment_method=row['PaymentMethod'],
+                monthly_charges=float(row['MonthlyCharges']), total_charges=float(row['TotalCharges']),
+                churn=row['Churn']
+            ))
+        db.commit()
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--orm-rows", type=int, default=100_000)
+    parser.add_argument("--dir", default="/tmp")
+    args = parser.parse_args()
+
+    csv_path = os.path.join(args.dir, "aura_bench_customers.csv")
+    changed_path = os.path.join(args.dir, "aura_bench_customers_changed.csv")
+    db_path = os.path.join(args.dir, "aura_bench_load.db")
+    _write_csv(csv_path, args.rows)
+    _write_csv(changed_path, args.rows, tenure_shift=1)
+
+    results = []
+    orm_seconds = _timed(lambda: _orm_load(_fresh_engine(db_path), csv_path, args.orm_rows))
+    results.append((f"iterrows + ORM ({args.orm_rows:,} rows)", args.orm_rows, orm_seconds))
+
+    engine = _fresh_engine(db_path)
+    results.append(("bulk loader, initial", args.rows, _timed(lambda: load_customers_csv(engine, csv_path))))
+    results.append(("bulk loader, same file", args.rows, _timed(lambda: load_customers_csv(engine, csv_path))))
+    results.append(("bulk loader, all changed", args.rows, _timed(lambda: load_customers_csv(engine, changed_path))))
+    engine.dispose()
+
+    print(f"\n{'loader':<34} | {'rows':>9} | {'seconds':>8} | {'rows/s':>9}")
+    print("-" * 70)
+    for name, rows, seconds in results:
+        print(f"{name:<34} | {rows:>9,} | {seconds:>8.1f} | {rows / seconds:>9,.0f}")
+
+    for path in (csv_path, changed_path, db_path):
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Data cache under multithreaded contention: single-lock dict vs sharded LRU
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_cache [--threads 1 4 16] [--ops 200000] [--keys 20000]
+
+Each thread runs the request-path pattern of CustomerRepository.get_by_id:
+get a "customer:{id}" key and set it on a miss, with a Zipf-like key
+popularity. The single-lock baseline is the previous unbounded
+InMemoryCache design (one dict, one lock, expiry only on read). Prefix
+invalidation is timed separately on a full cache.
+"""
+import argparse
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.core.cache import InMemoryCache
+
+
+class _Entry:
+    """Previous CacheEntry"""
+
+    def __init__(self, value, ttl_seconds):
+        self.value = value
+        self.expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+
+    def is_expired(self):
+        return datetime.utcnow() > self.expires_at
+
+
+class SingleLockCache:
+    """Previous InMemoryCache: unbounded dict behind one global lock"""
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry.is_expired():
+                del self._cache[key]
+                return None
+            return entry.value
+
+    def set(self, key, value, ttl_seconds=300):
+        with self._lock:
+            self._cache[key] = _Entry(value, ttl_seconds)
+
+    def invalidate_pattern(self, pattern):
+        with self._lock:
+            for key in [key for key in self._cache if key.startswith(pattern)]:
+                del self._cache[key]
+
+    def size(self):
+        return len(self._cache)
+
+
+def _run_threads(cache, n_threads: int, keys) -> float:
+    """Run the get-or-set loop on n_threads threads; returns ops/sec"""
+    chunks = np.array_split(keys, n_threads)
+    barrier = threading.Barrier(n_threads + 1)
+
+    def worker(chunk):
+        barrier.wait()
+        for key in chunk:
+            if cache.get(key) is None:
+                cache.set(key, key)
+
+    threads = [threading.Thread(target=worker, args=(chunk.tolist(),)) for chunk in chunks]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return len(keys) / (time.perf_counter() - start)
+
+
+def _time_invalidation(cache, n_keys: int) -> float:
+    """Seconds to invalidate one namespace out of a cache holding n_keys other keys"""
+    for i in range(n_keys):
+        cache.set(f"customer:{i}", i)
+    for i in range(100):
+        cache.set(f"summary:{i}", i)
+    start = time.perf_counter()
+    cache.invalidate_pattern("summary:")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--keys", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    key_ids = np.minimum(rng.zipf(1.2, size=args.ops), args.keys)
+    keys = np.array([f"customer:{i}" for i in key_ids], dtype=object)
+
+    print(f"\n{'threads':>7} | {'single lock ops/s':>17} | {'sharded ops/s':>13} | {'sharded size':>12}")
+    print("-" * 60)
+    for n_threads in args.threads:
+        baseline = SingleLockCache()
+        sharded = InMemoryCache(num_shards=16, max_entries=10_000)
+        baseline_rate = _run_threads(baseline, n_threads, keys)
+        sharded_rate = _run_threads(sharded, n_threads, keys)
+        print(f"{n_threads:>7} | {baseline_rate:>17,.0f} | {sharded_rate:>13,.0f} | {sharded.size():>12,}")
+    print(f"(single lock cache grew to {baseline.size():,} entries with no bound)")
+
+    baseline_seconds = _time_invalidation(SingleLockCache(), 100_000)
+    sharded_seconds = _time_invalidation(InMemoryCache(num_shards=16, max_entries=200_000), 100_000)
+    print(f"\ninvalidate_pattern('summary:') with 100,000 other keys: "
+          f"single lock {baseline_seconds * 1e3:.2f} ms, sharded {sharded_seconds * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Single-threaded InMemoryCache get/set throughput
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_cache_ops [--ops 500000] [--keys 5000]
+
+Times the hot paths of CustomerRepository: get hits on "customer:{id}"
+and "summary_stats", get misses, and set (overwriting existing keys), and
+compares a datetime-based entry (datetime.utcnow() + timedelta on set,
+datetime.utcnow() on every expiry check) with a time.monotonic() float
+deadline in isolation.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from app.core.cache import InMemoryCache
+
+
+def _ops_per_sec(fn, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return len(keys) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=500_000)
+    parser.add_argument("--keys", type=int, default=5_000)
+    args = parser.parse_args()
+
+    cache = InMemoryCache(num_shards=16, max_entries=args.keys * 2)
+    keys = [f"customer:{i % args.keys}" for i in range(args.ops)]
+    missing = [f"missing:{i % args.keys}" for i in range(args.ops)]
+    for key in keys[:args.keys]:
+        cache.set(key, key)
+    cache.set("summary_stats", {"total_customers": 7043})
+
+    results = {
+        "set (overwrite)": _ops_per_sec(lambda key: cache.set(key, key, 300), keys),
+        "get hit customer:{id}": _ops_per_sec(cache.get, keys),
+        "get hit summary_stats": _ops_per_sec(cache.get, ["summary_stats"] * args.ops),
+        "get miss": _ops_per_sec(cache.get, missing),
+    }
+
+    print(f"\n{'InMemoryCache operation':<25} | {'ops/s':>12}")
+    print("-" * 40)
+    for name, rate in results.items():
+        print(f"{name:<25} | {rate:>12,.0f}")
+
+    # Entry-level cost of the deadline representation alone
+    n = args.ops
+    start = time.perf_counter()
+    for _ in range(n):
+        expires_at = datetime.utcnow() + timedelta(seconds=300)
+        datetime.utcnow() > expires_at
+    datetime_rate = n / (time.perf_counter() - start)
+
+    monotonic = time.monotonic
+    start = time.perf_counter()
+    for _ in range(n):
+        deadline = monotonic() + 300
+        monotonic() > deadline
+    monotonic_rate = n / (time.perf_counter() - start)
+
+    print(f"\n{'deadline (create + check)':<25} | {'ops/s':>12}")
+    print("-" * 40)
+    print(f"{'datetime + timedelta':<25} | {datetime_rate:>12,.0f}")
+    print(f"{'time.monotonic() float':<25} | {monotonic_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compiled NumPy evaluator vs scikit-learn predict_proba
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_compiled_model [--model-dir models] [--sizes 1 10 100 1000 10000]
+
+Reports the median latency of one predict_proba call on already encoded
+and scaled rows: scikit-learn, the compiled evaluator, and ChurnPredictor
+serving a memory-mapped export (compiled below COMPILED_MAX_ROWS rows,
+the lazily loaded pickle above). Then the end-to-end
+ChurnPredictor.predict() latency with and without the prediction cache.
+"""
+import argparse
+import os
+import pickle
+import shutil
+import statistics
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+from app.services.churn_predictor import DEFAULT_MODEL_DIR, SMOKE_TEST_CUSTOMER, ChurnPredictor
+from app.services.tree_ensemble import CompiledVotingModel
+from export_model import export_model
+from benchmarks.synthetic import make_customers
+
+warnings.filterwarnings("ignore")
+
+
+def _median_seconds(fn, repeats: int) -> float:
+    fn()  # Warm up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _format_latency(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:>9.0f} µs"
+    return f"{seconds * 1e3:>9.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", default=DEFAULT_MODEL_DIR)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10_000])
+    args = parser.parse_args()
+    
+    with open(os.path.join(args.model_dir, "best_model.pkl"), "rb") as f:
+        model = pickle.load(f)
+    with open(os.path.join(args.model_dir, "scaler.pkl"), "rb") as f:
+        scaler = pickle.load(f)
+    compiled = CompiledVotingModel.from_voting_classifier(model, scaler)
+    
+    # Memory-mapped deployment: a copy of the model directory with its export
+    with tempfile.TemporaryDirectory() as deploy_dir:
+        for name in ("best_model.pkl", "scaler.pkl", "feature_names.pkl", "model_metadata.json"):
+            shutil.copy(os.path.join(args.model_dir, name), deploy_dir)
+        export_model(deploy_dir)
+        predictor = ChurnPredictor(deploy_dir)
+        features, _, _ = predictor._prepare_features_batch(make_customers(max(args.sizes)))
+        
+        print(f"\n{'rows':>8} | {'sklearn':>12} | {'compiled':>12} | {'predictor':>12} | {'speedup':>8} | "
+              f"{'max |Δp|':>8}")
+        print("-" * 77)
+        for n in args.sizes:
+            X = features[:n]
+            repeats = max(3, min(200, 20_000 // n))
+            sklearn_seconds = _median_seconds(lambda: model.predict_proba(X), repeats)
+            compiled_seconds = _median_seconds(lambda: compiled.predict_proba(X), repeats)
+            predictor_seconds = _median_seconds(lambda: predictor._predict_churn_proba(X), repeats)
+            max_error = np.max(np.abs(model.predict_proba(X)[:, 1] - predictor._predict_churn_proba(X)))
+            print(f"{n:>8,} | {_format_latency(sklearn_seconds)} | {_format_latency(compiled_seconds)} | "
+                  f"{_format_latency(predictor_seconds)} | {sklearn_seconds / predictor_seconds:>7.1f}x | "
+                  f"{max_error:>8.1e}")
+        
+        uncached_seconds = _median_seconds(lambda: predictor.predict(SMOKE_TEST_CUSTOMER, use_cache=False), 500)
+        cached_seconds = _median_seconds(lambda: predictor.predict(SMOKE_TEST_CUSTOMER), 500)
+        print(f"\nChurnPredictor.predict() end to end: {_format_latency(uncached_seconds).strip()} "
+              f"({_format_latency(cached_seconds).strip()} from the prediction cache)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+API load test: throughput and latency at increasing client concurrency
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_concurrency [--clients 50,200,1000] [--seconds 15] [--dir /tmp]
+
+Builds a SQLite database with the Telco customers (all scored), starts
+uvicorn on it in a subprocess and runs --clients concurrent HTTP clients
+for --seconds each. Every client loops over a request mix that reads and
+writes like the dashboard does:
+- GET /api/customers/{id}          (model prediction + audit write)
+- GET /api/customers/all/list      (first page)
+- GET /api/customers/search/list   (filtered, risk-sorted)
+- GET /api/dashboard/summary
+A separate probe requests /health every 100 ms; its latency shows how
+long the event loop was blocked.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import Customer
+from app.services.bulk_loader import load_customers_csv
+from app.services.churn_predictor import ChurnPredictor
+from app.services.scoring_job import ScoringJob
+from tests.conftest import BACKEND_DIR, TELCO_CSV
+
+PORT = 8791
+
+
+def _build(db_path: str):
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    load_customers_csv(engine, TELCO_CSV)
+    ScoringJob(ChurnPredictor(), lambda: Session(bind=engine), verbose=False, workers=1).run()
+    with Session(bind=engine) as db:
+        customer_ids = [row[0] for row in db.query(Customer.customer_id)]
+    engine.dispose()
+    return customer_ids
+
+
+def _request_mix(customer_ids):
+    rng = random.Random()
+
+    def next_path():
+        kind = rng.random()
+        if kind < 0.4:
+            return f"/api/customers/{rng.choice(customer_ids)}"
+        if kind < 0.6:
+            return "/api/customers/all/list?page_size=50"
+        if kind < 0.8:
+            return "/api/customers/search/list?contract=Month-to-month&sort=risk&page_size=50"
+        return "/api/dashboard/summary"
+
+    return next_path
+
+
+async def _client(http, next_path, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await http.get(next_path())
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def _probe(http, deadline, latencies):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            await http.get("/health")
+            latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.1)
+
+
+async def _run(clients: int, seconds: float, customer_ids):
+    limits = httpx.Limits(max_connections=clients + 1, max_keepalive_connections=clients + 1)
+    timeout = httpx.Timeout(120.0)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=timeout) as http:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", timeout=timeout) as probe_http:
+            latencies, errors, probe = [], [], []
+            deadline = time.perf_counter() + seconds
+            next_path = _request_mix(customer_ids)
+            await asyncio.gather(
+                _probe(probe_http, deadline, probe),
+                *[_client(http, next_path, deadline, latencies, errors) for _ in range(clients)]
+            )
+    return latencies, errors, probe
+
+
+def _quantile(values, q):
+    return statistics.quantiles(values, n=100)[q - 1] * 1000 if len(values) >= 2 else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", default="50,200,1000", help="Comma-separated client counts")
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--dir", default="/tmp")
+    args = parser.parse_args()
+
+    db_path = os.path.join(args.dir, "aura_bench_concurrency.db")
+    customer_ids = _build(db_path)
+    env = dict(
+        os.environ, DATABASE_URL=f"sqlite:///{db_path}", JOB_WORKERS="0", CACHE_CLEANUP_INTERVAL_SECONDS="0"
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--log-level", "warning",
+         "--backlog", "4096"],
+        cwd=BACKEND_DIR, env=env
+    )
+    try:
+        for _ in range(300):
+            try:
+                if httpx.get(f"http://127.0.0.1:{PORT}/health").status_code == 200:
+                    break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        asyncio.run(_run(5, 2.0, customer_ids))  # warm-up
+
+        print(f"\n{'clients':>7} | {'req/s':>7} | {'p50 ms':>7} | {'p99 ms':>8} | {'errors':>6} | "
+              f"{'health p50':>10} | {'health max':>10}")
+        print("-" * 76)
+        for clients in [int(n) for n in args.clients.split(",")]:
+            latencies, errors, probe = asyncio.run(_run(clients, args.seconds, customer_ids))
+            print(
+                f"{clients:>7} | {len(latencies) / args.seconds:>7.1f} | {_quantile(latencies, 50):>7.1f} | "
+                f"{_quantile(latencies, 99):>8.1f} | {len(errors):>6} | "
+                f"{_quantile(probe, 50):>8.1f}ms | {max(probe, default=float('nan')) * 1000:>8.1f}ms"
+            )
+    finally:
+        server.terminate()
+        server.wait()
+        os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main()
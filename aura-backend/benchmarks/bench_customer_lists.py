@@ -0,0 +1,119 @@
+"""
+Customer list endpoints: per-row prediction lookups vs one joined projection
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_customer_lists [--customers 7000 1000000] [--db /tmp/aura_bench.db]
+
+Builds a SQLite database with N customers and one latest prediction each
+(30% High), then times the query work of /api/customers/high-risk/list,
+/api/dashboard/summary's top risky list (limit 50) and one
+/api/customers/all/list page (page_size 100, middle of the table). The
+N+1 path is the previous endpoint code: load Customer objects, then call
+get_latest_prediction per customer.
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import Customer, CustomerLatestPrediction
+from app.repositories.customer_repository import CustomerRepository
+
+CONTRACTS = ["Month-to-month", "One year", "Two year"]
+INTERNET_SERVICES = ["DSL", "Fiber optic", "No"]
+
+
+def _build(path: str, n_customers: int):
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(0, n_customers, 50_000):
+            ids = [f"C{i:07d}" for i in range(start, min(start + 50_000, n_customers))]
+            conn.execute(insert(Customer), [
+                {"customer_id": i, "tenure": rng.randint(0, 72),
+                 "contract": rng.choice(CONTRACTS), "internet_service": rng.choice(INTERNET_SERVICES),
+                 "monthly_charges": rng.uniform(20, 120), "churn": "No"}
+                for i in ids
+            ])
+            scores = [rng.random() for _ in ids]
+            conn.execute(insert(CustomerLatestPrediction), [
+                {"customer_id": i, "churn_probability": s, "risk_score": s,
+                 "risk_level": "High" if s >= 0.7 else "Medium" if s >= 0.4 else "Low",
+                 "predicted_churn": "Yes" if s >= 0.5 else "No", "timestamp": now}
+                for i, s in zip(ids, scores)
+            ])
+    return engine
+
+
+def _time(fn, repeat: int = 5):
+    """Best-of-repeat seconds and statement count of fn()"""
+    best, statements = float("inf"), 0
+    for _ in range(repeat):
+        count = [0]
+        start = time.perf_counter()
+        fn(count)
+        best = min(best, time.perf_counter() - start)
+        statements = count[0]
+    return best, statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, nargs="+", default=[7_000, 1_000_000])
+    parser.add_argument("--db", default="/tmp/aura_bench_lists.db")
+    args = parser.parse_args()
+
+    print(f"\n{'customers':>9} | {'endpoint':<22} | {'N+1 ms':>8} | {'stmts':>5} | {'joined ms':>9} | {'stmts':>5}")
+    print("-" * 74)
+    for n_customers in args.customers:
+        engine = _build(args.db, n_customers)
+        counter = {}
+        event.listen(engine, "before_cursor_execute", lambda *a: counter["c"].__setitem__(0, counter["c"][0] + 1))
+
+        def run(fn):
+            def timed(count):
+                counter["c"] = count
+                with Session(bind=engine) as db:
+                    fn(CustomerRepository(db), db)
+            return _time(timed)
+
+        def high_risk_n_plus_one(repo, db):
+            for customer in repo.get_high_risk_customers(limit=50):
+                prediction = repo.get_latest_prediction(customer.customer_id)
+                (customer.internet_service, customer.monthly_charges, prediction.risk_score)
+
+        def page_n_plus_one(repo, db):
+            for customer in db.query(Customer).offset(n_customers // 2).limit(100).all():
+                prediction = repo.get_latest_prediction(customer.customer_id)
+                (customer.tenure, prediction.risk_score if prediction else 0.0)
+
+        cases = {
+            "high-risk list (50)": (
+                high_risk_n_plus_one,
+                lambda repo, db: repo.get_high_risk_with_predictions(limit=50)
+            ),
+            "all/list page (100)": (
+                page_n_plus_one,
+                lambda repo, db: repo.get_customers_with_predictions(skip=n_customers // 2, limit=100)
+            ),
+        }
+        for name, (before, after) in cases.items():
+            before_seconds, before_statements = run(before)
+            after_seconds, after_statements = run(after)
+            print(f"{n_customers:>9,} | {name:<22} | {before_seconds * 1e3:>8.1f} | {before_statements:>5} | "
+                  f"{after_seconds * 1e3:>9.1f} | {after_statements:>5}")
+        engine.dispose()
+    os.remove(args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Customer search latency as the customer table grows
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_customer_search [--customers 7000 1000000] [--db /tmp/aura_bench_search.db]
+
+Uses the database layout of bench_customer_lists (random contract,
+internet service, tenure, monthly charges and risk score) and times the
+first and a deep page (50 rows) of typical /api/customers/search/list
+queries, with and without the composite search indexes.
+"""
+import argparse
+import os
+import time
+
+from sqlalchemy.orm import Session
+
+from app.db.models import Customer
+from app.repositories.customer_repository import CustomerFilters, CustomerRepository
+from benchmarks.bench_customer_lists import _build
+
+PAGE_SIZE = 50
+
+QUERIES = {
+    "contract": dict(filters=CustomerFilters(contracts=["Two year"])),
+    "contract + internet": dict(filters=CustomerFilters(contracts=["Month-to-month"], internet_services=["Fiber optic"])),
+    "tenure 0-6": dict(filters=CustomerFilters(tenure_max=6)),
+    "tenure 0-6, sort tenure": dict(filters=CustomerFilters(tenure_max=6), sort="tenure"),
+    "High, sort risk desc": dict(filters=CustomerFilters(risk_levels=["High"]), sort="risk", descending=True),
+    "prefix C05": dict(filters=CustomerFilters(customer_id_prefix="C05")),
+    "sort charges desc": dict(sort="monthly_charges", descending=True),
+}
+
+
+def _page_ms(repo, query, pages: int) -> float:
+    """Milliseconds to fetch page number `pages` (following cursors) of a query"""
+    cursor = None
+    for _ in range(pages - 1):
+        _, cursor = repo.search_customers(**query, cursor=cursor, limit=PAGE_SIZE)
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        repo.search_customers(**query, cursor=cursor, limit=PAGE_SIZE)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, nargs="+", default=[7_000, 1_000_000])
+    parser.add_argument("--db", default="/tmp/aura_bench_search.db")
+    args = parser.parse_args()
+
+    print(f"\n{'customers':>9} | {'query':<24} | {'page 1 ms':>9} | {'page 20 ms':>10} | {'no index p1 ms':>14}")
+    print("-" * 80)
+    for n_customers in args.customers:
+        engine = _build(args.db, n_customers)
+        with Session(bind=engine) as db:
+            repo = CustomerRepository(db)
+            timings = {name: (_page_ms(repo, q, 1), _page_ms(repo, q, 20)) for name, q in QUERIES.items()}
+
+            for index in Customer.__table__.indexes:
+                if len(index.columns) > 1:
+                    index.drop(bind=db.connection())
+            for name, query in QUERIES.items():
+                first, deep = timings[name]
+                print(f"{n_customers:>9,} | {name:<24} | {first:>9.2f} | {deep:>10.2f} | "
+                      f"{_page_ms(repo, query, 1):>14.2f}")
+        engine.dispose()
+    os.remove(args.db)
+
+
+if __name__ == "__main__":
+    main()
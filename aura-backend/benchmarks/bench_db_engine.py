@@ -0,0 +1,137 @@
+"""
+Concurrent reads and writes on SQLite: default engine vs create_db_engine
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_db_engine [--readers 8] [--writers 2] [--seconds 10] [--dir /tmp]
+
+Builds a SQLite database with the Telco customers (all scored), then for
+each engine configuration runs on a fresh copy of it:
+- --readers threads loading the dashboard (summary stats without cache
+  and the first risk-sorted search page), like the dashboard views
+- --writers threads storing single predictions with save_prediction,
+  like customer detail views
+Configurations: create_engine(url) with SQLAlchemy/SQLite defaults
+(rollback journal, 5 s lock timeout, 5 + 10 pooled connections) and
+create_db_engine(url) with the Settings defaults (WAL,
+synchronous=NORMAL, mmap, page cache, busy_timeout, DB_POOL_*).
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.db.base import Base, create_db_engine
+from app.db.models import Customer
+from app.repositories.customer_repository import CustomerRepository
+from app.services.bulk_loader import load_customers_csv
+from app.services.churn_predictor import ChurnPredictor
+from app.services.scoring_job import ScoringJob
+from tests.conftest import TELCO_CSV
+
+
+def _build(db_path: str):
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    load_customers_csv(engine, TELCO_CSV)
+    ScoringJob(ChurnPredictor(), lambda: Session(bind=engine), verbose=False, workers=1).run()
+    with Session(bind=engine) as db:
+        customer_ids = [row[0] for row in db.query(Customer.customer_id)]
+    engine.dispose()
+    return customer_ids
+
+
+def _worker(engine, operation, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            with Session(bind=engine) as db:
+                operation(CustomerRepository(db))
+        except OperationalError as e:
+            errors.append(str(e.orig))
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def _run(engine, customer_ids, readers: int, writers: int, seconds: float):
+    rng = random.Random(0)
+
+    def read(repo):
+        repo.get_summary_stats()
+        repo.search_customers(sort="risk", descending=True, limit=50)
+
+    def write(repo):
+        repo.save_prediction(rng.choice(customer_ids), rng.random(), "Medium")
+
+    reads, writes, read_errors, write_errors = [], [], [], []
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=_worker, args=(engine, read, deadline, reads, read_errors))
+        for _ in range(readers)
+    ] + [
+        threading.Thread(target=_worker, args=(engine, write, deadline, writes, write_errors))
+        for _ in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return reads, writes, read_errors + write_errors
+
+
+def _ms(values, q):
+    return statistics.quantiles(values, n=100)[q - 1] * 1000 if len(values) >= 2 else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--dir", default="/tmp")
+    args = parser.parse_args()
+
+    template = os.path.join(args.dir, "aura_bench_db_engine_template.db")
+    db_path = os.path.join(args.dir, "aura_bench_db_engine.db")
+    customer_ids = _build(template)
+    configurations = [
+        ("create_engine defaults", create_engine),
+        ("create_db_engine", create_db_engine),
+    ]
+
+    print(f"\n{args.readers} readers, {args.writers} writers, {args.seconds:.0f} s")
+    print(f"{'engine':<24} | {'reads/s':>7} | {'read p50':>8} | {'read p99':>8} | "
+          f"{'writes/s':>8} | {'write p99':>9} | {'errors':>6}")
+    print("-" * 90)
+    try:
+        for name, make_engine in configurations:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+            shutil.copyfile(template, db_path)
+            engine = make_engine(f"sqlite:///{db_path}")
+            reads, writes, errors = _run(engine, customer_ids, args.readers, args.writers, args.seconds)
+            engine.dispose()
+            print(
+                f"{name:<24} | {len(reads) / args.seconds:>7.1f} | {_ms(reads, 50):>6.1f}ms | "
+                f"{_ms(reads, 99):>6.1f}ms | {len(writes) / args.seconds:>8.1f} | {_ms(writes, 99):>7.1f}ms | "
+                f"{len(errors):>6}"
+            )
+            if errors:
+                print(f"{'':<24}   e.g. {errors[0]}")
+    finally:
+        for path in (template, db_path, db_path + "-wal", db_path + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
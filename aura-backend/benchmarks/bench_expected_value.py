@@ -0,0 +1,129 @@
+"""
+Expected-value targeting: ranking the customer base for a campaign budget
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_expected_value [--customers 1000000 5000000] [--db-customers 1000000]
+
+Ranking (in memory, synthetic customers; budget for 10% of them):
+- python: expected values in a loop, sorted(), then the top k
+- argsort: NumPy expected values, full argsort, then the top k
+- select_targets: NumPy expected values, argpartition top k, sort of the k
+
+Endpoint (SQLite database with --db-customers customers, see
+bench_customer_lists): /api/simulation/targeting handler time on the
+first request (loads the targeting snapshot), on a later request and on
+a request right after a prediction was saved (the snapshot is refreshed
+on a timer, not by writes), and the time to produce the whole NDJSON
+stream.
+"""
+import argparse
+import os
+import time
+
+import anyio
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.api.simulation import TargetingRequest, target_customers
+from app.core.risk import ScoredCustomers, customer_ltv
+from app.core.targeting_snapshot import targeting_snapshot
+from app.db.models import Customer
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.risk_rollup import rebuild_risk_rollup
+from app.services.roi_simulator import ROISimulator
+from benchmarks.bench_customer_lists import _build
+
+COST_PER_CUSTOMER = 50.0
+
+
+def _customers(n: int) -> ScoredCustomers:
+    rng = np.random.default_rng(0)
+    return ScoredCustomers(
+        customer_ids=np.array([f"C{i:08d}" for i in range(n)], dtype=object),
+        risk_scores=rng.uniform(0, 1, n),
+        ltv=customer_ltv(rng.uniform(20, 120, n), rng.integers(0, 73, n))
+    )
+
+
+def _python_top(customers: ScoredCustomers, k: int, uplift: float):
+    scored = []
+    for customer_id, risk_score, ltv in zip(
+        customers.customer_ids.tolist(), customers.risk_scores.tolist(), customers.ltv.tolist()
+    ):
+        expected_value = risk_score * ltv * uplift
+        if expected_value > COST_PER_CUSTOMER:
+            scored.append((expected_value, customer_id))
+    scored.sort(reverse=True)
+    return scored[:k]
+
+
+def _argsort_top(customers: ScoredCustomers, k: int, uplift: float):
+    expected_values = customers.risk_scores * customers.ltv * uplift
+    order = np.argsort(-expected_values, kind="stable")
+    order = order[expected_values[order] > COST_PER_CUSTOMER][:k]
+    return customers.customer_ids[order], expected_values[order]
+
+
+async def _count_lines(body_iterator) -> int:
+    lines = 0
+    async for chunk in body_iterator:
+        lines += chunk.count("\n")
+    return lines
+
+
+def _best(fn, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--db-customers", type=int, default=1_000_000)
+    parser.add_argument("--db", default="/tmp/aura_bench_expected_value.db")
+    args = parser.parse_args()
+
+    simulator = ROISimulator()
+    uplift = simulator.campaign_effectiveness
+    print(f"\n{'customers':>9} | {'targets':>7} | {'python s':>8} | {'argsort ms':>10} | {'select_targets ms':>17}")
+    print("-" * 64)
+    for n_customers in args.customers:
+        customers = _customers(n_customers)
+        k = n_customers // 10
+        budget = k * COST_PER_CUSTOMER
+        python_seconds, python_top = _best(lambda: _python_top(customers, k, uplift), repeat=1)
+        argsort_seconds, _ = _best(lambda: _argsort_top(customers, k, uplift))
+        select_seconds, targets = _best(lambda: simulator.select_targets(customers, budget, COST_PER_CUSTOMER))
+        assert np.allclose(targets.expected_values, [value for value, _ in python_top])
+        print(f"{n_customers:>9,} | {len(targets.customer_ids):>7,} | {python_seconds:>8.2f} | "
+              f"{argsort_seconds * 1e3:>10.1f} | {select_seconds * 1e3:>17.1f}")
+
+    engine = _build(args.db, args.db_customers)
+    request = TargetingRequest(campaign_budget=args.db_customers // 10 * COST_PER_CUSTOMER,
+                               cost_per_customer=COST_PER_CUSTOMER)
+    print(f"\n/api/simulation/targeting, {args.db_customers:,} customers")
+    with Session(bind=engine) as db:
+        rebuild_risk_rollup(db)
+        db.commit()
+        targeting_snapshot.clear()
+        for label in ("first request", "later request", "after a write"):
+            if label == "after a write":
+                customer_id = db.query(Customer.customer_id).limit(1).scalar()
+                CustomerRepository(db).save_prediction(customer_id, 0.99, "High")
+            start = time.perf_counter()
+            response = target_customers.__wrapped__(request, db)
+            handler_seconds = time.perf_counter() - start
+            lines = anyio.run(_count_lines, response.body_iterator)
+            stream_seconds = time.perf_counter() - start
+            print(f"  {label:<14}: handler {handler_seconds * 1e3:>7.1f} ms, "
+                  f"{lines:,} targets streamed after {stream_seconds:.2f} s")
+    engine.dispose()
+    os.remove(args.db)
+
+
+if __name__ == "__main__":
+    main()
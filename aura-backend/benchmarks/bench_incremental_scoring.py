@@ -0,0 +1,79 @@
+"""
+Nightly rescoring: full-base ScoringJob vs incremental ScoringJob
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_incremental_scoring [--rows 200000] [--changed 200] [--dir /tmp]
+
+Loads --rows customers into a fresh SQLite file and scores them all once,
+then changes --changed customers through CustomerRepository.update_customer
+(a typical day) and times:
+- a full rescoring run
+- an incremental run after the same changes
+- an incremental run with nothing to do (the cost of finding the changes)
+"""
+import argparse
+import os
+import random
+
+from sqlalchemy.orm import Session
+
+from app.db.models import Customer
+from app.repositories.customer_repository import CustomerRepository
+from app.services.bulk_loader import load_customers_csv
+from app.services.churn_predictor import ChurnPredictor
+from app.services.scoring_job import ScoringJob
+from benchmarks.bench_bulk_load import _fresh_engine, _timed, _write_csv
+
+
+def _change_customers(engine, n: int, seed: int):
+    with Session(bind=engine) as db:
+        repo = CustomerRepository(db)
+        customer_ids = [row[0] for row in db.query(Customer.customer_id)]
+        for customer_id in random.Random(seed).sample(customer_ids, n):
+            customer = repo.get_by_id(customer_id, use_cache=False)
+            repo.update_customer(customer_id, {"tenure": customer.tenure + 1})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--changed", type=int, default=200)
+    parser.add_argument("--dir", default="/tmp")
+    args = parser.parse_args()
+
+    csv_path = os.path.join(args.dir, "aura_bench_incremental.csv")
+    db_path = os.path.join(args.dir, "aura_bench_incremental.db")
+    _write_csv(csv_path, args.rows)
+    engine = _fresh_engine(db_path)
+    load_customers_csv(engine, csv_path)
+    predictor = ChurnPredictor()
+
+    def session_factory():
+        return Session(bind=engine)
+
+    def job(incremental: bool):
+        return ScoringJob(predictor, session_factory, verbose=False, workers=1, incremental=incremental)
+
+    job(False).run()
+    results = []
+    _change_customers(engine, args.changed, seed=0)
+    seconds = _timed(lambda: results.append(job(False).run()))
+    rows = [("full rescoring", results[-1]["scored"], seconds)]
+    _change_customers(engine, args.changed, seed=1)
+    seconds = _timed(lambda: results.append(job(True).run()))
+    rows.append((f"incremental, {args.changed} changed", results[-1]["scored"], seconds))
+    seconds = _timed(lambda: results.append(job(True).run()))
+    rows.append(("incremental, nothing changed", results[-1]["scored"], seconds))
+    engine.dispose()
+
+    print(f"\n{'run':<34} | {'scored':>9} | {'seconds':>8}")
+    print("-" * 58)
+    for name, scored, seconds in rows:
+        print(f"{name:<34} | {scored:>9,} | {seconds:>8.2f}")
+
+    for path in (csv_path, db_path):
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
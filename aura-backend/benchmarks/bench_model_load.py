@@ -0,0 +1,81 @@
+"""
+Model startup time and per-worker memory: pickled vs memory-mapped export
+
+Starts --workers fresh processes (like `uvicorn --workers N`), each of
+which imports the app's predictor, loads the model and runs one
+prediction. Once all workers are loaded, each reports RSS, PSS and USS
+from /proc/self/smaps_rollup (Linux only).
+
+Usage (from aura-backend/):
+    python export_model.py --model-dir models
+    python -m benchmarks.bench_model_load [--model-dir models] [--workers 4]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import time
+
+
+def _memory_kb():
+    """RSS, PSS and USS of the current process in kB"""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    uss = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return fields.get("Rss", 0), fields.get("Pss", 0), uss
+
+
+def _worker(model_dir, use_compiled, loaded, measure, results):
+    os.environ["MODEL_USE_COMPILED"] = "true" if use_compiled else "false"
+    start = time.perf_counter()
+    from app.services.churn_predictor import ChurnPredictor, SMOKE_TEST_CUSTOMER
+    predictor = ChurnPredictor(model_dir)
+    predictor.predict(SMOKE_TEST_CUSTOMER)
+    startup_seconds = time.perf_counter() - start
+    
+    # Measure only once every worker has mapped the model
+    loaded.wait()
+    rss, pss, uss = _memory_kb()
+    results.put((startup_seconds, rss, pss, uss))
+    measure.wait()
+
+
+def _run(model_dir, use_compiled, workers):
+    ctx = mp.get_context("spawn")
+    loaded = ctx.Barrier(workers)
+    measure = ctx.Barrier(workers + 1)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_worker, args=(model_dir, use_compiled, loaded, measure, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    rows = [results.get() for _ in range(workers)]
+    measure.wait()
+    for process in processes:
+        process.join()
+    
+    n = len(rows)
+    return tuple(sum(row[i] for row in rows) / n for i in range(4))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", default="models")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    
+    print(f"\n{args.workers} workers, averages per worker")
+    print(f"{'format':>10} | {'startup s':>9} | {'RSS MB':>8} | {'PSS MB':>8} | {'USS MB':>8}")
+    print("-" * 56)
+    for label, use_compiled in (("pickle", False), ("mmap", True)):
+        startup, rss, pss, uss = _run(args.model_dir, use_compiled, args.workers)
+        print(f"{label:>10} | {startup:>9.2f} | {rss / 1024:>8.1f} | {pss / 1024:>8.1f} | {uss / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Customer list paging: OFFSET vs cursor, exact COUNT vs cached estimate
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_pagination [--customers 7000 1000000] [--db /tmp/aura_bench_pages.db]
+
+Uses the database layout of bench_customer_lists and times a 100-row
+/api/customers/all/list page at increasing depth, by OFFSET
+(get_customers_with_predictions) and by cursor (get_customers_page, both
+sort orders), plus the page's total count.
+"""
+import argparse
+import os
+import time
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache
+from app.core.pagination import encode_cursor
+from app.repositories.customer_repository import CustomerRepository
+from benchmarks.bench_customer_lists import _build
+
+PAGE_SIZE = 100
+
+
+def _best_ms(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, nargs="+", default=[7_000, 1_000_000])
+    parser.add_argument("--db", default="/tmp/aura_bench_pages.db")
+    args = parser.parse_args()
+
+    print(f"\n{'customers':>9} | {'depth':>6} | {'OFFSET ms':>9} | {'cursor ms':>9} | {'risk cursor ms':>14}")
+    print("-" * 60)
+    for n_customers in args.customers:
+        engine = _build(args.db, n_customers)
+        with Session(bind=engine) as db:
+            repo = CustomerRepository(db)
+            for depth in (0.0, 0.5, 0.99):
+                skip = int(n_customers * depth)
+                # Cursors pointing at the same depth
+                last_id = f"C{skip - 1:07d}" if skip else None
+                id_cursor = encode_cursor("customer_id", [last_id]) if last_id else None
+                risk_cursor = encode_cursor("risk", [1.0 - depth, "C9999999"]) if skip else None
+
+                offset_ms = _best_ms(lambda: repo.get_customers_with_predictions(skip=skip, limit=PAGE_SIZE))
+                cursor_ms = _best_ms(lambda: repo.get_customers_page(cursor=id_cursor, limit=PAGE_SIZE))
+                risk_ms = _best_ms(lambda: repo.get_customers_page(cursor=risk_cursor, limit=PAGE_SIZE, sort="risk"))
+                print(f"{n_customers:>9,} | {depth:>6.0%} | {offset_ms:>9.2f} | {cursor_ms:>9.2f} | {risk_ms:>14.2f}")
+
+            exact_ms = _best_ms(lambda: repo.count_customers(exact=True))
+            cache.clear()
+            start = time.perf_counter()
+            estimate = repo.count_customers(exact=False)
+            estimate_ms = (time.perf_counter() - start) * 1e3
+            cached_ms = _best_ms(lambda: repo.count_customers(exact=False))
+            print(f"{'':>9} | total: exact COUNT {exact_ms:.2f} ms, estimate {estimate_ms:.2f} ms "
+                  f"({estimate:,}), cached {cached_ms:.3f} ms")
+        engine.dispose()
+    os.remove(args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+ROI surface for the simulation page: one /roi call per grid point vs one /roi/sweep call
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_roi_sweep [--customers 7000 1000000] [--db /tmp/aura_bench_sweep.db]
+
+Builds a SQLite database with N customers and one latest prediction each
+(see bench_customer_lists) and times the handler work (without HTTP) of
+computing a threshold x budget ROI grid:
+- per point: simulate_roi for every (threshold, budget) combination, as
+  the simulation page had to submit them
+- sweep: one sweep_roi call for the whole grid
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.api.simulation import SimulationRequest, SimulationSweepRequest, simulate_roi, sweep_roi
+from app.repositories.risk_rollup import rebuild_risk_rollup
+from benchmarks.bench_customer_lists import _build
+
+GRIDS = [(21, 10), (101, 50)]
+# Per-point runs past this many points are extrapolated from a sample
+MAX_POINT_CALLS = 210
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, nargs="+", default=[7_000, 1_000_000])
+    parser.add_argument("--db", default="/tmp/aura_bench_sweep.db")
+    args = parser.parse_args()
+
+    print(f"\n{'customers':>9} | {'grid':>8} | {'per point s':>11} | {'sweep ms':>8} | {'speedup':>8}")
+    print("-" * 58)
+    for n_customers in args.customers:
+        engine = _build(args.db, n_customers)
+        with Session(bind=engine) as db:
+            rebuild_risk_rollup(db)
+            db.commit()
+            for threshold_steps, budget_steps in GRIDS:
+                thresholds = np.linspace(0.0, 1.0, threshold_steps)
+                budgets = np.linspace(10_000, 500_000, budget_steps)
+                points = [(t, b) for t in thresholds for b in budgets]
+                sample = points[::max(1, len(points) // MAX_POINT_CALLS)]
+
+                start = time.perf_counter()
+                for threshold, budget in sample:
+                    simulate_roi.__wrapped__(
+                        SimulationRequest(risk_threshold=threshold, campaign_budget=budget), db
+                    )
+                point_seconds = (time.perf_counter() - start) / len(sample) * len(points)
+
+                request = SimulationSweepRequest(
+                    threshold_steps=threshold_steps, budget_min=10_000, budget_max=500_000, budget_steps=budget_steps
+                )
+                sweep_seconds = float("inf")
+                for _ in range(3):
+                    start = time.perf_counter()
+                    sweep_roi.__wrapped__(request, db)
+                    sweep_seconds = min(sweep_seconds, time.perf_counter() - start)
+
+                grid = f"{threshold_steps}x{budget_steps}"
+                print(f"{n_customers:>9,} | {grid:>8} | {point_seconds:>11.2f} | {sweep_seconds * 1e3:>8.1f} | "
+                      f"{point_seconds / sweep_seconds:>7.0f}x")
+        engine.dispose()
+    os.remove(args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Full-base scoring: per-customer predict + save vs the resumable ScoringJob
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_scoring_job [--rows 200000] [--loop-rows 5000] [--chunk 5000]
+                                           [--workers 1,2,4,8] [--dir /tmp]
+
+Loads --rows customers (the Telco dataset repeated with unique IDs) into
+a fresh SQLite file, then times:
+- the previous predict_all_customers.py loop (predictor.predict and
+  save_prediction per customer), on the first --loop-rows customers
+- ScoringJob over all customers with each --workers process count
+- ScoringJob stopped half way (as if killed) and resumed by a new job
+"""
+import argparse
+import os
+
+from sqlalchemy.orm import Session
+
+from app.db.models import Customer, PredictionRecord
+from app.repositories.customer_repository import CustomerRepository
+from app.services.bulk_loader import load_customers_csv
+from app.services.churn_predictor import ChurnPredictor
+from app.services.scoring_job import ScoringJob
+from benchmarks.bench_bulk_load import _fresh_engine, _timed, _write_csv
+
+
+def _loop_scoring(engine, predictor: ChurnPredictor, n_rows: int):
+    """Previous predict_all_customers.py implementation"""
+    with Session(bind=engine) as db:
+        repo = CustomerRepository(db)
+        for customer in db.query(Customer).order_by(Customer.customer_id).limit(n_rows):
+            customer_data = {column.key: getattr(customer, column.key) for column in Customer.__table__.columns}
+            prediction = predictor.predict(customer_data)
+            repo.save_prediction(
+                customer_id=customer.customer_id,
+                risk_score=prediction["churn_probability"],
+                risk_level=prediction["risk_level"],
+                model_name=prediction["model_version"]
+            )
+
+
+def _reset(engine):
+    with engine.begin() as connection:
+        for table in ("customer_latest_prediction", "predictions", "scoring_runs"):
+            connection.exec_driver_sql(f"DELETE FROM {table}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--loop-rows", type=int, default=5_000)
+    parser.add_argument("--chunk", type=int, default=5_000)
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    parser.add_argument("--dir", default="/tmp")
+    args = parser.parse_args()
+
+    csv_path = os.path.join(args.dir, "aura_bench_scoring.csv")
+    db_path = os.path.join(args.dir, "aura_bench_scoring.db")
+    _write_csv(csv_path, args.rows)
+    engine = _fresh_engine(db_path)
+    load_customers_csv(engine, csv_path)
+    predictor = ChurnPredictor()
+
+    def session_factory():
+        return Session(bind=engine)
+
+    def full_run(workers: int):
+        return lambda: ScoringJob(predictor, session_factory, args.chunk, verbose=False, workers=workers).run()
+
+    def resumed():
+        ScoringJob(predictor, session_factory, args.chunk, verbose=False).run(max_customers=args.rows // 2)
+        ScoringJob(predictor, session_factory, args.chunk, verbose=False).run()
+
+    results = []
+    loop_seconds = _timed(lambda: _loop_scoring(engine, predictor, args.loop_rows))
+    results.append(("predict + save per customer", args.loop_rows, loop_seconds))
+    _reset(engine)
+    for workers in [int(n) for n in args.workers.split(",")]:
+        _reset(engine)
+        results.append((f"ScoringJob, {workers} worker(s)", args.rows, _timed(full_run(workers))))
+    _reset(engine)
+    results.append(("ScoringJob, killed + resumed", args.rows, _timed(resumed)))
+    with Session(bind=engine) as db:
+        assert db.query(PredictionRecord).count() == args.rows
+    engine.dispose()
+
+    print(f"\n{'scoring':<34} | {'rows':>9} | {'seconds':>8} | {'rows/s':>9}")
+    print("-" * 70)
+    for name, rows, seconds in results:
+        print(f"{name:<34} | {rows:>9,} | {seconds:>8.1f} | {rows / seconds:>9,.0f}")
+
+    for path in (csv_path, db_path):
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
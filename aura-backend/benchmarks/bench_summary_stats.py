@@ -0,0 +1,106 @@
+"""
+Dashboard summary: ORM objects + Python passes vs one aggregate query vs the risk rollup
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_summary_stats [--customers 7000 1000000] [--db /tmp/aura_bench_summary.db]
+
+Builds a SQLite database with N customers and one latest prediction each
+(see bench_customer_lists) and times computing the summary statistics:
+- ORM: the original implementation, which loaded every latest prediction
+  as an ORM object and counted and summed them in Python
+- aggregate: one COUNT / SUM(CASE) / AVG query over the latest predictions
+- rollup: get_summary_stats(), which reads the risk_rollup segments
+Peak memory is the Python allocation peak (tracemalloc) during one call.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import Customer, CustomerLatestPrediction
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.risk_rollup import rebuild_risk_rollup
+from benchmarks.bench_customer_lists import _build
+
+
+def _orm_summary(db: Session):
+    """Original get_summary_stats body (statistics only)"""
+    total_customers = db.query(func.count(Customer.customer_id)).scalar() or 0
+    latest_predictions = db.query(CustomerLatestPrediction).all()
+    high = sum(1 for p in latest_predictions if p.risk_level == 'High')
+    medium = sum(1 for p in latest_predictions if p.risk_level == 'Medium')
+    low = sum(1 for p in latest_predictions if p.risk_level == 'Low')
+    average = sum(float(p.risk_score) for p in latest_predictions) / len(latest_predictions)
+    return total_customers, high, medium, low, round(average, 2)
+
+
+def _aggregate_summary(db: Session):
+    """Statistics as one aggregate query over customer_latest_prediction"""
+    latest = CustomerLatestPrediction
+
+    def level_count(level: str):
+        return func.coalesce(func.sum(case((latest.risk_level == level, 1), else_=0)), 0)
+
+    total_customers, high, medium, low, average = db.query(
+        select(func.count(Customer.customer_id)).scalar_subquery(),
+        level_count("High"),
+        level_count("Medium"),
+        level_count("Low"),
+        func.avg(latest.risk_score)
+    ).one()
+    return total_customers, high, medium, low, round(average, 2)
+
+
+def _rollup_summary(db: Session):
+    stats = CustomerRepository(db).get_summary_stats()
+    distribution = stats.risk_distribution
+    return (
+        stats.total_customers, distribution["high"], distribution["medium"], distribution["low"], stats.average_risk
+    )
+
+
+def _measure(engine, fn, repeat: int = 3):
+    """Best-of-repeat seconds, peak traced bytes and the result of fn(session)"""
+    best = float("inf")
+    for _ in range(repeat):
+        with Session(bind=engine) as db:
+            start = time.perf_counter()
+            result = fn(db)
+            best = min(best, time.perf_counter() - start)
+    with Session(bind=engine) as db:
+        tracemalloc.start()
+        fn(db)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, nargs="+", default=[7_000, 1_000_000])
+    parser.add_argument("--db", default="/tmp/aura_bench_summary.db")
+    args = parser.parse_args()
+
+    print(f"\n{'customers':>9} | {'ORM ms':>8} | {'ORM peak MiB':>12} | {'aggregate ms':>12} | "
+          f"{'rollup ms':>9} | {'rollup peak KiB':>15}")
+    print("-" * 82)
+    for n_customers in args.customers:
+        engine = _build(args.db, n_customers)
+        with Session(bind=engine) as db:
+            rebuild_risk_rollup(db)
+            db.commit()
+        orm_seconds, orm_peak, orm_result = _measure(engine, _orm_summary)
+        aggregate_seconds, _, aggregate_result = _measure(engine, _aggregate_summary)
+        rollup_seconds, rollup_peak, rollup_result = _measure(engine, _rollup_summary)
+        assert orm_result == aggregate_result == rollup_result, (orm_result, aggregate_result, rollup_result)
+        print(f"{n_customers:>9,} | {orm_seconds * 1e3:>8.1f} | {orm_peak / 2**20:>12.1f} | "
+              f"{aggregate_seconds * 1e3:>12.1f} | {rollup_seconds * 1e3:>9.2f} | {rollup_peak / 2**10:>15.1f}")
+        engine.dispose()
+    os.remove(args.db)
+
+
+if __name__ == "__main__":
+    main()
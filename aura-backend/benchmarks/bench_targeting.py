@@ -0,0 +1,79 @@
+"""
+ROI targeting: customers / LTV above a risk threshold
+
+Usage (from aura-backend/):
+    python -m benchmarks.bench_targeting [--customers 7000 1000000] [--db /tmp/aura_bench_targeting.db]
+
+Builds a SQLite database with N customers and one latest prediction each
+(see bench_customer_lists) and, for several thresholds, times:
+- scan: COUNT / SUM(LTV) over customer_latest_prediction joined with
+  customers WHERE risk_score >= threshold (the exact answer)
+- histogram: get_targeting_totals(), suffix sums of the risk_histogram
+  bins plus the customers of the threshold's own bin
+and the error of the previous estimate from the three risk level counts.
+"""
+import argparse
+import os
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import Customer, CustomerLatestPrediction
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.risk_rollup import CUSTOMER_LTV, rebuild_risk_rollup
+from app.services.roi_simulator import ROISimulator
+from benchmarks.bench_customer_lists import _build
+
+THRESHOLDS = [0.3, 0.55, 0.7, 0.8234]
+
+
+def _scan(db: Session, threshold: float):
+    count, ltv_sum = db.execute(
+        select(func.count(), func.coalesce(func.sum(CUSTOMER_LTV), 0.0))
+        .select_from(CustomerLatestPrediction)
+        .join(Customer, Customer.customer_id == CustomerLatestPrediction.customer_id)
+        .where(CustomerLatestPrediction.risk_score >= threshold)
+    ).one()
+    return count, ltv_sum
+
+
+def _best(fn, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, nargs="+", default=[7_000, 1_000_000])
+    parser.add_argument("--db", default="/tmp/aura_bench_targeting.db")
+    args = parser.parse_args()
+
+    print(f"\n{'customers':>9} | {'threshold':>9} | {'targeted':>9} | {'scan ms':>8} | "
+          f"{'histogram ms':>12} | {'band estimate error':>19}")
+    print("-" * 84)
+    for n_customers in args.customers:
+        engine = _build(args.db, n_customers)
+        with Session(bind=engine) as db:
+            rebuild_risk_rollup(db)
+            db.commit()
+            repo = CustomerRepository(db)
+            distribution = repo.get_summary_stats().risk_distribution
+            for threshold in THRESHOLDS:
+                scan_seconds, (count, ltv_sum) = _best(lambda: _scan(db, threshold))
+                histogram_seconds, totals = _best(lambda: repo.get_targeting_totals(threshold))
+                assert totals[0] == count and abs(totals[1] - ltv_sum) < 1e-6 * max(ltv_sum, 1.0), (totals, count)
+                estimate = ROISimulator()._calculate_targeted_customers(threshold, distribution)
+                error = (estimate - count) / count * 100 if count else 0.0
+                print(f"{n_customers:>9,} | {threshold:>9} | {count:>9,} | {scan_seconds * 1e3:>8.1f} | "
+                      f"{histogram_seconds * 1e3:>12.2f} | {error:>+18.2f}%")
+        engine.dispose()
+    os.remove(args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Synthetic TrustedModel customers for benchmarks
+
+Values are drawn from the same vocabularies as the Telco CSV so the
+encoder and model see realistic inputs.
+"""
+import numpy as np
+import pandas as pd
+
+GENDERS = ["Female", "Male"]
+YES_NO = ["No", "Yes"]
+PHONE_OPTIONS = ["No", "No phone service", "Yes"]
+INTERNET_SERVICES = ["DSL", "Fiber optic", "No"]
+INTERNET_OPTIONS = ["No", "No internet service", "Yes"]
+CONTRACTS = ["Month-to-month", "One year", "Two year"]
+PAYMENT_METHODS = [
+    "Bank transfer (automatic)",
+    "Credit card (automatic)",
+    "Electronic check",
+    "Mailed check",
+]
+
+
+def make_customers(n: int, seed: int = 42, id_offset: int = 0) -> pd.DataFrame:
+    """
+    Generate n synthetic customers as a DataFrame with Customer column names
+    
+    Args:
+        n: Number of customers
+        seed: Random seed
+        id_offset: First numeric suffix used for customer_id
+    """
+    rng = np.random.default_rng(seed)
+    
+    def pick(options):
+        return np.asarray(options, dtype=object)[rng.integers(0, len(options), n)]
+    
+    tenure = rng.integers(0, 73, n)
+    monthly_charges = np.round(rng.uniform(18.0, 120.0, n), 2)
+    
+    return pd.DataFrame({
+        "customer_id": [f"SYN-{i:08d}" for i in range(id_offset, id_offset + n)],
+        "gender": pick(GENDERS),
+        "senior_citizen": rng.integers(0, 2, n),
+        "partner": pick(YES_NO),
+        "dependents": pick(YES_NO),
+        "tenure": tenure,
+        "contract": pick(CONTRACTS),
+        "paperless_billing": pick(YES_NO),
+        "payment_method": pick(PAYMENT_METHODS),
+        "monthly_charges": monthly_charges,
+        "total_charges": np.round(monthly_charges * tenure, 2),
+        "phone_service": pick(YES_NO),
+        "multiple_lines": pick(PHONE_OPTIONS),
+        "internet_service": pick(INTERNET_SERVICES),
+        "online_security": pick(INTERNET_OPTIONS),
+        "online_backup": pick(INTERNET_OPTIONS),
+        "device_protection": pick(INTERNET_OPTIONS),
+        "tech_support": pick(INTERNET_OPTIONS),
+        "streaming_tv": pick(INTERNET_OPTIONS),
+        "streaming_movies": pick(INTERNET_OPTIONS),
+        "churn": pick(YES_NO),
+    })
@@ -0,0 +1,55 @@
+"""
+Export the trained Voting Classifier as memory-mappable NumPy arrays
+
+Reads models/best_model.pkl and models/scaler.pkl and writes
+models/compiled/ (see app/services/tree_ensemble.py). ChurnPredictor
+prefers the compiled export when it matches best_model.pkl.
+
+Usage (from aura-backend/):
+    python export_model.py [--model-dir models]
+"""
+import argparse
+import os
+import pickle
+
+import numpy as np
+
+from app.services.tree_ensemble import (
+    COMPILED_DIR, CompiledVotingModel, export_voting_classifier, file_sha256
+)
+
+
+def export_model(model_dir: str = "models") -> str:
+    """
+    Compile best_model.pkl in model_dir and verify the export
+
+    Returns:
+        Path of the compiled model directory
+    """
+    model_file = os.path.join(model_dir, "best_model.pkl")
+    with open(model_file, "rb") as f:
+        model = pickle.load(f)
+    with open(os.path.join(model_dir, "scaler.pkl"), "rb") as f:
+        scaler = pickle.load(f)
+    
+    out_dir = os.path.join(model_dir, COMPILED_DIR)
+    export_voting_classifier(model, scaler, out_dir, source_sha256=file_sha256(model_file))
+    
+    # Check the export against scikit-learn on random scaled inputs
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, model.n_features_in_))
+    expected = model.predict_proba(X)[:, 1]
+    actual = CompiledVotingModel.load(out_dir).predict_proba(X)[:, 1]
+    max_error = float(np.max(np.abs(expected - actual)))
+    if max_error > 1e-9:
+        raise ValueError(f"Compiled model differs from scikit-learn by {max_error:.2e}")
+    
+    print(f"✅ Compiled model written to {out_dir} (max |Δp| vs sklearn: {max_error:.1e})")
+    return out_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export best_model.pkl as memory-mappable arrays")
+    parser.add_argument("--model-dir", default="models")
+    args = parser.parse_args()
+    export_model(args.model_dir)
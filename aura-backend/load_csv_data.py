@@ -1,52 +1,30 @@
 """Load TrustedModel CSV data into database"""
-import pandas as pd
 from app.db.base import SessionLocal, engine, Base
-from app.db.models import Customer, PredictionRecord
-from datetime import datetime
+from app.repositories.customer_repository import CustomerRepository
+from app.services.bulk_loader import load_customers_csv, read_customer_chunks
 import random
 
+CSV_PATH = "TrustedModel/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
 # Create tables
 Base.metadata.create_all(bind=engine)
 
-# Load CSV
-df = pd.read_csv("TrustedModel/WA_Fn-UseC_-Telco-Customer-Churn.csv")
-
 # Take first 100 customers
-df = df.head(100)
+MAX_ROWS = 100
 
 db = SessionLocal()
 
 try:
-    for idx, row in df.iterrows():
-        # Handle TotalCharges (can be empty string)
-        total_charges = float(row['TotalCharges']) if row['TotalCharges'] != ' ' else 0.0
-        
-        customer = Customer(
-            customer_id=row['customerID'],
-            gender=row['gender'],
-            senior_citizen=int(row['SeniorCitizen']),
-            partner=row['Partner'],
-            dependents=row['Dependents'],
-            tenure=int(row['tenure']),
-            contract=row['Contract'],
-            paperless_billing=row['PaperlessBilling'],
-            payment_method=row['PaymentMethod'],
-            monthly_charges=float(row['MonthlyCharges']),
-            total_charges=total_charges,
-            phone_service=row['PhoneService'],
-            multiple_lines=row['MultipleLines'],
-            internet_service=row['InternetService'],
-            online_security=row['OnlineSecurity'],
-            online_backup=row['OnlineBackup'],
-            device_protection=row['DeviceProtection'],
-            tech_support=row['TechSupport'],
-            streaming_tv=row['StreamingTV'],
-            streaming_movies=row['StreamingMovies'],
-            churn=row['Churn']
-        )
-        db.add(customer)
-        
-        # Create prediction record
+    loaded = load_customers_csv(engine, CSV_PATH, max_rows=MAX_ROWS)
+    customer_ids = [
+        customer_id
+        for chunk in read_customer_chunks(CSV_PATH, max_rows=MAX_ROWS)
+        for customer_id in chunk["customer_id"]
+    ]
+    
+    # Create prediction records
+    predictions = []
+    for customer_id in customer_ids:
         risk_score = random.uniform(0, 1)
         if risk_score >= 0.7:
             risk_level = "high"
@@ -54,20 +32,10 @@ try:
             risk_level = "medium"
         else:
             risk_level = "low"
-            
-        pred_record = PredictionRecord(
-            customer_id=row['customerID'],
-            churn_probability=risk_score,
-            risk_score=risk_score,
-            risk_level=risk_level,
-            predicted_churn="Yes" if risk_score >= 0.5 else "No",
-            model_name="Voting Classifier",
-            timestamp=datetime.utcnow()
-        )
-        db.add(pred_record)
+        predictions.append({"customer_id": customer_id, "risk_score": risk_score, "risk_level": risk_level})
     
-    db.commit()
-    print(f"✅ Loaded {len(df)} customers from CSV")
+    CustomerRepository(db).save_predictions(predictions)
+    print(f"✅ Loaded {loaded} customers from CSV")
 except Exception as e:
     print(f"❌ Error: {e}")
     db.rollback()
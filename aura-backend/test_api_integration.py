@@ -118,7 +118,7 @@ def test_database():
             return False
         
         # Get summary stats
-        stats = repo.get_summary_stats(use_cache=False)
+        stats = repo.get_summary_stats()
         print(f"\n✅ Dashboard Statistics:")
         print(f"   Total Customers: {stats.total_customers}")
         print(f"   High Risk Count: {stats.high_risk_count}")
@@ -0,0 +1,129 @@
+"""Shared fixtures: a small Voting Classifier trained like train_trustedmodel.py"""
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier, VotingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.cache import cache
+from app.core.targeting_snapshot import targeting_snapshot
+from app.db.base import Base
+from app.db.models import Customer
+from app.repositories.risk_rollup import rebuild_risk_rollup
+from app.services.churn_predictor import ChurnPredictor
+from app.services.feature_encoder import FEATURE_SPECS, FeatureEncoder
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TELCO_CSV = os.path.join(BACKEND_DIR, "TrustedModel", "WA_Fn-UseC_-Telco-Customer-Churn.csv")
+
+# Customer field name for each training column
+FIELD_BY_COLUMN = {spec.name: spec.key for spec in FEATURE_SPECS}
+NUMERIC_INDICES = ChurnPredictor.NUMERIC_INDICES
+
+
+@pytest.fixture(scope="session")
+def telco_customers() -> pd.DataFrame:
+    """Telco dataset with customer field names (as stored in the database)"""
+    df = pd.read_csv(TELCO_CSV)
+    df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce").fillna(0.0)
+    df = df.rename(columns={"customerID": "customer_id", **FIELD_BY_COLUMN})
+    return df
+
+
+@pytest.fixture(scope="session")
+def training_data(telco_customers):
+    """Encoded (unscaled) feature matrix, labels and the fitted scaler"""
+    X, errors = FeatureEncoder().encode(telco_customers)
+    assert not errors
+    y = (telco_customers["Churn"] == "Yes").to_numpy(dtype=int)
+    scaler = StandardScaler().fit(X[:, NUMERIC_INDICES])
+    X_scaled = X.copy()
+    X_scaled[:, NUMERIC_INDICES] = scaler.transform(X[:, NUMERIC_INDICES])
+    return X_scaled, y, scaler
+
+
+def train_voting_classifier(X, y, n_trees: int = 60, weights=None, max_leaf_nodes=30) -> VotingClassifier:
+    """Soft-voting rf/gb/lr ensemble with the production hyperparameters, fewer trees"""
+    voting = VotingClassifier(
+        estimators=[
+            ("rf", RandomForestClassifier(
+                n_estimators=n_trees, random_state=50, max_features="sqrt", max_leaf_nodes=max_leaf_nodes
+            )),
+            ("gb", GradientBoostingClassifier(n_estimators=n_trees, random_state=1)),
+            ("lr", LogisticRegression(random_state=1, max_iter=1000)),
+        ],
+        voting="soft",
+        weights=weights
+    )
+    return voting.fit(X, y)
+
+
+@pytest.fixture(scope="session")
+def voting_model(training_data):
+    X, y, scaler = training_data
+    return train_voting_classifier(X, y), scaler
+
+
+@pytest.fixture(scope="session")
+def model_dir(tmp_path_factory, voting_model):
+    """Model directory laid out like aura-backend/models"""
+    model, scaler = voting_model
+    path = tmp_path_factory.mktemp("models")
+    with open(path / "best_model.pkl", "wb") as f:
+        pickle.dump(model, f)
+    with open(path / "scaler.pkl", "wb") as f:
+        pickle.dump(scaler, f)
+    with open(path / "feature_names.pkl", "wb") as f:
+        pickle.dump([spec.name for spec in FEATURE_SPECS], f)
+    metadata = {
+        "model_name": "Voting Classifier",
+        "accuracy": 0.0,
+        "roc_auc": 0.0,
+        "features": [spec.name for spec in FEATURE_SPECS],
+        "categorical_vocabularies": {
+            spec.name: list(spec.vocabulary) for spec in FEATURE_SPECS if spec.vocabulary is not None
+        },
+    }
+    with open(path / "model_metadata.json", "w") as f:
+        json.dump(metadata, f)
+    return str(path)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+@pytest.fixture
+def db_session():
+    """Session on a fresh in-memory SQLite database with all tables"""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    cache.clear()
+    targeting_snapshot.clear()
+    with Session(bind=engine) as session:
+        yield session
+    cache.clear()
+    targeting_snapshot.clear()
+    engine.dispose()
+
+
+@pytest.fixture
+def seeded_db(db_session, telco_customers):
+    """db_session holding the first 200 Telco customers"""
+    rows = telco_customers.head(200).drop(columns=["Churn"]).to_dict("records")
+    db_session.add_all(Customer(**row, churn="No") for row in rows)
+    db_session.flush()
+    rebuild_risk_rollup(db_session)
+    db_session.commit()
+    return db_session
@@ -0,0 +1,70 @@
+"""Bulk CSV loader: same rows as the CSV, idempotent re-ingest"""
+import io
+
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from app.db.models import Customer
+from app.services.bulk_loader import CSV_COLUMNS, load_customers_csv, read_customer_chunks
+from tests.conftest import TELCO_CSV
+
+
+def _table(session) -> pd.DataFrame:
+    columns = list(CSV_COLUMNS.values())
+    rows = session.execute(text(f"SELECT {', '.join(columns)} FROM customers ORDER BY customer_id")).all()
+    return pd.DataFrame(rows, columns=columns)
+
+
+def test_chunks_clean_total_charges():
+    chunks = list(read_customer_chunks(TELCO_CSV, chunk_rows=1000))
+    assert [len(chunk) for chunk in chunks[:-1]] == [1000] * (len(chunks) - 1)
+    df = pd.concat(chunks)
+    assert len(df) == 7043 and list(df.columns) == list(CSV_COLUMNS.values())
+    assert df.total_charges.dtype == float and not df.total_charges.isna().any()
+    assert (df.loc[df.tenure == 0, "total_charges"] == 0.0).all()
+
+
+def test_load_matches_csv(db_session, telco_customers):
+    engine = db_session.get_bind()
+    assert load_customers_csv(engine, TELCO_CSV, chunk_rows=2000) == 7043
+
+    expected = telco_customers.rename(columns={"Churn": "churn"})[list(CSV_COLUMNS.values())]
+    expected = expected.sort_values("customer_id").reset_index(drop=True)
+    pd.testing.assert_frame_equal(_table(db_session), expected, check_dtype=False)
+
+    # Secondary indexes are rebuilt after the initial load
+    index_names = {index["name"] for index in inspect(engine).get_indexes("customers")}
+    assert {index.name for index in Customer.__table__.indexes} <= index_names
+
+
+def test_reingest_is_idempotent_and_updates_changed_rows(db_session):
+    engine = db_session.get_bind()
+    csv_text = open(TELCO_CSV).read()
+    load_customers_csv(engine, io.StringIO(csv_text))
+    before = _table(db_session)
+    db_session.execute(text("UPDATE customers SET updated_at = '2000-01-01 00:00:00'"))
+    db_session.commit()
+
+    # Same file plus one changed and one new customer
+    header, first, *rest = csv_text.splitlines()
+    changed = first.replace(",Month-to-month,", ",Two year,")
+    new = first.replace(first.split(",")[0], "9999-NEWCU", 1)
+    assert load_customers_csv(engine, io.StringIO("\n".join([header, changed, *rest, new]))) == 7044
+
+    after = _table(db_session)
+    assert len(after) == 7044
+    customer_id = first.split(",")[0]
+    assert after.set_index("customer_id").loc[customer_id, "contract"] == "Two year"
+    unchanged = after[~after.customer_id.isin([customer_id, "9999-NEWCU"])].reset_index(drop=True)
+    pd.testing.assert_frame_equal(unchanged, before[before.customer_id != customer_id].reset_index(drop=True))
+
+    # Only the changed row is rewritten
+    rewritten = db_session.execute(
+        text("SELECT customer_id FROM customers WHERE updated_at != '2000-01-01 00:00:00'")
+    ).scalars().all()
+    assert sorted(rewritten) == sorted([customer_id, "9999-NEWCU"])
+
+
+def test_max_rows(db_session):
+    assert load_customers_csv(db_session.get_bind(), TELCO_CSV, chunk_rows=30, max_rows=100) == 100
+    assert db_session.execute(text("SELECT count(*) FROM customers")).scalar() == 100
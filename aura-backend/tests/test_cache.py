@@ -0,0 +1,94 @@
+"""Sharded LRU + TTL cache"""
+import threading
+import time
+
+from app.core.cache import InMemoryCache
+
+
+def test_get_set_delete():
+    cache = InMemoryCache(num_shards=4)
+    cache.set("customer:1", "a")
+    assert cache.get("customer:1") == "a"
+    cache.set("customer:1", "b")
+    assert cache.get("customer:1") == "b"
+    cache.delete("customer:1")
+    assert cache.get("customer:1") is None
+    assert cache.size() == 0
+
+
+def test_lru_eviction_per_shard():
+    cache = InMemoryCache(num_shards=1, max_entries=3)
+    for i in range(3):
+        cache.set(f"k{i}", i)
+    cache.get("k0")  # k1 is now least recently used
+    cache.set("k3", 3)
+
+    assert cache.get("k1") is None
+    assert [cache.get(f"k{i}") for i in (0, 2, 3)] == [0, 2, 3]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_bound():
+    cache = InMemoryCache(num_shards=1, max_entries=100, max_bytes=250, size_of=lambda value: 100)
+    for i in range(3):
+        cache.set(f"k{i}", i)
+    assert cache.size() == 2
+    assert cache.stats()["bytes"] == 200
+
+
+def test_ttl_expiry():
+    cache = InMemoryCache(num_shards=2)
+    cache.set("short", 1, ttl_seconds=0)
+    cache.set("long", 2, ttl_seconds=300)
+    time.sleep(0.01)
+
+    assert cache.get("short") is None
+    cache.set("short2", 3, ttl_seconds=0)
+    time.sleep(0.01)
+    cache.cleanup_expired()
+    assert cache.size() == 1
+    assert cache.get("long") == 2
+
+
+def test_overwrite_keeps_new_ttl():
+    cache = InMemoryCache(num_shards=1)
+    cache.set("k", 1, ttl_seconds=0)
+    cache.set("k", 2, ttl_seconds=300)
+    time.sleep(0.01)
+    cache.cleanup_expired()
+    assert cache.get("k") == 2
+
+
+def test_invalidate_pattern():
+    cache = InMemoryCache(num_shards=4)
+    for i in range(20):
+        cache.set(f"customer:{i}", i)
+    cache.set("summary_stats", "s")
+    cache.set("customers:list:1", "l")
+
+    cache.invalidate_pattern("customer:1")
+    assert cache.get("customer:1") is None and cache.get("customer:15") is None
+    assert cache.get("customer:2") == 2
+
+    cache.invalidate_pattern("customer:")
+    assert cache.size() == 2
+    cache.invalidate_pattern("summ")
+    assert cache.size() == 1 and cache.get("customers:list:1") == "l"
+
+
+def test_concurrent_access():
+    cache = InMemoryCache(num_shards=8, max_entries=500)
+
+    def worker(offset):
+        for i in range(2000):
+            key = f"customer:{(offset + i) % 1000}"
+            if cache.get(key) is None:
+                cache.set(key, i)
+
+    threads = [threading.Thread(target=worker, args=(n * 100,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.size() <= 8 * 63  # Per-shard bound: ceil(500 / 8)
@@ -0,0 +1,99 @@
+"""Customer search: SQL filters and sorting match filtering the data in Python"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.base import get_db
+from app.main import app
+from app.repositories.customer_repository import CustomerFilters, CustomerRepository
+
+
+@pytest.fixture
+def customers(seeded_db, telco_customers):
+    """Expected rows: the seeded customers with a risk score for four in five"""
+    repo = CustomerRepository(seeded_db)
+    df = telco_customers.head(200).copy()
+    df["risk_score"] = [(i * 37 % 100) / 100 if i % 5 else None for i in range(len(df))]
+    df["risk_level"] = df["risk_score"].map(
+        lambda score: None if score != score else "High" if score >= 0.7 else "Medium" if score >= 0.4 else "Low"
+    )
+    scored = df.dropna(subset=["risk_score"])
+    repo.save_predictions([
+        {"customer_id": row.customer_id, "risk_score": row.risk_score, "risk_level": row.risk_level}
+        for row in scored.itertuples()
+    ])
+    return df
+
+
+def _search_all(repo, filters=None, sort="customer_id", descending=False, page_size=13):
+    rows, cursor = repo.search_customers(filters, sort=sort, descending=descending, limit=page_size)
+    result = list(rows)
+    while cursor is not None:
+        rows, cursor = repo.search_customers(filters, sort=sort, descending=descending, cursor=cursor, limit=page_size)
+        result.extend(rows)
+    return result
+
+
+@pytest.mark.parametrize("filters, mask", [
+    (CustomerFilters(contracts=["Two year"]), lambda df: df.contract == "Two year"),
+    (
+        CustomerFilters(contracts=["Month-to-month"], internet_services=["Fiber optic", "DSL"], tenure_max=12),
+        lambda df: (df.contract == "Month-to-month") & df.internet_service.isin(["Fiber optic", "DSL"]) & (df.tenure <= 12)
+    ),
+    (
+        CustomerFilters(tenure_min=24, tenure_max=48, risk_levels=["High", "Medium"]),
+        lambda df: df.tenure.between(24, 48) & df.risk_level.isin(["High", "Medium"])
+    ),
+    (CustomerFilters(risk_min=0.2, risk_max=0.6), lambda df: df.risk_score.between(0.2, 0.6)),
+    (CustomerFilters(customer_id_prefix="7"), lambda df: df.customer_id.str.startswith("7")),
+])
+def test_filters_match_python(seeded_db, customers, filters, mask):
+    repo = CustomerRepository(seeded_db)
+    expected = sorted(customers[mask(customers)].customer_id)
+    assert expected
+    assert [row.customer_id for row in _search_all(repo, filters)] == expected
+    assert repo.count_search_results(filters) == len(expected)
+
+
+@pytest.mark.parametrize("sort, column", [("risk", "risk_score"), ("tenure", "tenure"), ("monthly_charges", "monthly_charges")])
+@pytest.mark.parametrize("descending", [False, True])
+def test_sorted_pages_follow_sort_key(seeded_db, customers, sort, column, descending):
+    rows = _search_all(CustomerRepository(seeded_db), sort=sort, descending=descending)
+    expected = customers.dropna(subset=[column]).sort_values(
+        [column, "customer_id"], ascending=not descending
+    ).customer_id.tolist()
+    assert [row.customer_id for row in rows] == expected
+
+
+def test_prefix_search_is_exact(seeded_db, customers):
+    repo = CustomerRepository(seeded_db)
+    customer_id = customers.customer_id.iloc[0]
+    rows, _ = repo.search_customers(CustomerFilters(customer_id_prefix=customer_id))
+    assert [row.customer_id for row in rows] == [customer_id]
+    rows, _ = repo.search_customers(CustomerFilters(customer_id_prefix=customer_id.lower() + "%"))
+    assert rows == []
+
+
+def test_search_endpoint(seeded_db, customers):
+    app.dependency_overrides[get_db] = lambda: seeded_db
+    try:
+        client = TestClient(app)
+        params = {
+            "contract": ["Month-to-month", "One year"], "risk_level": "High",
+            "sort": "risk", "order": "desc", "page_size": 5, "include_total": True
+        }
+        first = client.get("/api/customers/search/list", params=params).json()
+        expected = customers[
+            customers.contract.isin(["Month-to-month", "One year"]) & (customers.risk_level == "High")
+        ]
+        assert first["total"] == len(expected)
+        scores = [c["risk_score"] for c in first["customers"]]
+        assert scores == sorted(scores, reverse=True) and scores[0] == expected.risk_score.max()
+
+        second = client.get("/api/customers/search/list", params={**params, "cursor": first["next_cursor"]}).json()
+        assert second["customers"][0]["risk_score"] <= scores[-1]
+
+        mismatched = client.get("/api/customers/search/list", params={"cursor": first["next_cursor"]})
+        assert mismatched.status_code == 400
+        assert client.get("/api/customers/search/list", params={"sort": "name"}).status_code == 422
+    finally:
+        app.dependency_overrides.pop(get_db, None)
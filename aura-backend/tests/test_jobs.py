@@ -0,0 +1,174 @@
+"""Background job runner: persisted state, progress, cancellation, restart"""
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.jobs import JobRunner
+from app.db.base import Base
+from app.db.models import BackgroundJob, Customer, PredictionRecord
+from app.services import admin_jobs
+from app.services.bulk_loader import load_customers_csv
+from app.services.churn_predictor import ChurnPredictor
+from tests.conftest import TELCO_CSV
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Sessions on a SQLite file: jobs and the test use separate connections"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield lambda: Session(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def make_runner(session_factory):
+    runners = []
+
+    def make(**handlers):
+        runner = JobRunner(session_factory, workers=1, poll_interval_seconds=0.05)
+        for kind, handler in handlers.items():
+            runner.register(kind, handler)
+        runners.append(runner)
+        return runner
+
+    yield make
+    for runner in runners:
+        runner.stop(wait=True)
+
+
+def _wait_for(runner, job_id, statuses=("completed", "failed", "cancelled"), timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = runner.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} still {job['status']}")
+
+
+def test_submit_returns_at_once_and_job_completes(make_runner):
+    release = threading.Event()
+
+    def handler(context, n):
+        context.report(step=1)
+        release.wait(10)
+        return {"doubled": n * 2}
+
+    runner = make_runner(double=handler)
+    runner.start()
+    job = runner.submit("double", n=21)
+    assert job["status"] == "queued"
+
+    running = _wait_for(runner, job["id"], ("running",))
+    assert running["started_at"] is not None
+    release.set()
+    done = _wait_for(runner, job["id"])
+    assert done["status"] == "completed"
+    assert done["result"] == {"doubled": 42}
+    assert done["progress"] == {"step": 1}
+    assert done["finished_at"] is not None
+
+
+def test_failed_job_keeps_error(make_runner):
+    def handler(context):
+        raise RuntimeError("CSV not found")
+
+    runner = make_runner(broken=handler)
+    runner.start()
+    job = _wait_for(runner, runner.submit("broken")["id"])
+    assert job["status"] == "failed"
+    assert job["error"] == "CSV not found"
+
+
+def test_unknown_kind_is_rejected(make_runner):
+    with pytest.raises(ValueError):
+        make_runner().submit("nope")
+
+
+def test_cancel_stops_running_job_at_next_report(make_runner):
+    steps = []
+
+    def handler(context):
+        for step in range(10_000):
+            steps.append(step)
+            context.report(step=step)
+            time.sleep(0.005)
+        return {"finished": True}
+
+    runner = make_runner(long=handler)
+    runner.start()
+    job_id = runner.submit("long")["id"]
+    _wait_for(runner, job_id, ("running",))
+    assert runner.cancel(job_id)["cancel_requested"] is True
+
+    job = _wait_for(runner, job_id)
+    assert job["status"] == "cancelled"
+    assert job["result"] is None
+    assert len(steps) < 10_000
+
+
+def test_queued_job_cancels_without_running(make_runner):
+    calls = []
+    runner = make_runner(noop=lambda context: calls.append(1))
+    job_id = runner.submit("noop")["id"]
+    assert runner.cancel(job_id)["status"] == "cancelled"
+
+    runner.start()
+    marker = runner.submit("noop")["id"]
+    _wait_for(runner, marker)
+    assert runner.get(job_id)["status"] == "cancelled"
+    assert calls == [1]
+
+
+def test_interrupted_jobs_run_again_after_restart(make_runner, session_factory):
+    runs = []
+    first = make_runner(work=lambda context: runs.append("first"))
+    queued = first.submit("work")["id"]
+    interrupted = first.submit("work")["id"]
+    # A previous process died while running this job
+    with session_factory() as db:
+        db.get(BackgroundJob, interrupted).status = "running"
+        db.commit()
+
+    restarted = make_runner(work=lambda context: runs.append("second") or {"ok": True})
+    restarted.start()
+    assert _wait_for(restarted, queued)["status"] == "completed"
+    assert _wait_for(restarted, interrupted)["status"] == "completed"
+    assert runs == ["second", "second"]
+
+
+def test_load_csv_job_reports_progress(make_runner, session_factory, tmp_path):
+    csv_path = tmp_path / "customers.csv"
+    with open(TELCO_CSV) as source, open(csv_path, "w") as target:
+        target.writelines(line for _, line in zip(range(121), source))
+    runner = make_runner()
+    admin_jobs.register_admin_jobs(runner)
+    runner.start()
+
+    job = _wait_for(runner, runner.submit("load_csv", csv_path=str(csv_path))["id"])
+    assert job["status"] == "completed"
+    assert job["result"]["count"] == 120
+    assert job["progress"] == {"loaded": 120}
+    with session_factory() as db:
+        assert db.query(Customer).count() == 120
+
+
+def test_score_customers_job_scores_unscored(make_runner, session_factory, model_dir, monkeypatch):
+    with session_factory() as db:
+        load_customers_csv(db.get_bind(), TELCO_CSV, max_rows=150)
+    predictor = ChurnPredictor(model_dir)
+    monkeypatch.setattr(admin_jobs, "get_predictor", lambda: predictor)
+    runner = make_runner()
+    admin_jobs.register_admin_jobs(runner)
+    runner.start()
+
+    job = _wait_for(runner, runner.submit("score_customers", only_unscored=True)["id"])
+    assert job["status"] == "completed"
+    assert job["result"]["success"] == 150
+    assert job["progress"]["scored"] == 150
+    with session_factory() as db:
+        assert db.query(PredictionRecord).count() == 150
@@ -0,0 +1,103 @@
+"""customer_latest_prediction stays in sync with the predictions audit trail"""
+from datetime import datetime, timedelta
+
+from app.db.models import Customer, CustomerLatestPrediction, PredictionRecord
+from app.repositories.customer_repository import CustomerRepository
+
+
+def _customer_ids(db, n):
+    return [row[0] for row in db.query(Customer.customer_id).order_by(Customer.customer_id).limit(n)]
+
+
+def test_save_prediction_updates_latest_row(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    customer_id = _customer_ids(seeded_db, 1)[0]
+
+    first = repo.save_prediction(customer_id, 0.2, "Low")
+    assert repo.get_latest_prediction(customer_id).prediction_id == first.id
+
+    second = repo.save_prediction(customer_id, 0.9, "High")
+    latest = repo.get_latest_prediction(customer_id)
+    assert latest.prediction_id == second.id
+    assert latest.risk_level == "High"
+    assert seeded_db.query(CustomerLatestPrediction).count() == 1
+    assert seeded_db.query(PredictionRecord).count() == 2
+
+
+def test_older_prediction_does_not_replace_newer(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    customer_id = _customer_ids(seeded_db, 1)[0]
+    now = datetime.utcnow()
+
+    repo.save_predictions([{"customer_id": customer_id, "risk_score": 0.8, "risk_level": "High", "timestamp": now}])
+    repo.save_predictions([
+        {"customer_id": customer_id, "risk_score": 0.1, "risk_level": "Low", "timestamp": now - timedelta(hours=1)}
+    ])
+
+    assert repo.get_latest_prediction(customer_id).risk_level == "High"
+
+
+def test_save_predictions_batch_matches_backfill(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    customer_ids = _customer_ids(seeded_db, 50)
+    start = datetime.utcnow()
+    batch = [
+        {
+            "customer_id": customer_id,
+            "risk_score": (i * 37 % 100) / 100,
+            "risk_level": "High" if (i * 37 % 100) >= 70 else "Low",
+            "timestamp": start + timedelta(seconds=round_number)
+        }
+        for round_number in range(3)
+        for i, customer_id in enumerate(customer_ids[round_number * 10:])
+    ]
+    assert repo.save_predictions(batch) == len(batch)
+
+    def snapshot():
+        return {
+            row.customer_id: (row.prediction_id, row.risk_score, row.risk_level)
+            for row in seeded_db.query(CustomerLatestPrediction)
+        }
+
+    incremental = snapshot()
+    assert len(incremental) == len(customer_ids)
+    assert repo.backfill_latest_predictions() == len(customer_ids)
+    assert snapshot() == incremental
+
+
+def test_risk_reads_use_latest_prediction_only(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    high, cooled = _customer_ids(seeded_db, 2)
+
+    repo.save_prediction(high, 0.9, "High")
+    repo.save_prediction(cooled, 0.95, "High")
+    repo.save_prediction(cooled, 0.1, "Low")
+
+    assert [c.customer_id for c in repo.get_high_risk_customers()] == [high]
+    stats = repo.get_summary_stats()
+    assert stats.high_risk_count == 1
+    assert stats.risk_distribution == {"low": 1, "medium": 0, "high": 1}
+    assert stats.average_risk == 0.5
+
+
+def test_summary_stats_match_python_aggregation(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    assert repo.get_summary_stats().risk_distribution == {"low": 0, "medium": 0, "high": 0}
+    assert repo.get_summary_stats().total_customers == 200
+
+    customer_ids = _customer_ids(seeded_db, 150)
+    scores = [(i * 37 % 100) / 100 for i in range(len(customer_ids))]
+    levels = ["High" if score >= 0.7 else "Medium" if score >= 0.4 else "Low" for score in scores]
+    repo.save_predictions([
+        {"customer_id": customer_id, "risk_score": score, "risk_level": level}
+        for customer_id, score, level in zip(customer_ids, scores, levels)
+    ])
+
+    stats = repo.get_summary_stats()
+    assert stats.total_customers == 200
+    assert stats.risk_distribution == {
+        "low": levels.count("Low"), "medium": levels.count("Medium"), "high": levels.count("High")
+    }
+    assert stats.high_risk_count == levels.count("High")
+    assert stats.average_risk == round(sum(scores) / len(scores), 2)
+    assert stats.monthly_churn_rate == round(levels.count("High") / 200 * 100 * 0.3, 1)
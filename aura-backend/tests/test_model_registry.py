@@ -0,0 +1,199 @@
+"""Model registry hot swaps, the model directory watcher and the reload endpoint guard"""
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import admin
+from app.core.config import settings
+from app.core.model_registry import ModelRegistry, ModelWatcher
+from app.main import app
+from app.services.churn_predictor import CHURN_MODEL, DEFAULT_MODEL_DIR
+
+
+class _Model:
+    def __init__(self, model_version: str):
+        self.model_version = model_version
+
+
+def _registry(loader, validator=None) -> ModelRegistry:
+    registry = ModelRegistry()
+    registry.register("m", loader, validator)
+    return registry
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_reload_publishes_new_version():
+    registry = _registry(lambda source="v1": _Model(source))
+    held = registry.get("m")
+    assert held.model_version == "v1"
+
+    new = registry.reload("m", "v2")
+    assert registry.get("m") is new
+    assert new.model_version == "v2"
+    # A request that took the model before the swap finishes on it
+    assert held.model_version == "v1"
+    stats = registry.stats()["m"]
+    assert stats["version"] == "v2"
+    assert stats["reload"]["status"] == "idle"
+
+
+def _reject_broken(model):
+    if model.model_version == "broken":
+        raise ValueError("smoke prediction failed")
+
+
+def _load(source="v1"):
+    if source == "missing":
+        raise FileNotFoundError("best_model.pkl")
+    return _Model(source)
+
+
+@pytest.mark.parametrize("source, error", [("missing", FileNotFoundError), ("broken", ValueError)])
+def test_failed_reload_keeps_serving_old_model(source, error):
+    registry = _registry(_load, _reject_broken)
+    old = registry.get("m")
+
+    with pytest.raises(error):
+        registry.reload("m", source)
+    assert registry.get("m") is old
+    stats = registry.stats()["m"]
+    assert stats["version"] == "v1"
+    assert stats["reload"]["status"] == "failed"
+    assert stats["reload"]["source"] == source
+
+
+def test_background_reload_runs_one_at_a_time():
+    started = threading.Event()
+    release = threading.Event()
+
+    def load(source="v1"):
+        if source != "v1":
+            started.set()
+            release.wait(5)
+        return _Model(source)
+
+    registry = _registry(load)
+    registry.get("m")
+    assert registry.reload_in_background("m", "v2")
+    assert started.wait(5)
+    assert registry.stats()["m"]["reload"]["status"] == "loading"
+    assert not registry.reload_in_background("m", "v3")
+
+    release.set()
+    _wait_for(lambda: registry.get("m").model_version == "v2")
+    _wait_for(lambda: registry.stats()["m"]["reload"]["status"] == "idle")
+    assert registry.reload_in_background("m", "v3")
+    _wait_for(lambda: registry.get("m").model_version == "v3")
+
+
+class _ScriptedStop:
+    """Stop event whose wait() runs the next step instead of sleeping"""
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.polls = 0
+
+    def wait(self, timeout):
+        if not self.steps:
+            return True
+        self.steps.pop(0)()
+        self.polls += 1
+        return False
+
+
+def test_watcher_waits_for_files_to_settle(tmp_path):
+    model_file = tmp_path / "best_model.pkl"
+    model_file.write_bytes(b"v1")
+
+    def write(content):
+        return lambda: model_file.write_bytes(content)
+
+    stop = _ScriptedStop([
+        lambda: None,            # 1: unchanged
+        write(b"v2-partial"),    # 2: changed, still being written
+        write(b"v2-complete"),   # 3: changed again
+        lambda: None,            # 4: unchanged for a full interval -> reload
+        lambda: None,            # 5: nothing new
+    ])
+    reloads = []
+    registry = _registry(lambda source=None: reloads.append((stop.polls, source)) or _Model(source))
+    watcher = ModelWatcher(registry, "m", str(tmp_path), interval_seconds=0.01)
+    watcher._stop = stop
+    watcher._run()
+
+    assert reloads == [(4, str(tmp_path))]
+
+
+def test_watcher_reloads_on_compiled_export_change(tmp_path):
+    (tmp_path / "best_model.pkl").write_bytes(b"v1")
+    compiled = tmp_path / "compiled"
+    compiled.mkdir()
+    (compiled / "rf_value.npy").write_bytes(b"v1")
+    (compiled / "manifest.json").write_text('{"format_version": 2}')
+
+    def export():
+        # export_model.py rewrites the arrays, then the manifest last
+        (compiled / "rf_value.npy").write_bytes(b"v2-arrays")
+        (compiled / "manifest.json").write_text('{"format_version": 2, "source_sha256": "new"}')
+
+    stop = _ScriptedStop([export, lambda: None, lambda: None])
+    reloads = []
+    registry = _registry(lambda source=None: reloads.append((stop.polls, source)) or _Model(source))
+    watcher = ModelWatcher(registry, "m", str(tmp_path), interval_seconds=0.01)
+    watcher._stop = stop
+    watcher._run()
+
+    assert reloads == [(2, str(tmp_path))]
+
+
+def test_watcher_thread_reloads_changed_directory(tmp_path):
+    (tmp_path / "best_model.pkl").write_bytes(b"v1")
+    registry = _registry(lambda source=None: _Model(source or "v1"))
+    registry.get("m")
+    watcher = ModelWatcher(registry, "m", str(tmp_path), interval_seconds=0.02)
+    watcher.start()
+    try:
+        # Let the watcher record the current files first
+        time.sleep(0.2)
+        (tmp_path / "best_model.pkl").write_bytes(b"v2-retrained")
+        _wait_for(lambda: registry.get("m").model_version == str(tmp_path))
+    finally:
+        watcher.stop()
+
+
+@pytest.fixture
+def reload_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        admin.model_registry, "reload_in_background", lambda name, source=None: calls.append((name, source)) or True
+    )
+    return calls
+
+
+def test_reload_endpoint_requires_admin_key(monkeypatch, reload_calls):
+    client = TestClient(app)
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+    assert client.post("/api/admin/models/reload", headers={"X-Admin-Key": ""}).status_code == 403
+
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "secret")
+    assert client.post("/api/admin/models/reload").status_code == 401
+    assert client.post("/api/admin/models/reload", headers={"X-Admin-Key": "wrong"}).status_code == 401
+    assert reload_calls == []
+
+    monkeypatch.setattr(settings, "MODEL_DIR", "")
+    response = client.post(
+        "/api/admin/models/reload", headers={"X-Admin-Key": "secret"}, json={"path": "/tmp/elsewhere"}
+    )
+    assert response.status_code == 202
+    # Only the configured directory is loaded, whatever the request body says
+    assert reload_calls == [(CHURN_MODEL, DEFAULT_MODEL_DIR)]
+    assert os.path.isabs(response.json()["path"])
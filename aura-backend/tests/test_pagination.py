@@ -0,0 +1,82 @@
+"""Cursor pagination of the customer list"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.base import get_db
+from app.main import app
+from app.repositories.customer_repository import CustomerRepository
+from tests.test_query_count import count_queries
+
+
+@pytest.fixture
+def repo(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    customer_ids = [customer.customer_id for customer in repo.get_all_customers(limit=200)]
+    # Every fifth customer unscored; duplicate scores exercise the customer_id tie-break
+    repo.save_predictions([
+        {"customer_id": customer_id, "risk_score": (i % 7) / 7, "risk_level": "Low"}
+        for i, customer_id in enumerate(customer_ids) if i % 5
+    ])
+    return repo
+
+
+def _walk(repo, sort, page_size):
+    rows, cursor = repo.get_customers_page(limit=page_size, sort=sort)
+    pages = [rows]
+    while cursor is not None:
+        rows, cursor = repo.get_customers_page(cursor=cursor, limit=page_size, sort=sort)
+        pages.append(rows)
+    return pages
+
+
+@pytest.mark.parametrize("page_size", [7, 50, 200])
+def test_customer_id_pages_cover_every_customer_once(repo, page_size):
+    pages = _walk(repo, "customer_id", page_size)
+    ids = [row.customer_id for rows in pages for row in rows]
+    assert ids == sorted(customer.customer_id for customer in repo.get_all_customers(limit=1000))
+    assert all(len(rows) == page_size for rows in pages[:-1])
+
+
+@pytest.mark.parametrize("page_size", [7, 50])
+def test_risk_pages_follow_risk_order(repo, page_size):
+    ids = [(row.risk_score, row.customer_id) for rows in _walk(repo, "risk", page_size) for row in rows]
+    assert len(ids) == 160
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_cursor_is_bound_to_sort_order():
+    token = encode_cursor("risk", [0.5, "C1"])
+    assert decode_cursor(token, "risk") == [0.5, "C1"]
+    with pytest.raises(ValueError):
+        decode_cursor(token, "customer_id")
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor!", "risk")
+
+
+def test_endpoint_pages_by_cursor_with_cached_estimate(repo, seeded_db):
+    app.dependency_overrides[get_db] = lambda: seeded_db
+    try:
+        client = TestClient(app)
+        first = client.get("/api/customers/all/list", params={"page_size": 80}).json()
+        assert first["total"] == 200 and not first["total_exact"]
+
+        # The estimate is cached: later pages run only their page query
+        with count_queries(seeded_db) as statements:
+            second = client.get(
+                "/api/customers/all/list", params={"page_size": 80, "cursor": first["next_cursor"]}
+            ).json()
+        assert len(statements) == 1
+        assert second["customers"][0]["customer_id"] > first["customers"][-1]["customer_id"]
+
+        third = client.get(
+            "/api/customers/all/list",
+            params={"page_size": 80, "cursor": second["next_cursor"], "exact_total": True}
+        ).json()
+        assert len(third["customers"]) == 40 and third["next_cursor"] is None
+        assert third["total"] == 200 and third["total_exact"]
+
+        bad = client.get("/api/customers/all/list", params={"cursor": first["next_cursor"], "sort": "risk"})
+        assert bad.status_code == 400
+    finally:
+        app.dependency_overrides.pop(get_db, None)
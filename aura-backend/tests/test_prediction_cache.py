@@ -0,0 +1,83 @@
+"""LRU prediction cache and its invalidation hooks"""
+import numpy as np
+import pytest
+
+from app.core.model_registry import ModelRegistry
+from app.core.prediction_cache import PredictionCache
+from app.services import churn_predictor
+from app.services.churn_predictor import SMOKE_TEST_CUSTOMER, ChurnPredictor
+
+
+def _key(value: float, version: str = "v1"):
+    return PredictionCache.make_key(np.full((1, 19), value), version)
+
+
+def test_lru_eviction():
+    cache = PredictionCache(max_entries=2)
+    cache.set(_key(1), 0.1)
+    cache.set(_key(2), 0.2)
+    assert cache.get(_key(1)) == 0.1  # 1 is now most recently used
+    cache.set(_key(3), 0.3)
+
+    assert cache.get(_key(2)) is None
+    assert cache.get(_key(1)) == 0.1
+    assert cache.get(_key(3)) == 0.3
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 3, 1, 1)
+
+
+def test_key_includes_model_version():
+    cache = PredictionCache()
+    cache.set(_key(1, "v1"), 0.1)
+    assert cache.get(_key(1, "v2")) is None
+
+
+def test_invalidate_customer():
+    cache = PredictionCache()
+    cache.set(_key(1), 0.1, customer_id="A")
+    cache.set(_key(2), 0.2, customer_id="A")
+    cache.set(_key(3), 0.3, customer_id="B")
+    cache.invalidate_customer("A")
+
+    assert cache.get(_key(1)) is None and cache.get(_key(2)) is None
+    assert cache.get(_key(3)) == 0.3
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_disabled_cache():
+    cache = PredictionCache(max_entries=0)
+    cache.set(_key(1), 0.1)
+    assert cache.get(_key(1)) is None
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = PredictionCache()
+    monkeypatch.setattr(churn_predictor, "prediction_cache", cache)
+    return cache
+
+
+def test_predictor_reuses_cached_prediction(model_dir, fresh_cache):
+    predictor = ChurnPredictor(model_dir)
+    first = predictor.predict(SMOKE_TEST_CUSTOMER)
+    second = predictor.predict({**SMOKE_TEST_CUSTOMER, "customer_id": "other"})
+
+    assert second["churn_probability"] == first["churn_probability"]
+    assert second["customer_id"] == "other"
+    assert fresh_cache.stats()["hits"] == 1
+
+    changed = predictor.predict({**SMOKE_TEST_CUSTOMER, "tenure": 40})
+    assert changed["churn_probability"] != first["churn_probability"]
+    assert fresh_cache.stats()["misses"] == 2
+
+
+def test_model_swap_clears_cache(fresh_cache):
+    registry = ModelRegistry()
+    registry.register("m", lambda source=None: object())
+    registry.on_swap("m", lambda model: fresh_cache.clear())
+    fresh_cache.set(_key(1), 0.1)
+
+    registry.get("m")
+    assert fresh_cache.stats()["size"] == 1
+    registry.reload("m")
+    assert fresh_cache.stats()["size"] == 0
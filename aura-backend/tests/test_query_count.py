@@ -0,0 +1,80 @@
+"""List endpoints load customers and their latest prediction without N+1 queries"""
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db.base import get_db
+from app.main import app
+from app.repositories.customer_repository import CustomerRepository
+
+
+@contextmanager
+def count_queries(session):
+    """Collect the SQL statements executed on the session's engine"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def client(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    customer_ids = [row.customer_id for row in repo.get_customers_with_predictions(limit=150)]
+    repo.save_predictions([
+        {"customer_id": customer_id, "risk_score": 0.5 + i / 400, "risk_level": "High" if i % 2 else "Medium"}
+        for i, customer_id in enumerate(customer_ids)
+    ])
+
+    app.dependency_overrides[get_db] = lambda: seeded_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.mark.parametrize("limit", [5, 50])
+def test_high_risk_list_is_one_query(client, seeded_db, limit):
+    with count_queries(seeded_db) as statements:
+        response = client.get("/api/customers/high-risk/list", params={"limit": limit})
+    assert response.status_code == 200
+    customers = response.json()["customers"]
+    assert len(customers) == limit
+    assert all(c["risk_level"] == "High" for c in customers)
+    assert [c["risk_score"] for c in customers] == sorted((c["risk_score"] for c in customers), reverse=True)
+    assert len(statements) == 1
+
+
+@pytest.mark.parametrize("page_size", [10, 100])
+def test_all_customers_page_query_count_is_constant(client, seeded_db, page_size):
+    with count_queries(seeded_db) as statements:
+        response = client.get("/api/customers/all/list", params={"page": 2, "page_size": page_size})
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["customers"]) == page_size
+    assert body["total"] == 200
+    # Page rows + total count
+    assert len(statements) == 2
+
+
+def test_all_customers_page_includes_unscored_customers(client):
+    response = client.get("/api/customers/all/list", params={"page": 2, "page_size": 100})
+    levels = {c["risk_level"] for c in response.json()["customers"]}
+    assert "Unknown" in levels and "High" in levels
+
+
+@pytest.mark.parametrize("limit", [3, 30])
+def test_dashboard_summary_query_count_is_constant(client, seeded_db, limit):
+    with count_queries(seeded_db) as statements:
+        response = client.get("/api/dashboard/summary", params={"limit": limit})
+    assert response.status_code == 200
+    assert len(response.json()["top_risky_customers"]) == limit
+    # Summary aggregate + top risky page
+    assert len(statements) == 2
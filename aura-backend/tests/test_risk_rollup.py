@@ -0,0 +1,198 @@
+"""Risk rollup and histogram: maintained on every write, always equal to aggregating the tables"""
+import io
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.risk import customer_ltv
+from app.db.models import Customer, CustomerLatestPrediction, RiskHistogramBin, RiskRollup
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.risk_rollup import rebuild_risk_rollup
+from app.services.bulk_loader import load_customers_csv
+from tests.conftest import TELCO_CSV
+from tests.test_query_count import count_queries
+
+
+def _rollup(db):
+    return {
+        (row.risk_level, row.contract, row.internet_service): (row.customer_count, pytest.approx(row.risk_score_sum))
+        for row in db.query(RiskRollup)
+        if row.customer_count
+    }
+
+
+def _expected(db):
+    """Segments aggregated from customers and customer_latest_prediction in Python"""
+    latest = {row.customer_id: row for row in db.query(CustomerLatestPrediction)}
+    expected = {}
+    for customer in db.query(Customer):
+        prediction = latest.get(customer.customer_id)
+        segment = (
+            prediction.risk_level if prediction else "Unknown",
+            customer.contract or "",
+            customer.internet_service or ""
+        )
+        count, score_sum = expected.get(segment, (0, 0.0))
+        expected[segment] = (count + 1, score_sum + (prediction.risk_score if prediction else 0.0))
+    return {segment: (count, pytest.approx(score_sum)) for segment, (count, score_sum) in expected.items()}
+
+
+def _histogram(db):
+    return {
+        row.bin: (row.customer_count, pytest.approx(row.ltv_sum))
+        for row in db.query(RiskHistogramBin)
+        if row.customer_count
+    }
+
+
+def _expected_histogram(db):
+    """Scored customers and LTV sum per 0.001 risk score bin, in Python"""
+    customers = {customer.customer_id: customer for customer in db.query(Customer)}
+    expected = {}
+    for prediction in db.query(CustomerLatestPrediction):
+        customer = customers.get(prediction.customer_id)
+        if customer is None:
+            continue
+        risk_bin = min(int(prediction.risk_score * 1000), 999)
+        count, ltv_sum = expected.get(risk_bin, (0, 0.0))
+        expected[risk_bin] = (count + 1, ltv_sum + float(customer_ltv(customer.monthly_charges, customer.tenure)))
+    return {risk_bin: (count, pytest.approx(ltv_sum)) for risk_bin, (count, ltv_sum) in expected.items()}
+
+
+def _assert_in_sync(db):
+    assert _rollup(db) == _expected(db)
+    assert _histogram(db) == _expected_histogram(db)
+
+
+def _customer_ids(db, n):
+    return [row[0] for row in db.query(Customer.customer_id).order_by(Customer.customer_id).limit(n)]
+
+
+def test_predictions_move_customers_between_segments(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    _assert_in_sync(seeded_db)
+    first, second, third = _customer_ids(seeded_db, 3)
+
+    repo.save_prediction(first, 0.9, "High")
+    repo.save_prediction(first, 0.2, "Low")
+    now = datetime.utcnow()
+    repo.save_predictions([
+        {"customer_id": second, "risk_score": 0.5, "risk_level": "Medium", "timestamp": now},
+        # Same customer twice in one batch: the later row wins
+        {"customer_id": second, "risk_score": 0.8, "risk_level": "High", "timestamp": now + timedelta(seconds=1)},
+        {"customer_id": third, "risk_score": 0.75, "risk_level": "High", "timestamp": now},
+    ])
+    # Older than the stored prediction: ignored by the upsert and the rollup
+    repo.save_predictions([
+        {"customer_id": third, "risk_score": 0.1, "risk_level": "Low", "timestamp": now - timedelta(days=1)}
+    ])
+
+    _assert_in_sync(seeded_db)
+    stats = repo.get_summary_stats()
+    assert stats.total_customers == 200
+    assert stats.risk_distribution == {"low": 1, "medium": 0, "high": 2}
+    assert stats.average_risk == round((0.2 + 0.8 + 0.75) / 3, 2)
+
+
+def test_customer_writes_keep_rollup_in_sync(seeded_db, telco_customers):
+    repo = CustomerRepository(seeded_db)
+    customer_ids = _customer_ids(seeded_db, 50)
+    repo.save_predictions([
+        {"customer_id": customer_id, "risk_score": i / 50, "risk_level": "High" if i % 2 else "Low"}
+        for i, customer_id in enumerate(customer_ids)
+    ])
+
+    # Segment and LTV change of a scored customer
+    customer = repo.get_by_id(customer_ids[1], use_cache=False)
+    contract = "Two year" if customer.contract != "Two year" else "One year"
+    repo.update_customer(
+        customer_ids[1], {"contract": contract, "internet_service": "DSL", "tenure": 80, "monthly_charges": 99.5}
+    )
+    _assert_in_sync(seeded_db)
+
+    # New (unscored) and deleted customers
+    new_customer = telco_customers.iloc[0].drop(["Churn"]).to_dict()
+    new_customer["customer_id"] = "NEW-0001"
+    repo.create_customer(new_customer)
+    repo.delete_customer(customer_ids[3])
+    _assert_in_sync(seeded_db)
+    assert repo.get_summary_stats().total_customers == 200
+
+    # Backfill rebuilds it from scratch
+    repo.backfill_latest_predictions()
+    _assert_in_sync(seeded_db)
+
+
+def _rollup_writes(statements):
+    return [
+        statement for statement in statements
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE"))
+        and any(table in statement for table in ("risk_rollup", "risk_histogram"))
+    ]
+
+
+def test_writes_that_move_nothing_write_nothing(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    customer_id = _customer_ids(seeded_db, 1)[0]
+    repo.save_prediction(customer_id, 0.42, "Medium")
+
+    # Same score again (e.g. the customer detail view re-scoring an unchanged customer)
+    with count_queries(seeded_db) as statements:
+        repo.save_prediction(customer_id, 0.42, "Medium")
+    assert _rollup_writes(statements) == []
+
+    # Columns no segment or bin depends on: not even read for tracking
+    with count_queries(seeded_db) as statements:
+        repo.update_customer(customer_id, {"gender": "Male", "payment_method": "Mailed check"})
+    assert not any("risk" in statement for statement in statements)
+
+    with count_queries(seeded_db) as statements:
+        repo.update_customer(customer_id, {"tenure": 71, "monthly_charges": 64.0})
+    assert len(_rollup_writes(statements)) == 1  # Only the bin's LTV sum moved
+    _assert_in_sync(seeded_db)
+
+
+def test_bulk_loads_keep_rollup_in_sync(db_session):
+    connection = db_session.connection()
+    with open(TELCO_CSV) as f:
+        head = "".join(f.readline() for _ in range(301))
+    # Into an empty table: rebuilt at the end
+    load_customers_csv(connection, io.StringIO(head), chunk_rows=120)
+    _assert_in_sync(db_session)
+    repo = CustomerRepository(db_session)
+    customer_ids = _customer_ids(db_session, 100)
+    repo.save_predictions([
+        {"customer_id": customer_id, "risk_score": 0.9, "risk_level": "High"} for customer_id in customer_ids
+    ])
+
+    lines = head.splitlines(keepends=True)
+    header = lines[0].split(",")
+    contract_column = header.index("Contract")
+
+    def with_contract(rows, contract):
+        return "".join([lines[0]] + [
+            ",".join(value if i != contract_column else contract for i, value in enumerate(line.split(",")))
+            for line in rows
+        ])
+
+    # A few customers: tracked chunk by chunk
+    load_customers_csv(db_session.connection(), io.StringIO(with_contract(lines[1:41], "One year")), chunk_rows=20)
+    _assert_in_sync(db_session)
+
+    # Every customer: the first chunk is tracked, then the rollup is rebuilt
+    load_customers_csv(db_session.connection(), io.StringIO(with_contract(lines[1:], "Two year")), chunk_rows=120)
+    _assert_in_sync(db_session)
+    rollup = _rollup(db_session)
+    assert {contract for _, contract, _ in rollup} == {"Two year"}
+    assert sum(count for (level, _, _), (count, _) in rollup.items() if level == "High") == 100
+
+
+def test_rebuild_matches_maintained_rollup(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    repo.save_predictions([
+        {"customer_id": customer_id, "risk_score": 0.45, "risk_level": "Medium"}
+        for customer_id in _customer_ids(seeded_db, 80)
+    ])
+    maintained = _rollup(seeded_db), _histogram(seeded_db)
+    rebuild_risk_rollup(seeded_db)
+    assert (_rollup(seeded_db), _histogram(seeded_db)) == maintained
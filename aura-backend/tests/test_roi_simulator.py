@@ -0,0 +1,261 @@
+"""ROI simulator: band estimates, risk histogram lookups, exact threshold targeting, ROI sweeps and expected-value targeting"""
+import json
+import random
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.base import get_db
+from app.db.models import Customer
+from app.core.risk import MEDIUM_RISK_THRESHOLD, RiskHistogram, ScoredCustomers, customer_ltv
+from app.core.targeting_snapshot import TargetingSnapshot, targeting_snapshot
+from app.main import app
+from app.repositories.customer_repository import CustomerRepository
+from app.services.churn_predictor import ChurnPredictor
+from app.services.roi_simulator import ROISimulator
+
+
+def test_band_estimate_uses_predictor_thresholds():
+    simulator = ROISimulator()
+    distribution = {"low": 100, "medium": 60, "high": 30}
+    assert MEDIUM_RISK_THRESHOLD == ChurnPredictor.MEDIUM_RISK_THRESHOLD == 0.4
+
+    assert simulator._calculate_targeted_customers(0.0, distribution) == 190
+    assert simulator._calculate_targeted_customers(0.4, distribution) == 90
+    assert simulator._calculate_targeted_customers(0.7, distribution) == 30
+    # Halfway through the medium band (0.4-0.7)
+    assert simulator._calculate_targeted_customers(0.55, distribution) == 30 + 30
+    # Above 0.7 only part of the high band
+    assert simulator._calculate_targeted_customers(0.85, distribution) == 15
+
+
+def test_customer_ltv_clips_tenure():
+    ltv = customer_ltv([50.0, 50.0, 50.0, np.nan], [3, 24, 100, 24])
+    assert ltv.tolist() == [600.0, 1200.0, 3600.0, 0.0]
+
+
+def test_histogram_suffix_sums():
+    counts = np.zeros(1000, dtype=np.int64)
+    ltv_sums = np.zeros(1000)
+    counts[[100, 700, 999]] = [5, 3, 2]
+    ltv_sums[[100, 700, 999]] = [500.0, 300.0, 200.0]
+    histogram = RiskHistogram(counts, ltv_sums)
+
+    assert histogram.total_customers == 10
+    customers, ltv = histogram.targeted(np.array([0.0, 0.1005, 0.7, 0.75, 1.0]))
+    # 0.1005 falls into bin 100, which is counted in full
+    assert customers.tolist() == [10, 10, 5, 2, 2]
+    assert ltv.tolist() == [1000.0, 1000.0, 500.0, 200.0, 200.0]
+    assert histogram.totals_from_bin(1000) == (0, 0.0)
+
+
+def test_targeting_totals_are_exact(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    customers = seeded_db.query(Customer).all()
+    rng = random.Random(7)
+    # Several customers per bin around 0.5, one at 1.0
+    scores = [round(0.5 + rng.randrange(40) / 10000, 4) for _ in customers[:-1]] + [1.0]
+    repo.save_predictions([
+        {"customer_id": customer.customer_id, "risk_score": score, "risk_level": "Medium"}
+        for customer, score in zip(customers, scores)
+    ])
+    ltv = {customer.customer_id: float(customer_ltv(customer.monthly_charges, customer.tenure)) for customer in customers}
+
+    histogram = repo.get_risk_histogram()
+    assert histogram.total_customers == len(customers)
+    for threshold in (0.0, 0.5, 0.5012, 0.50125, 0.502, 0.5039, 0.9, 1.0):
+        targeted = [customer.customer_id for customer, score in zip(customers, scores) if score >= threshold]
+        count, ltv_sum = repo.get_targeting_totals(threshold, histogram)
+        assert count == len(targeted)
+        assert ltv_sum == pytest.approx(sum(ltv[customer_id] for customer_id in targeted))
+
+
+def test_simulate_with_exact_targeting():
+    result = ROISimulator(campaign_effectiveness=0.5).simulate(
+        risk_threshold=0.6,
+        campaign_budget=1000.0,
+        total_customers=100,
+        risk_distribution={"low": 50, "medium": 30, "high": 20},
+        targeted_customers=25,
+        targeted_ltv=10000.0
+    )
+    assert result.targeted_customers == 25
+    assert result.projected_revenue == 5000.0
+    assert result.roi == 400.0
+    assert result.coverage_percentage == 25.0
+
+
+def test_grid_matches_pointwise_simulate(rng):
+    histogram = RiskHistogram(rng.integers(0, 5, 1000), rng.uniform(0, 500, 1000))
+    simulator = ROISimulator()
+    bins = np.array([0, 123, 400, 700, 999])
+    budgets = np.array([500.0, 10_000.0, 250_000.0])
+    grid = simulator.simulate_grid(bins, budgets, 5000, histogram)
+    assert grid["roi"].shape == (5, 3)
+
+    for i, risk_bin in enumerate(bins):
+        targeted, ltv = histogram.totals_from_bin(risk_bin)
+        for j, budget in enumerate(budgets):
+            expected = simulator.simulate(
+                risk_bin / 1000, budget, 5000, {}, targeted_customers=int(targeted), targeted_ltv=float(ltv)
+            )
+            assert grid["targeted_customers"][i] == expected.targeted_customers
+            assert grid["projected_revenue"][i] == pytest.approx(expected.projected_revenue)
+            assert grid["coverage_percentage"][i] == pytest.approx(expected.coverage_percentage)
+            for metric in ("cost_per_customer", "total_cost", "roi", "net_gain"):
+                assert grid[metric][i, j] == pytest.approx(getattr(expected, metric))
+
+
+def test_grid_without_targeted_customers_is_zero():
+    histogram = RiskHistogram(np.zeros(1000, dtype=np.int64), np.zeros(1000))
+    grid = ROISimulator().simulate_grid(np.array([0, 500]), np.array([1000.0]), 0, histogram)
+    for values in grid.values():
+        assert not values.any()
+
+
+def test_sweep_endpoint_returns_roi_surface(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    customer_ids = [customer.customer_id for customer in seeded_db.query(Customer)]
+    scores = [(i % 20) / 20 + 0.0004 for i in range(len(customer_ids))]
+    repo.save_predictions([
+        {"customer_id": customer_id, "risk_score": score, "risk_level": "Low"}
+        for customer_id, score in zip(customer_ids, scores)
+    ])
+
+    app.dependency_overrides[get_db] = lambda: seeded_db
+    try:
+        client = TestClient(app)
+        response = client.post("/api/simulation/roi/sweep", json={
+            "threshold_min": 0.1, "threshold_max": 0.6, "threshold_steps": 6,
+            "budget_min": 1000, "budget_max": 3000, "budget_steps": 3
+        })
+        assert response.status_code == 200
+        surface = response.json()
+        assert surface["thresholds"] == pytest.approx([0.1, 0.2, 0.3, 0.4, 0.5, 0.6])
+        assert surface["budgets"] == [1000.0, 2000.0, 3000.0]
+        assert surface["targeted_customers"] == [
+            sum(score >= threshold for score in scores) for threshold in surface["thresholds"]
+        ]
+        assert len(surface["roi"]) == 6 and all(len(row) == 3 for row in surface["roi"])
+
+        # The point simulation agrees on the same grid point
+        point = client.post("/api/simulation/roi", json={"risk_threshold": 0.3, "campaign_budget": 2000}).json()
+        assert point["targeted_customers"] == surface["targeted_customers"][2]
+        assert point["roi"] == pytest.approx(surface["roi"][2][1])
+
+        response = client.post("/api/simulation/roi/sweep", json={
+            "threshold_min": 0.8, "threshold_max": 0.2, "budget_min": 1000, "budget_max": 3000
+        })
+        assert response.status_code == 400
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def _scored(rng, n):
+    return ScoredCustomers(
+        customer_ids=np.array([f"C{i:05d}" for i in range(n)], dtype=object),
+        risk_scores=rng.uniform(0, 1, n),
+        ltv=customer_ltv(rng.uniform(20, 120, n), rng.integers(0, 73, n))
+    )
+
+
+@pytest.mark.parametrize("budget", [0.0, 99.0, 2_500.0, 40_000.0, 1e9])
+def test_select_targets_is_the_best_affordable_set(rng, budget):
+    customers = _scored(rng, 2000)
+    simulator = ROISimulator(campaign_effectiveness=0.5)
+    targets = simulator.select_targets(customers, campaign_budget=budget, cost_per_customer=100.0)
+
+    expected_values = customers.risk_scores * customers.ltv * 0.5
+    best = sorted(
+        (value for value in expected_values.tolist() if value > 100.0), reverse=True
+    )[:int(budget // 100.0)]
+    assert targets.expected_values.tolist() == pytest.approx(best)
+    assert targets.total_cost == 100.0 * len(best) <= max(budget, 0.0)
+    assert targets.expected_revenue == pytest.approx(sum(best))
+    # Rows stay aligned with their customer
+    index = {customer_id: i for i, customer_id in enumerate(customers.customer_ids)}
+    for customer_id, risk_score in zip(targets.customer_ids, targets.risk_scores):
+        assert customers.risk_scores[index[customer_id]] == risk_score
+
+
+def test_scored_customers_snapshot_refreshes(seeded_db, monkeypatch):
+    repo = CustomerRepository(seeded_db)
+    customer_ids = [customer.customer_id for customer in seeded_db.query(Customer)]
+    repo.save_predictions([
+        {"customer_id": customer_id, "risk_score": 0.5, "risk_level": "Medium"} for customer_id in customer_ids[:50]
+    ])
+    loads = targeting_snapshot.loads
+
+    scored = repo.get_scored_customers()
+    assert sorted(scored.customer_ids) == sorted(customer_ids[:50])
+    assert targeting_snapshot.loads == loads + 1
+
+    # Writes do not reload it...
+    repo.save_prediction(customer_ids[60], 0.9, "High")
+    assert repo.get_scored_customers() is scored
+    assert targeting_snapshot.loads == loads + 1
+
+    # ...a refresh does
+    targeting_snapshot.refresh(repo.load_scored_customers)
+    assert len(repo.get_scored_customers().customer_ids) == 51
+
+    # So does a request finding it older than the maximum age; tenure / charges changes move the LTV
+    repo.update_customer(customer_ids[0], {"tenure": 72, "monthly_charges": 100.0})
+    monkeypatch.setattr(targeting_snapshot, "max_age_seconds", 0.0)
+    time.sleep(0.01)
+    scored = repo.get_scored_customers()
+    assert scored.ltv[list(scored.customer_ids).index(customer_ids[0])] == 7200.0
+    assert targeting_snapshot.loads == loads + 3
+
+
+def test_snapshot_refresh_thread_only_refreshes_loaded_snapshots():
+    snapshot = TargetingSnapshot()
+    versions = iter(range(1, 1000))
+    snapshot.start_refresh(lambda: next(versions), interval_seconds=0.01)
+    try:
+        time.sleep(0.1)
+        assert snapshot.loads == 0
+        assert snapshot.get(lambda: next(versions)) == 1
+
+        deadline = time.monotonic() + 5
+        while snapshot.get(lambda: next(versions)) < 3:
+            assert time.monotonic() < deadline, "snapshot was not refreshed"
+            time.sleep(0.01)
+    finally:
+        snapshot.stop_refresh()
+
+
+def test_targeting_endpoint_streams_ranked_targets(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    customers = seeded_db.query(Customer).all()
+    repo.save_predictions([
+        {"customer_id": customer.customer_id, "risk_score": (i % 10) / 10, "risk_level": "Low"}
+        for i, customer in enumerate(customers)
+    ])
+
+    app.dependency_overrides[get_db] = lambda: seeded_db
+    try:
+        client = TestClient(app)
+        response = client.post(
+            "/api/simulation/targeting", json={"campaign_budget": 2_000, "cost_per_customer": 100, "uplift": 0.5}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        targets = [json.loads(line) for line in response.text.splitlines()]
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert len(targets) == int(response.headers["X-Targeted-Customers"]) == 20
+    assert float(response.headers["X-Total-Cost"]) == 2_000.0
+    assert [target["rank"] for target in targets] == list(range(1, 21))
+    values = [target["expected_value"] for target in targets]
+    assert values == sorted(values, reverse=True)
+    assert float(response.headers["X-Expected-Revenue"]) == pytest.approx(sum(values), abs=0.05)
+
+    # Nobody left out is worth more than the last target
+    ltv = {c.customer_id: float(customer_ltv(c.monthly_charges, c.tenure)) for c in customers}
+    risk = {c.customer_id: (i % 10) / 10 for i, c in enumerate(customers)}
+    chosen = {target["customer_id"] for target in targets}
+    assert max(risk[c] * ltv[c] * 0.5 for c in ltv if c not in chosen) <= values[-1] + 0.01
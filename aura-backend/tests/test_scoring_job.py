@@ -0,0 +1,223 @@
+"""Resumable full-base and incremental scoring jobs"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models import Customer, CustomerLatestPrediction, DirtyCustomer, PredictionRecord, ScoringRun
+from app.repositories.customer_repository import CustomerRepository
+from app.services.churn_predictor import ChurnPredictor
+from app.services.scoring_job import ScoringJob
+
+
+@pytest.fixture
+def predictor(model_dir):
+    return ChurnPredictor(model_dir)
+
+
+@pytest.fixture
+def session_factory(seeded_db):
+    engine = seeded_db.get_bind()
+    return lambda: Session(bind=engine)
+
+
+class FailingPredictor:
+    """Wraps a predictor and fails on the n-th batch, like a crash mid-run"""
+
+    def __init__(self, predictor, fail_on_call):
+        self.predictor = predictor
+        self.model_version = predictor.model_version
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+
+    def score_customers(self, customers_data, *args, **kwargs):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("worker killed")
+        return self.predictor.score_customers(customers_data, *args, **kwargs)
+
+
+def test_full_run_matches_single_predictions(seeded_db, predictor, session_factory):
+    result = ScoringJob(predictor, session_factory, chunk_size=64, verbose=False).run()
+
+    assert result["status"] == "completed"
+    assert result["scored"] == result["total"] == 200
+    assert result["errors"] == 0
+    assert seeded_db.query(PredictionRecord).count() == 200
+    assert seeded_db.query(CustomerLatestPrediction).count() == 200
+
+    customer = seeded_db.query(Customer).order_by(Customer.customer_id).first()
+    latest = seeded_db.get(CustomerLatestPrediction, customer.customer_id)
+    expected = predictor.predict({c.key: getattr(customer, c.key) for c in Customer.__table__.columns})
+    assert latest.risk_score == pytest.approx(expected["churn_probability"])
+    assert latest.risk_level == expected["risk_level"]
+
+
+def test_failed_run_resumes_after_last_checkpoint(seeded_db, predictor, session_factory):
+    failing = FailingPredictor(predictor, fail_on_call=3)
+    with pytest.raises(RuntimeError):
+        ScoringJob(failing, session_factory, chunk_size=50, verbose=False).run()
+
+    run = seeded_db.query(ScoringRun).one()
+    assert run.status == "failed"
+    assert run.scored_count == 100
+    assert seeded_db.query(PredictionRecord).count() == 100
+
+    result = ScoringJob(predictor, session_factory, chunk_size=50, verbose=False).run()
+    assert result["run_id"] == run.id
+    assert result["status"] == "completed"
+    assert result["scored"] == 200
+    assert result["processed"] == 100
+    # Nobody was scored twice
+    per_customer = seeded_db.query(func.count(PredictionRecord.id)).group_by(PredictionRecord.customer_id).all()
+    assert len(per_customer) == 200
+    assert {count for (count,) in per_customer} == {1}
+
+
+def test_max_customers_stops_and_next_call_continues(seeded_db, predictor, session_factory):
+    job = ScoringJob(predictor, session_factory, chunk_size=30, verbose=False)
+    first = job.run(max_customers=60)
+    assert first["status"] == "running"
+    assert first["scored"] == first["processed"] == 60
+    assert first["eta_seconds"] is not None
+
+    second = job.run()
+    assert second["run_id"] == first["run_id"]
+    assert second["scored"] == 200
+    assert seeded_db.query(PredictionRecord).count() == 200
+
+    # Completed runs are not resumed: a new call starts a fresh run
+    third = job.run(max_customers=30)
+    assert third["run_id"] != first["run_id"]
+
+
+def test_only_unscored_skips_customers_with_a_prediction(seeded_db, predictor, session_factory):
+    ScoringJob(predictor, session_factory, chunk_size=50, verbose=False).run(max_customers=50)
+    seeded_db.query(ScoringRun).delete()
+    seeded_db.commit()
+
+    result = ScoringJob(predictor, session_factory, chunk_size=50, only_unscored=True, verbose=False).run()
+    assert result["total"] == 150
+    assert result["scored"] == 150
+    assert seeded_db.query(PredictionRecord).count() == 200
+
+    again = ScoringJob(predictor, session_factory, only_unscored=True, verbose=False).run()
+    assert again["processed"] == 0
+
+
+def test_risk_levels_match_thresholds():
+    probabilities = np.array([0.1, 0.4, 0.69, 0.7, 0.95])
+    assert ChurnPredictor.risk_levels(probabilities).tolist() == ["Low", "Medium", "Medium", "High", "High"]
+    assert [ChurnPredictor._risk_level(p) for p in probabilities] == ["Low", "Medium", "Medium", "High", "High"]
+
+
+def _latest_scores(db):
+    return {row.customer_id: (row.risk_score, row.risk_level) for row in db.query(CustomerLatestPrediction)}
+
+
+def test_worker_pool_matches_in_process_scoring(seeded_db, predictor, session_factory):
+    ScoringJob(predictor, session_factory, chunk_size=40, verbose=False, workers=1).run()
+    serial = _latest_scores(seeded_db)
+    seeded_db.query(CustomerLatestPrediction).delete()
+    seeded_db.query(PredictionRecord).delete()
+    seeded_db.commit()
+
+    result = ScoringJob(predictor, session_factory, chunk_size=40, verbose=False, workers=2).run(resume=False)
+    assert result["status"] == "completed"
+    assert result["scored"] == 200
+    assert seeded_db.query(PredictionRecord).count() == 200
+    parallel = _latest_scores(seeded_db)
+    assert parallel.keys() == serial.keys()
+    for customer_id, (score, level) in serial.items():
+        assert parallel[customer_id][0] == pytest.approx(score)
+        assert parallel[customer_id][1] == level
+
+
+def test_worker_failure_keeps_checkpoint_of_written_chunks(seeded_db, predictor, session_factory):
+    # Each forked worker counts its own calls: the first worker fails on its second chunk
+    failing = FailingPredictor(predictor, fail_on_call=2)
+    with pytest.raises(RuntimeError):
+        ScoringJob(failing, session_factory, chunk_size=25, verbose=False, workers=2).run()
+
+    run = seeded_db.query(ScoringRun).one()
+    assert run.status == "failed"
+    # Chunks are written in order, so the checkpoint covers exactly the stored rows
+    stored = [row[0] for row in seeded_db.query(PredictionRecord.customer_id).order_by(PredictionRecord.customer_id)]
+    assert run.scored_count == len(stored) < 200
+    assert (stored[-1] if stored else None) == run.last_customer_id
+
+    result = ScoringJob(predictor, session_factory, chunk_size=25, verbose=False, workers=2).run()
+    assert result["scored"] == 200
+    assert seeded_db.query(PredictionRecord).count() == 200
+
+
+def _scored_since(db, prediction_id):
+    """Customers with a prediction row newer than prediction_id"""
+    return {row[0] for row in db.query(PredictionRecord.customer_id).filter(PredictionRecord.id > prediction_id)}
+
+
+def _first_ids(db, n):
+    return [row[0] for row in db.query(Customer.customer_id).order_by(Customer.customer_id).limit(n)]
+
+
+def test_incremental_run_scores_only_changed_customers(seeded_db, predictor, session_factory, telco_customers):
+    ScoringJob(predictor, session_factory, chunk_size=64, verbose=False).run()
+    before = seeded_db.query(func.max(PredictionRecord.id)).scalar()
+    repo = CustomerRepository(seeded_db)
+    changed, relabeled = _first_ids(seeded_db, 2)
+    repo.update_customer(changed, {"tenure": 71, "contract": "Two year"})
+    repo.update_customer(relabeled, {"churn": "Yes"})
+    new_customer = telco_customers.iloc[300].drop(labels=["Churn"]).to_dict()
+    repo.create_customer(new_customer)
+    assert {row.customer_id for row in seeded_db.query(DirtyCustomer)} == {changed, new_customer["customer_id"]}
+
+    result = ScoringJob(predictor, session_factory, verbose=False, incremental=True).run()
+
+    scored = _scored_since(seeded_db, before)
+    # The relabel bumps updated_at only at second resolution, so it may or may not be rescored
+    assert {changed, new_customer["customer_id"]} <= scored <= {changed, relabeled, new_customer["customer_id"]}
+    assert result["scored"] == len(scored)
+    assert seeded_db.query(DirtyCustomer).count() == 0
+    latest = repo.get_latest_prediction(changed)
+    customer = repo.get_by_id(changed, use_cache=False)
+    expected = predictor.predict({c.key: getattr(customer, c.key) for c in Customer.__table__.columns}, use_cache=False)
+    assert latest.risk_score == pytest.approx(expected["churn_probability"])
+
+
+def test_incremental_run_rescores_other_model_versions_and_newer_rows(seeded_db, predictor, session_factory):
+    ScoringJob(predictor, session_factory, chunk_size=64, verbose=False).run()
+    old_model, touched = _first_ids(seeded_db, 2)
+    seeded_db.query(CustomerLatestPrediction).filter(CustomerLatestPrediction.customer_id == old_model).update(
+        {"model_name": "Voting Classifier@000000000000"}
+    )
+    # Written outside the repository (e.g. a bulk load): only updated_at shows the change
+    seeded_db.query(Customer).filter(Customer.customer_id == touched).update(
+        {"updated_at": datetime.utcnow() + timedelta(hours=1)}
+    )
+    seeded_db.commit()
+    before = seeded_db.query(func.max(PredictionRecord.id)).scalar()
+
+    result = ScoringJob(predictor, session_factory, verbose=False, incremental=True).run()
+
+    scored = _scored_since(seeded_db, before)
+    assert scored == {old_model, touched}
+    assert result["total"] == 2
+
+
+def test_dirty_mark_newer_than_the_read_survives(seeded_db):
+    repo = CustomerRepository(seeded_db)
+    customer_id = _first_ids(seeded_db, 1)[0]
+    repo.mark_customers_dirty([customer_id])
+    seeded_db.commit()
+    read_mark = seeded_db.get(DirtyCustomer, customer_id).marked_at
+
+    repo.mark_customers_dirty([customer_id])
+    repo.clear_dirty_customers([(customer_id, read_mark)])
+    seeded_db.commit()
+    assert seeded_db.get(DirtyCustomer, customer_id) is not None
+
+    repo.clear_dirty_customers([(customer_id, seeded_db.get(DirtyCustomer, customer_id).marked_at)])
+    seeded_db.commit()
+    assert seeded_db.get(DirtyCustomer, customer_id) is None
@@ -0,0 +1,82 @@
+"""Blocking route handlers: run off the event loop, no deadlock when the DB pool is exhausted"""
+import threading
+
+import anyio
+import httpx
+from fastapi import Depends, FastAPI
+from pydantic import BaseModel
+
+from app.core.threadpool import blocking_handler, handler_limiter
+
+
+class ItemResponse(BaseModel):
+    item_id: int
+    thread: str
+
+
+def _make_app(connections: int) -> FastAPI:
+    """App whose handlers hold one of `connections` pooled "connections" until teardown"""
+    pool = threading.BoundedSemaphore(connections)
+
+    def get_connection():
+        # Like QueuePool: wait for a free connection, fail after a timeout
+        if not pool.acquire(timeout=5):
+            raise TimeoutError("connection pool exhausted")
+        try:
+            yield
+        finally:
+            pool.release()
+
+    app = FastAPI()
+
+    @app.get("/items/{item_id}", response_model=ItemResponse)
+    @blocking_handler
+    def get_item(item_id: int, connection=Depends(get_connection)):
+        """Docstring is kept"""
+        return {"item_id": item_id, "thread": threading.current_thread().name}
+
+    return app
+
+
+async def _get_all(app: FastAPI, requests: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = [None] * requests
+
+        async def get(i):
+            responses[i] = await client.get(f"/items/{i}")
+
+        async with anyio.create_task_group() as tg:
+            for i in range(requests):
+                tg.start_soon(get, i)
+    return responses
+
+
+def test_handler_keeps_signature_and_runs_off_the_event_loop():
+    app = _make_app(connections=2)
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/items/{item_id}")
+    assert route.endpoint.__doc__ == "Docstring is kept"
+    assert [param.name for param in route.dependant.path_params] == ["item_id"]
+
+    async def main():
+        return await _get_all(app, 1)
+
+    response, = anyio.run(main)
+    assert response.status_code == 200
+    assert response.json()["item_id"] == 0
+    assert response.json()["thread"] != threading.current_thread().name
+
+
+def test_more_requests_than_threads_and_connections_complete():
+    app = _make_app(connections=2)
+
+    async def main():
+        # Small pools make starvation immediate if responses needed a thread
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 4
+        handler_limiter().total_tokens = 4
+        with anyio.fail_after(30):
+            return await _get_all(app, 200)
+
+    responses = anyio.run(main)
+    assert [response.status_code for response in responses] == [200] * 200
+    assert [response.json()["item_id"] for response in responses] == list(range(200))
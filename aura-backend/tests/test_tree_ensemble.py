@@ -0,0 +1,164 @@
+"""Parity of the compiled NumPy evaluator with scikit-learn's predict_proba"""
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services.churn_predictor import COMPILED_MAX_ROWS, SMOKE_TEST_CUSTOMER, ChurnPredictor
+from app.services.tree_ensemble import (
+    COMPILED_DIR, BLOCK_ROWS, CompiledVotingModel, export_voting_classifier, file_sha256
+)
+from export_model import export_model
+from tests.conftest import BACKEND_DIR, train_voting_classifier
+
+TOLERANCE = 1e-9
+
+
+def assert_parity(model, compiled, X):
+    expected = model.predict_proba(X)
+    actual = compiled.predict_proba(X)
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=TOLERANCE)
+
+
+@pytest.fixture(scope="module")
+def compiled(voting_model):
+    model, scaler = voting_model
+    return CompiledVotingModel.from_voting_classifier(model, scaler)
+
+
+def test_random_inputs(voting_model, compiled, rng):
+    model, _ = voting_model
+    assert_parity(model, compiled, rng.normal(scale=2.0, size=(3000, 19)))
+
+
+def test_training_rows(voting_model, compiled, training_data):
+    model, _ = voting_model
+    X, _, _ = training_data
+    assert_parity(model, compiled, X)
+
+
+@pytest.mark.parametrize("n_rows", [1, 2, BLOCK_ROWS - 1, BLOCK_ROWS, BLOCK_ROWS + 1])
+def test_batch_sizes_around_block_boundary(voting_model, compiled, training_data, n_rows):
+    model, _ = voting_model
+    X, _, _ = training_data
+    assert_parity(model, compiled, X[:n_rows])
+
+
+def test_empty_batch(compiled):
+    assert compiled.predict_proba(np.empty((0, 19))).shape == (0, 2)
+
+
+def test_inputs_on_split_thresholds(voting_model, compiled, training_data):
+    """Values exactly on (and one float32 step around) every threshold take the same branch"""
+    model, _ = voting_model
+    X, _, _ = training_data
+    rf = model.named_estimators_["rf"]
+    rows = []
+    for tree in rf.estimators_[:10]:
+        internal = tree.tree_.children_left != -1
+        for feature, threshold in zip(tree.tree_.feature[internal], tree.tree_.threshold[internal]):
+            t32 = np.float32(threshold)
+            for value in (np.nextafter(t32, np.float32(-np.inf)), t32, np.nextafter(t32, np.float32(np.inf))):
+                row = X[len(rows) % len(X)].copy()
+                row[feature] = value
+                rows.append(row)
+    assert_parity(model, compiled, np.array(rows))
+
+
+def test_weighted_voting_and_deep_trees(training_data, rng):
+    X, y, scaler = training_data
+    model = train_voting_classifier(X, y, n_trees=20, weights=[2.0, 1.0, 0.5], max_leaf_nodes=None)
+    compiled = CompiledVotingModel.from_voting_classifier(model, scaler)
+    assert compiled.rf.max_depth > 16
+    assert_parity(model, compiled, np.vstack([X, rng.normal(size=(1000, 19))]))
+
+
+def test_rejects_unsupported_models(training_data):
+    X, y, scaler = training_data
+    model = train_voting_classifier(X[:500], y[:500], n_trees=5)
+    model.voting = "hard"
+    with pytest.raises(ValueError):
+        CompiledVotingModel.from_voting_classifier(model, scaler)
+
+
+def test_export_roundtrip(voting_model, tmp_path, rng):
+    model, scaler = voting_model
+    export_voting_classifier(model, scaler, str(tmp_path), source_sha256="abc")
+    loaded = CompiledVotingModel.load(str(tmp_path))
+    assert loaded.source_sha256 == "abc"
+    assert_parity(model, loaded, rng.normal(size=(500, 19)))
+
+
+def test_predictor_matches_sklearn(model_dir, voting_model, telco_customers, monkeypatch):
+    model, _ = voting_model
+    monkeypatch.setattr(settings, "MODEL_USE_COMPILED", True)
+    predictor = ChurnPredictor(model_dir)
+    assert predictor.compiled is not None
+
+    features, rows, errors = predictor._prepare_features_batch(telco_customers)
+    assert not errors
+    expected = model.predict_proba(features)[:, 1]
+    np.testing.assert_allclose(predictor.predict_proba_batch(features, chunk_size=100), expected, rtol=0, atol=TOLERANCE)
+
+    single = predictor.predict(SMOKE_TEST_CUSTOMER)["churn_probability"]
+    reference = model.predict_proba(predictor._prepare_features(SMOKE_TEST_CUSTOMER))[0, 1]
+    assert abs(single - reference) <= TOLERANCE
+
+
+def test_predictor_serves_memory_mapped_export(model_dir, voting_model, training_data, monkeypatch):
+    model, _ = voting_model
+    X, _, _ = training_data
+    monkeypatch.setattr(settings, "MODEL_USE_COMPILED", True)
+    export_model(model_dir)
+    try:
+        predictor = ChurnPredictor(model_dir)
+        assert predictor.model is None
+        assert predictor.compiled.source_sha256 == file_sha256(os.path.join(model_dir, "best_model.pkl"))
+        expected = model.predict_proba(X)[:, 1]
+
+        # Small calls stay on the memory-mapped evaluator
+        small = predictor.predict_proba_batch(X.copy(), chunk_size=COMPILED_MAX_ROWS - 1)
+        np.testing.assert_allclose(small, expected, rtol=0, atol=TOLERANCE)
+        assert predictor.model is None
+
+        # Large scoring chunks load the pickle once and go to scikit-learn
+        large = predictor.predict_proba_batch(X.copy())
+        np.testing.assert_allclose(large, expected, rtol=0, atol=TOLERANCE)
+        assert predictor.model is not None
+    finally:
+        shutil.rmtree(os.path.join(model_dir, COMPILED_DIR))
+
+
+def test_export_keeps_serving_when_pickle_changes(model_dir, voting_model, training_data, tmp_path, monkeypatch):
+    model, _ = voting_model
+    X, _, _ = training_data
+    monkeypatch.setattr(settings, "MODEL_USE_COMPILED", True)
+    copy = shutil.copytree(model_dir, tmp_path / "models")
+    export_model(str(copy))
+    predictor = ChurnPredictor(str(copy))
+
+    # best_model.pkl replaced after the export was checked: never mix it with the export
+    (copy / "best_model.pkl").write_bytes(b"retraining in progress")
+    large = predictor.predict_proba_batch(X.copy())
+    assert predictor.model is None
+    np.testing.assert_allclose(large, model.predict_proba(X)[:, 1], rtol=0, atol=TOLERANCE)
+
+
+@pytest.mark.skipif(
+    not os.path.isfile(os.path.join(BACKEND_DIR, "models", "best_model.pkl")),
+    reason="trained models/best_model.pkl not available"
+)
+def test_production_model(training_data, rng):
+    """The shipped 500-tree model, when present, compiles with the same guarantee"""
+    models = os.path.join(BACKEND_DIR, "models")
+    with open(os.path.join(models, "best_model.pkl"), "rb") as f:
+        model = pickle.load(f)
+    with open(os.path.join(models, "scaler.pkl"), "rb") as f:
+        scaler = pickle.load(f)
+    compiled = CompiledVotingModel.from_voting_classifier(model, scaler)
+    X, _, _ = training_data
+    assert_parity(model, compiled, np.vstack([X, rng.normal(size=(2000, 19))]))
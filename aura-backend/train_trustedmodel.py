@@ -76,9 +76,12 @@ categorical_cols = df_model.select_dtypes(include=['object']).columns.tolist()
 print(f"Categorical columns: {categorical_cols}")
 
 # Label Encoding
+# Keep each column's classes so the serving-side encoder can be verified against them
 le = LabelEncoder()
+categorical_vocabularies = {}
 for col in categorical_cols:
     df_model[col] = le.fit_transform(df_model[col])
+    categorical_vocabularies[col] = le.classes_.tolist()
 
 print("Encoding completed!")
 
@@ -325,6 +328,7 @@ metadata = {
     'roc_auc': float(roc_auc),
     'features': feature_names,
     'n_features': len(feature_names),
+    'categorical_vocabularies': categorical_vocabularies,
     'train_size': len(X_train),
     'test_size': len(X_test)
 }
@@ -334,6 +338,13 @@ with open('models/model_metadata.json', 'w') as f:
     json.dump(metadata, f, indent=2)
 print("✅ Model metadata saved to models/model_metadata.json")
 
+# Memory-mappable export used by the API (see export_model.py)
+if best_model_name == 'Voting Classifier':
+    from export_model import export_model
+    export_model('models')
+else:
+    print(f"⚠️  {best_model_name} cannot be compiled, the API will load best_model.pkl")
+
 print("\n" + "=" * 80)
 print("✅ TRAINING COMPLETED SUCCESSFULLY!")
 print("=" * 80)